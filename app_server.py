@@ -7,6 +7,8 @@ import json
 import os
 import sys
 import subprocess
+import time
+import zlib
 from lxml import etree
 from functools import wraps
 from flask import url_for, make_response
@@ -27,6 +29,7 @@ from .util.opds_writer import (
     OPDSMessage,
 )
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import selectinload
 from sqlalchemy.orm.session import Session
 from sqlalchemy.orm.exc import (
     NoResultFound,
@@ -36,7 +39,9 @@ from .model import (
     get_one,
     Complaint,
     Identifier,
+    LicensePool,
     Patron,
+    Work,
 )
 from .cdn import cdnify
 from .classifier import Classifier
@@ -110,6 +115,19 @@ def returns_problem_detail(f):
     return decorated
 
 
+def gzip_stream(chunks):
+    """Compress a sequence of byte strings with gzip, yielding the
+    compressed data as it becomes available.
+    """
+    # 16 + MAX_WBITS means 'write a gzip header and trailer'.
+    compressor = zlib.compressobj(9, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
 def compressible(f):
     """Decorate a function to make it transparently handle whatever
     compression the client has announced it supports.
@@ -148,14 +166,22 @@ def compressible(f):
             # fail. This is pure copy-and-paste magic.
             response.direct_passthrough = False
 
+            response.headers['Content-Encoding'] = 'gzip'
+            response.vary.add('Accept-Encoding')
+
+            if response.is_streamed:
+                # Compress the response as it's sent, rather than
+                # reading the whole thing into memory.
+                response.response = gzip_stream(response.iter_encoded())
+                if 'Content-Length' in response.headers:
+                    del response.headers['Content-Length']
+                return response
+
             buffer = BytesIO()
             gzipped = gzip.GzipFile(mode='wb', fileobj=buffer)
             gzipped.write(response.data)
             gzipped.close()
             response.data = buffer.getvalue()
-
-            response.headers['Content-Encoding'] = 'gzip'
-            response.vary.add('Accept-Encoding')
             response.headers['Content-Length'] = len(response.data)
 
             return response
@@ -290,9 +316,17 @@ class URNLookupController(object):
         """
         self._db = _db
 
+    # Refuse lookup requests for more than this many URNs.
+    MAX_URNS = 1000
+
     def work_lookup(self, annotator, route_name='lookup', **process_urn_kwargs):
         """Generate an OPDS feed describing works identified by identifier."""
         urns = flask.request.args.getlist('urn')
+        if len(urns) > self.MAX_URNS:
+            return PAYLOAD_TOO_LARGE.detailed(
+                _("You may look up no more than %(max)d URNs at once.",
+                  max=self.MAX_URNS)
+            )
 
         this_url = cdn_url_for(route_name, _external=True, urn=urns)
         handler = self.process_urns(urns, **process_urn_kwargs)
@@ -301,11 +335,15 @@ class URNLookupController(object):
             # In a subclass, self.process_urns may return a ProblemDetail
             return handler
 
+        # A lookup may cover hundreds of works, so send the entries
+        # as they're created rather than building the whole feed first.
         opds_feed = LookupAcquisitionFeed(
-            self._db, "Lookup results", this_url, handler.works, annotator,
-            precomposed_entries=handler.precomposed_entries,
+            self._db, "Lookup results", this_url, [], annotator
         )
-        return OPDSFeedResponse(str(opds_feed))
+        body = opds_feed.stream(
+            handler.works, precomposed_entries=handler.precomposed_entries
+        )
+        return OPDSFeedResponse(flask.stream_with_context(body))
 
     def process_urns(self, urns, **process_urn_kwargs):
         """Process a number of URNs by instantiating a URNLookupHandler
@@ -353,6 +391,12 @@ class URNLookupHandler(object):
     UNRECOGNIZED_IDENTIFIER = "This work is not in the collection."
     WORK_NOT_PRESENTATION_READY = "Work created but not yet presentation-ready."
     WORK_NOT_CREATED = "Identifier resolved but work not yet created."
+    TIME_BUDGET_EXCEEDED = "Ran out of time before looking up this identifier; try again."
+
+    # Stop processing identifiers once this many seconds have passed.
+    # The rest of the identifiers will get a 503 message, so that the
+    # client knows to try them again.
+    TIME_BUDGET = 30
 
     def __init__(self, _db):
         self._db = _db
@@ -367,13 +411,46 @@ class URNLookupHandler(object):
             or Response.
 
         """
+        start = time.time()
         identifiers_by_urn, failures = Identifier.parse_urns(self._db, urns)
         self.add_urn_failure_messages(failures)
+        self.preload_works(list(identifiers_by_urn.values()))
 
         for urn, identifier in list(identifiers_by_urn.items()):
+            if (self.TIME_BUDGET is not None
+                and time.time() - start > self.TIME_BUDGET):
+                self.add_message(urn, 503, self.TIME_BUDGET_EXCEEDED)
+                continue
             self.process_identifier(identifier, urn, **process_urn_kwargs)
         self.post_lookup_hook()
 
+    def preload_works(self, identifiers):
+        """Load the Works for a number of Identifiers, and the data
+        needed to build their OPDS entries, all at once.
+
+        Once this is done, process_identifier() and the OPDS feed can
+        find each Identifier's LicensePools and Work without going
+        back to the database.
+
+        :return: A list of the Works found.
+        """
+        identifier_ids = [x.id for x in identifiers]
+        if not identifier_ids:
+            return []
+        loaded = self._db.query(Identifier).filter(
+            Identifier.id.in_(identifier_ids)
+        ).options(
+            selectinload(Identifier.licensed_through).joinedload(
+                LicensePool.work
+            ).joinedload(Work.presentation_edition)
+        )
+        works = []
+        for identifier in loaded:
+            for pool in identifier.licensed_through:
+                if pool.work and pool.work not in works:
+                    works.append(pool.work)
+        return works
+
     def add_urn_failure_messages(self, failures):
         for urn in failures:
             self.add_message(urn, 400, INVALID_URN.detail)
@@ -5,6 +5,7 @@ import re
 import string
 from . import *
 from .keyword import KeywordBasedClassifier
+from ..util.lazy import LazyClassAttribute
 
 class CustomMatchToken(object):
     """A custom token used in matching rules."""
@@ -230,11 +231,13 @@ class BISACClassifier(Classifier):
     rules.
     """
 
-    # Map identifiers to human-readable names.
-    NAMES = dict(
-        [i.strip() for i in l]
-        for l in csv.reader(open(os.path.join(resource_dir, "bisac.csv")))
-    )
+    @LazyClassAttribute
+    def NAMES(cls):
+        """Map identifiers to human-readable names."""
+        with open(os.path.join(resource_dir, "bisac.csv")) as f:
+            return dict(
+                [i.strip() for i in l] for l in csv.reader(f)
+            )
 
     # Indicates that even though this rule doesn't match a subject, no
     # further rules in the same category should be run on it, because they
@@ -558,6 +558,18 @@ class Configuration(ConfigurationConstants):
     # the last time the site's configuration changed in the database.
     SITE_CONFIGURATION_CHANGED = "Site Configuration Changed"
 
+    # A number that goes up every time this process learns that the
+    # site configuration has changed. Caches derived from the site
+    # configuration can be keyed on this number. Unlike the values in
+    # Configuration.instance, it survives a reload of the configuration.
+    _site_configuration_version = 0
+
+    # If this is set, it's an object that is told by the database
+    # whenever the site configuration changes (see
+    # model.listeners.SiteConfigurationChangeListener). There's no need
+    # to poll the database for changes.
+    site_configuration_change_listener = None
+
     @classmethod
     def last_checked_for_site_configuration_update(cls):
         """When was the last time we actually checked when the database
@@ -592,6 +604,27 @@ class Configuration(ConfigurationConstants):
 
         now = utc_now()
 
+        listener = cls.site_configuration_change_listener
+        if not known_value and listener:
+            # Rather than asking the database, see if the database
+            # has told us about any changes.
+            try:
+                known_value = listener.poll()
+            except Exception as e:
+                # Something's wrong with the listener. Go back to
+                # polling the database.
+                cls.log.error(
+                    "Error checking for site configuration change notifications; will poll the database instead.",
+                    exc_info=e
+                )
+                Configuration.site_configuration_change_listener = None
+                listener = None
+            if listener:
+                if known_value:
+                    cls._set_site_configuration_last_update(known_value)
+                cls.instance[cls.LAST_CHECKED_FOR_SITE_CONFIGURATION_UPDATE] = now
+                return cls._site_configuration_last_update()
+
         # NOTE: Currently we never check the database (because timeout is
         # never set to None). This code will hopefully be removed soon.
         if _db and timeout is None:
@@ -634,13 +667,29 @@ class Configuration(ConfigurationConstants):
             last_update = known_value
 
         # Update the Configuration object's record of the last update time.
-        cls.instance[cls.SITE_CONFIGURATION_LAST_UPDATE] = last_update
+        cls._set_site_configuration_last_update(last_update)
 
         # Whether that record changed or not, the time at which we
         # _checked_ is going to be set to the current time.
         cls.instance[cls.LAST_CHECKED_FOR_SITE_CONFIGURATION_UPDATE] = now
         return last_update
 
+    @classmethod
+    def _set_site_configuration_last_update(cls, last_update):
+        """Record the last time the site configuration changed, bumping
+        the site configuration version if that's news.
+        """
+        if cls._site_configuration_last_update() != last_update:
+            Configuration._site_configuration_version += 1
+        cls.instance[cls.SITE_CONFIGURATION_LAST_UPDATE] = last_update
+
+    @classmethod
+    def site_configuration_version(cls):
+        """A number that goes up whenever this process learns that the
+        site configuration has changed.
+        """
+        return Configuration._site_configuration_version
+
     @classmethod
     def _site_configuration_last_update(cls):
         """Get the raw SITE_CONFIGURATION_LAST_UPDATE value,
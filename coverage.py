@@ -1593,3 +1593,15 @@ class WorkClassificationCoverageProvider(
     # This is going to be expensive -- we might as well recalculate
     # everything.
     POLICY = PresentationCalculationPolicy.recalculate_everything()
+
+    def process_batch(self, works):
+        """Recalculate the presentation for a whole batch of Works,
+        so that their equivalent Identifiers and quality Measurements
+        can be looked up with one query each.
+        """
+        Work.calculate_presentation_many(self._db, works, self.POLICY)
+        results = []
+        for work in works:
+            self.handle_success(work)
+            results.append(work)
+        return results
@@ -4,7 +4,9 @@ from dateutil.parser import parse
 import csv
 import os
 from sqlalchemy import or_
+from sqlalchemy.orm import joinedload
 from sqlalchemy.orm.session import Session
+from sqlalchemy.orm.util import identity_key
 
 from .opds_import import SimplifiedOPDSLookup
 import logging
@@ -24,6 +26,7 @@ from .model import (
     Identifier,
     Subject,
     Work,
+    WorkCoverageRecord,
 )
 from .util import LanguageCodes
 from .util.datetime_helpers import utc_now
@@ -169,6 +172,8 @@ class TitleFromExternalList(object):
         list_entry, is_new = get_one_or_create(
             _db, CustomListEntry, edition=edition, customlist=custom_list
         )
+        if is_new:
+            custom_list.size += 1
 
         if (not list_entry.first_appearance
             or list_entry.first_appearance > self.first_appearance):
@@ -261,39 +266,107 @@ class MembershipManager(object):
         self.custom_list = custom_list
 
     def update(self, update_time=None):
+        """Bring the list's membership up to date.
+
+        Rather than loading every entry in the list, this works out
+        which Editions were added and removed, and only those entries
+        are touched individually.
+        """
         update_time = update_time or utc_now()
+        _db = self._db
+        custom_list = self.custom_list
 
-        # Map each Edition currently in this list to the corresponding
-        # CustomListEntry.
+        # Map the ID of each Edition currently in this list to the
+        # IDs of the corresponding CustomListEntries.
         current_membership = defaultdict(list)
-        for entry in self.custom_list.entries:
-            if not entry.edition:
+        size = 0
+        entries = _db.query(
+            CustomListEntry.id, CustomListEntry.edition_id,
+            CustomListEntry.work_id
+        ).filter(CustomListEntry.list_id==custom_list.id)
+        for entry_id, edition_id, work_id in entries:
+            size += 1
+            if edition_id is None:
                 continue
-            current_membership[entry.edition].append(entry)
+            current_membership[edition_id].append((entry_id, work_id))
 
         # Find the new membership of the list.
-        for new_edition in self.new_membership:
-            if new_edition in current_membership:
-                # This entry was in the list before, and is still in
-                # the list. Update its .most_recent_appearance.
-                self.log.debug("Maintaining %s" % new_edition.title)
-                entry_list = current_membership[new_edition]
-                for entry in entry_list:
-                    entry.most_recent_appearance = update_time
-                del current_membership[new_edition]
-            else:
-                # This is a new list entry.
-                self.log.debug("Adding %s" % new_edition.title)
-                self.custom_list.add_entry(
-                    work_or_edition=new_edition, first_appearance=update_time
+        new_membership = {}
+        for edition in self.new_membership:
+            new_membership[edition.id] = edition
+
+        maintained = set(current_membership) & set(new_membership)
+        removed = set(current_membership) - set(new_membership)
+        added = [
+            edition for edition_id, edition in list(new_membership.items())
+            if edition_id not in current_membership
+        ]
+
+        # These entries were in the list before, and are still in the
+        # list. Update their .most_recent_appearance.
+        if maintained:
+            self.log.debug("Maintaining %d entries", len(maintained))
+            maintained_ids = [
+                entry_id for edition_id in maintained
+                for entry_id, work_id in current_membership[edition_id]
+            ]
+            _db.query(CustomListEntry).filter(
+                CustomListEntry.id.in_(maintained_ids)
+            ).update(
+                dict(most_recent_appearance=update_time),
+                synchronize_session=False
+            )
+            # Don't let any entries already in the session hold on to
+            # the old value.
+            for entry_id in maintained_ids:
+                entry = _db.identity_map.get(
+                    identity_key(CustomListEntry, entry_id)
                 )
+                if entry is not None:
+                    _db.expire(entry, ['most_recent_appearance'])
+
+        # Anything in `removed` used to be in the list but is no
+        # longer. Remove these entries from the list.
+        if removed:
+            self.log.debug("Deleting %d entries", len(removed))
+            removed_entries = [
+                entry for edition_id in removed
+                for entry in current_membership[edition_id]
+            ]
+            _db.query(CustomListEntry).filter(
+                CustomListEntry.id.in_([x[0] for x in removed_entries])
+            ).delete(synchronize_session='fetch')
+            size -= len(removed_entries)
+            custom_list.updated = utc_now()
+
+            # The removed Works' search documents need to reflect
+            # their new list membership.
+            work_ids = set(x[1] for x in removed_entries if x[1])
+            if work_ids:
+                WorkCoverageRecord.bulk_add(
+                    _db.query(Work).filter(Work.id.in_(work_ids)).all(),
+                    WorkCoverageRecord.UPDATE_SEARCH_INDEX_OPERATION,
+                    status=WorkCoverageRecord.REGISTERED
+                )
+
+        # Finally, add the new entries. Look up all of their Works
+        # at once rather than one at a time.
+        if added:
+            _db.query(Edition).filter(
+                Edition.id.in_([x.id for x in added])
+            ).options(joinedload(Edition.work)).all()
+        for new_edition in added:
+            self.log.debug("Adding %s" % new_edition.title)
+            entry, is_new = custom_list.add_entry(
+                work_or_edition=new_edition, first_appearance=update_time
+            )
+            if is_new:
+                size += 1
 
-        # Anything still left in current_membership used to be in the
-        # list but is no longer. Remove these entries from the list.
-        for entry_list in list(current_membership.values()):
-            for entry in entry_list:
-                self.log.debug("Deleting %s" % entry.edition.title)
-                self._db.delete(entry)
+        # add_entry() also keeps track of the size, but it doesn't
+        # know about removed entries.
+        custom_list.size = size
+        _db.expire(custom_list, ['entries'])
 
     @property
     def new_membership(self):
@@ -4,6 +4,7 @@ import datetime
 
 import json
 from elasticsearch import Elasticsearch
+from expiringdict import ExpiringDict
 from elasticsearch.helpers import bulk as elasticsearch_bulk
 from elasticsearch.exceptions import (
     RequestError,
@@ -74,6 +75,7 @@ from .util.personal_names import display_name_to_sort_name
 from .util.problem_detail import ProblemDetail
 from .util.stopwords import ENGLISH_STOPWORDS
 from .util.datetime_helpers import from_timestamp
+from .util.lazy import LazyClassAttribute
 
 import os
 import logging
@@ -1406,8 +1408,17 @@ class Query(SearchBase):
     STOPWORD_FIELDS = ['title', 'subtitle', 'series']
 
     # SpellChecker is expensive to initialize, so keep around
-    # a class-level instance.
-    SPELLCHECKER = SpellChecker()
+    # a class-level instance, created the first time it's needed.
+    @LazyClassAttribute
+    def SPELLCHECKER(cls):
+        return SpellChecker()
+
+    # Building the hypotheses for a query string is expensive, and the
+    # result depends only on the query string, so popular searches can
+    # reuse an Elasticsearch-DSL Query object built earlier.
+    _elasticsearch_query_cache = ExpiringDict(
+        max_len=1000, max_age_seconds=3600
+    )
 
     def __init__(self, query_string, filter=None, use_query_parser=True):
         """Store a query string and filter.
@@ -1553,8 +1564,26 @@ class Query(SearchBase):
 
     @property
     def elasticsearch_query(self):
-        """Build an Elasticsearch-DSL Query object for this query string."""
+        """Build an Elasticsearch-DSL Query object for this query string.
 
+        The Query object is cached and may be shared with other Query
+        objects that have the same query string, so it must not be
+        modified in place.
+        """
+        key = (
+            self.__class__, self.query_string, self.use_query_parser,
+            self.fuzzy_coefficient, self.contains_stopwords
+        )
+        query = self._elasticsearch_query_cache.get(key)
+        if query is None:
+            query = self._build_elasticsearch_query()
+            self._elasticsearch_query_cache[key] = query
+        return query
+
+    def _build_elasticsearch_query(self):
+        """Actually build the Elasticsearch-DSL Query object returned by
+        elasticsearch_query.
+        """
         # The query will most likely be a dis_max query, which tests a
         # number of hypotheses about what the query string might
         # 'really' mean. For each book, the highest-rated hypothesis
@@ -2113,6 +2142,15 @@ class Filter(SearchBase):
     presenting the search results.
     """
 
+    # Most searches are run against a small number of lanes, so the
+    # same filters get built over and over. Cache the output of
+    # build() for each distinct set of restrictions.
+    _build_cache = ExpiringDict(max_len=1000, max_age_seconds=3600)
+
+    # The universal filters never change, so they're only built once.
+    _universal_base_filter = None
+    _universal_nested_filters = None
+
     # When search results include known script fields, we need to
     # wrap the works we would be returning in WorkSearchResults so
     # the useful information from the search engine isn't lost.
@@ -2393,10 +2431,84 @@ class Filter(SearchBase):
            filter. `nested_filters` is a dictionary that maps a path
            to a list of filters to apply to that path.
 
+           The filter may be shared with other Filter objects that
+           impose the same restrictions, so it must not be modified
+           in place. `nested_filters` is always a brand new dictionary.
+
         :param _chain_filters: Mock function to use instead of
             Filter._chain_filters
         """
+        if _chain_filters is not None:
+            return self._build(_chain_filters)
+
+        key = self._build_cache_key()
+        if key is None:
+            return self._build()
+
+        cached = self._build_cache.get(key)
+        if cached is None:
+            f, nested_filters = self._build()
+            cached = (
+                f, [(path, tuple(filters))
+                    for path, filters in nested_filters.items()]
+            )
+            self._build_cache[key] = cached
+        f, nested_filters = cached
+        return f, defaultdict(
+            list, [(path, list(filters)) for path, filters in nested_filters]
+        )
+
+    def _build_cache_key(self):
+        """Describe everything that goes into build() as a hashable value.
+
+        :return: A tuple, or None if the output of build() for this
+            Filter shouldn't be cached.
+        """
+        if self.author is not None or self.identifiers:
+            # These restrictions are specific to one request; there's
+            # no point in caching them.
+            return None
+
+        filter_ids = self._filter_ids
+        def ids(x):
+            x = filter_ids(x)
+            if x is None:
+                return None
+            return tuple(x)
+
+        def scrubbed(x):
+            if not x:
+                return None
+            return tuple(self._scrub_list(x))
+
+        target_age = self.target_age
+        if isinstance(target_age, list):
+            target_age = tuple(target_age)
+
+        key = (
+            self.__class__, self.match_nothing,
+            ids(self.collection_ids), ids(self.license_datasources),
+            scrubbed(self.media), scrubbed(self.languages), self.fiction,
+            self.series, scrubbed(self.audiences), target_age,
+            tuple(ids(x) for x in self.genre_restriction_sets),
+            tuple(ids(x) for x in self.customlist_restriction_sets),
+            self.availability, self.subcollection,
+            self.minimum_featured_quality,
+            ids(self.excluded_audiobook_data_sources), self.allow_holds,
+            self.updated_after,
+        )
+        try:
+            hash(key)
+        except TypeError:
+            # Something unusual was put into this Filter.
+            return None
+        return key
+
+    def _build(self, _chain_filters=None):
+        """Actually convert this object to an Elasticsearch Filter object.
 
+        :return: A 2-tuple (filter, nested_filters), as with build().
+        """
         # Since a Filter object can be modified after it's created, we
         # need to scrub all the inputs, whether or not they were
         # scrubbed in the constructor.
@@ -2573,6 +2685,9 @@ class Filter(SearchBase):
 
         """
 
+        if _chain_filters is None and cls._universal_base_filter is not None:
+            return cls._universal_base_filter
+        use_cache = _chain_filters is None
         _chain_filters = _chain_filters or cls._chain_filters
 
         base_filter = None
@@ -2582,13 +2697,31 @@ class Filter(SearchBase):
             base_filter, Term(**{"presentation_ready":True})
         )
 
+        if use_cache:
+            cls._universal_base_filter = base_filter
         return base_filter
 
     @classmethod
     def universal_nested_filters(cls):
         """Build a set of restrictions on subdocuments that are
         always applied, even in the absence of other filters.
+
+        :return: A brand new dictionary mapping paths to lists of
+            filters, which the caller is free to modify.
         """
+        if cls._universal_nested_filters is None:
+            cls._universal_nested_filters = [
+                (path, tuple(filters)) for path, filters
+                in cls._build_universal_nested_filters().items()
+            ]
+        return defaultdict(
+            list, [(path, list(filters))
+                   for path, filters in cls._universal_nested_filters]
+        )
+
+    @classmethod
+    def _build_universal_nested_filters(cls):
+        """Actually build the filters returned by universal_nested_filters."""
         nested_filters = defaultdict(list)
 
         # TODO: It would be great to be able to filter out
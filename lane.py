@@ -38,6 +38,7 @@ from sqlalchemy.sql.expression import literal
 import elasticsearch
 from sqlalchemy import (
     event,
+    inspect,
     Boolean,
     Column,
     ForeignKey,
@@ -2841,6 +2842,33 @@ class Lane(Base, DatabaseBackedWorkList, HierarchyWorkList):
         self.size_by_entrypoint = by_entrypoint
         self.size = by_entrypoint[EverythingEntryPoint.URI]
 
+    def inherited_value(self, k):
+        """Try to find this Lane's value for the given key, consulting the
+        LaneIndex rather than walking the Lane's parentage, if possible.
+        """
+        if k in LaneIndex.INHERITED_KEYS:
+            index = LaneIndex.for_lane(self)
+            if index:
+                return index.inherited_value(self.id, k)
+        return super(Lane, self).inherited_value(k)
+
+    def inherited_values(self, k):
+        """Find the values for the given key imposed by this Lane and its
+        parentage, consulting the LaneIndex if possible.
+        """
+        if k in LaneIndex.INHERITED_VALUES_KEYS:
+            index = LaneIndex.for_lane(self)
+            if index:
+                return index.inherited_values(self.id, k, self._lane_value)
+        return super(Lane, self).inherited_values(k)
+
+    def _lane_value(self, lane_id, k):
+        """Look up the value of `k` for another Lane in this Lane's
+        database session.
+        """
+        _db = Session.object_session(self)
+        return getattr(_db.query(Lane).get(lane_id), k)
+
     @property
     def genre_ids(self):
         """Find the database ID of every Genre such that a Work classified in
@@ -2850,7 +2878,11 @@ class Lane(Base, DatabaseBackedWorkList, HierarchyWorkList):
             consider genres at all.
         """
         if not hasattr(self, '_genre_ids'):
-            self._genre_ids = self._gather_genre_ids()
+            index = LaneIndex.for_lane(self)
+            if index:
+                self._genre_ids = index.own_value(self.id, 'genre_ids')
+            else:
+                self._genre_ids = self._gather_genre_ids()
         return self._genre_ids
 
     def _gather_genre_ids(self):
@@ -2896,7 +2928,13 @@ class Lane(Base, DatabaseBackedWorkList, HierarchyWorkList):
         :return: A list of CustomList IDs, possibly empty.
         """
         if not hasattr(self, '_customlist_ids'):
-            self._customlist_ids = self._gather_customlist_ids()
+            index = LaneIndex.for_lane(self)
+            if index and not index.from_database(self.id, 'customlist_ids'):
+                self._customlist_ids = index.own_value(
+                    self.id, 'customlist_ids'
+                )
+            else:
+                self._customlist_ids = self._gather_customlist_ids()
         return self._customlist_ids
 
     def _gather_customlist_ids(self):
@@ -3105,17 +3143,272 @@ lanes_customlists = Table(
     UniqueConstraint('lane_id', 'customlist_id'),
 )
 
+class LaneIndex(object):
+    """A read-only, in-memory picture of one library's Lane hierarchy.
+
+    Building a search Filter for a Lane means walking up the Lane's
+    parentage and gathering genre and CustomList IDs for every Lane
+    along the way. A grouped feed does this for every one of its
+    lanes. A LaneIndex does all of that work for an entire library
+    with a handful of queries, so that afterwards it's just a matter
+    of dictionary lookups.
+
+    LaneIndexes are cached per library, and a cached LaneIndex is
+    thrown away whenever the site configuration changes or this
+    process changes a Lane.
+
+    The CustomLists of a Lane that draws from every list from some
+    DataSource aren't kept in the index, since any process can create
+    such a list (or change its DataSource) at any time. Those are
+    looked up in the database, as they would be without an index.
+    """
+
+    # These are the keys for which inherited_value() can be answered
+    # from the index. Anything else goes through the normal WorkList
+    # implementation.
+    INHERITED_KEYS = [
+        'media', 'languages', 'fiction', 'audiences', 'target_age',
+        'license_datasource_id'
+    ]
+
+    # And these are the keys for which inherited_values() can be
+    # answered from the index.
+    INHERITED_VALUES_KEYS = ['genre_ids', 'customlist_ids']
+
+    # Maps library ID to a (site configuration version, LaneIndex)
+    # 2-tuple.
+    _cache = {}
+
+    def __init__(self, _db, library_id):
+        self.library_id = library_id
+
+        # Lane ID -> parent Lane ID
+        self.parent_ids = {}
+
+        # Lane ID -> whether the lane inherits its parent's restrictions
+        self.inherits = {}
+
+        # Lane ID -> {key: the Lane's own value for that key}
+        self.values = {}
+
+        lane_table = Lane.__table__
+        lane_ids = select([lane_table.c.id]).where(
+            lane_table.c.library_id==library_id
+        )
+        columns = [
+            lane_table.c.id, lane_table.c.parent_id,
+            lane_table.c.inherit_parent_restrictions,
+            lane_table.c.media, lane_table.c.languages,
+            lane_table.c.fiction, lane_table.c.audiences,
+            lane_table.c.target_age, lane_table.c.license_datasource_id,
+            lane_table.c._list_datasource_id,
+        ]
+        list_datasource_ids = {}
+        for (lane_id, parent_id, inherit, media, languages, fiction,
+             audiences, target_age, license_datasource_id,
+             list_datasource_id) in _db.execute(
+                 select(columns).where(lane_table.c.library_id==library_id)
+             ):
+            self.parent_ids[lane_id] = parent_id
+            self.inherits[lane_id] = inherit
+            self.values[lane_id] = dict(
+                media=media, languages=languages, fiction=fiction,
+                # Lane.audiences is never None.
+                audiences=audiences or [], target_age=target_age,
+                license_datasource_id=license_datasource_id,
+                genre_ids=None, customlist_ids=None,
+            )
+            if list_datasource_id:
+                list_datasource_ids[lane_id] = list_datasource_id
+
+        # Calculate each Lane's genre IDs the same way
+        # Lane._gather_genre_ids does.
+        genre_ids_by_name = dict(_db.query(Genre.name, Genre.id))
+        all_genre_ids = set(genre_ids_by_name.values())
+        included = defaultdict(set)
+        excluded = defaultdict(set)
+        genre_table = Genre.__table__
+        lanegenre_table = LaneGenre.__table__
+        for lane_id, genre_name, genre_id, inclusive, recursive in _db.execute(
+            select(
+                [lanegenre_table.c.lane_id, genre_table.c.name,
+                 genre_table.c.id, lanegenre_table.c.inclusive,
+                 lanegenre_table.c.recursive]
+            ).where(
+                lanegenre_table.c.genre_id==genre_table.c.id
+            ).where(
+                lanegenre_table.c.lane_id.in_(lane_ids)
+            )
+        ):
+            bucket = included if inclusive else excluded
+            # Make sure the Lane shows up even if it only excludes genres.
+            included[lane_id]
+            bucket[lane_id].add(genre_id)
+            if recursive:
+                genredata = classifier.genres.get(genre_name)
+                if genredata:
+                    for subgenre in genredata.self_and_subgenres:
+                        if subgenre.name in genre_ids_by_name:
+                            bucket[lane_id].add(
+                                genre_ids_by_name[subgenre.name]
+                            )
+        for lane_id, included_ids in list(included.items()):
+            if lane_id not in self.values:
+                continue
+            if not included_ids:
+                # No genres have been explicitly included, so this lane
+                # includes all genres that aren't excluded.
+                included_ids = all_genre_ids
+            self.values[lane_id]['genre_ids'] = (
+                included_ids - excluded[lane_id]
+            )
+
+        # Calculate each Lane's CustomList IDs the same way
+        # Lane._gather_customlist_ids does, except for the Lanes that
+        # draw from a DataSource's lists.
+        self.list_datasource_ids = list_datasource_ids
+        customlist_ids = defaultdict(list)
+        for lane_id, customlist_id in _db.execute(
+            select(
+                [lanes_customlists.c.lane_id,
+                 lanes_customlists.c.customlist_id]
+            ).where(
+                lanes_customlists.c.lane_id.in_(lane_ids)
+            ).order_by(lanes_customlists.c.customlist_id)
+        ):
+            customlist_ids[lane_id].append(customlist_id)
+
+        for lane_id, values in self.values.items():
+            if (lane_id not in list_datasource_ids
+                and customlist_ids[lane_id]):
+                values['customlist_ids'] = customlist_ids[lane_id]
+
+        # Finally, flatten each Lane's parentage.
+        self.parentages = {}
+        for lane_id in self.parent_ids:
+            parentage = []
+            seen = set([lane_id])
+            parent_id = self.parent_ids[lane_id]
+            while parent_id is not None:
+                if parent_id in seen or parent_id not in self.parent_ids:
+                    # Either there's a parentage loop or the Lane's
+                    # parent is in a different library. Leave this Lane
+                    # out of the index so the problem is handled
+                    # normally.
+                    parentage = None
+                    break
+                seen.add(parent_id)
+                parentage.append(parent_id)
+                parent_id = self.parent_ids[parent_id]
+            if parentage is not None:
+                self.parentages[lane_id] = parentage
+
+    @classmethod
+    def for_lane(cls, lane):
+        """Find an up-to-date LaneIndex that covers the given Lane.
+
+        :return: A LaneIndex, or None if no LaneIndex can be trusted to
+            reflect the current state of this Lane -- for instance,
+            because Lanes have been changed in this database session
+            but not yet written to the database.
+        """
+        _db = Session.object_session(lane)
+        if _db is None or lane.id is None or lane.library_id is None:
+            return None
+        for obj in _db.dirty:
+            if isinstance(obj, (Lane, LaneGenre)):
+                return None
+        for obj in _db.deleted:
+            if isinstance(obj, (Lane, LaneGenre)):
+                return None
+
+        index = cls.for_library(_db, lane.library_id)
+        if lane.id not in index.parentages:
+            return None
+        return index
+
+    @classmethod
+    def for_library(cls, _db, library_id):
+        """Find or build the LaneIndex for the given library.
+
+        :param library_id: The database ID of a Library.
+        """
+        version = Configuration.site_configuration_version()
+        cached = cls._cache.get(library_id)
+        if cached:
+            cached_version, index = cached
+            if cached_version == version:
+                return index
+        index = cls(_db, library_id)
+        cls._cache[library_id] = (version, index)
+        return index
+
+    @classmethod
+    def reset(cls):
+        """Throw away all cached LaneIndexes."""
+        cls._cache = {}
+
+    def from_database(self, lane_id, k):
+        """Is a Lane's own value for `k` missing from the index, so that
+        it has to be looked up in the database?
+        """
+        return k == 'customlist_ids' and lane_id in self.list_datasource_ids
+
+    def own_value(self, lane_id, k):
+        """Find a Lane's own value for `k`, ignoring its parentage."""
+        value = self.values[lane_id][k]
+        if isinstance(value, (list, set)):
+            # Make sure the cached value can't be modified.
+            value = type(value)(value)
+        return value
+
+    def inherited_value(self, lane_id, k):
+        """Equivalent to Lane.inherited_value."""
+        for candidate in [lane_id] + self.parentages[lane_id]:
+            value = self.values[candidate][k]
+            if value not in (None, []):
+                return self.own_value(candidate, k)
+            if not self.inherits[candidate]:
+                return None
+        return None
+
+    def inherited_values(self, lane_id, k, lookup):
+        """Equivalent to Lane.inherited_values.
+
+        :param lookup: A function that takes a Lane ID and `k`, and
+            returns that Lane's own value for `k`. It's called for the
+            values that aren't in the index (see `from_database`).
+        """
+        if self.inherits[lane_id]:
+            hierarchy = list(reversed(self.parentages[lane_id])) + [lane_id]
+        else:
+            hierarchy = [lane_id]
+        values = []
+        for candidate in hierarchy:
+            if self.from_database(candidate, k):
+                value = lookup(candidate, k)
+            else:
+                value = self.own_value(candidate, k)
+            if value not in (None, []):
+                values.append(value)
+        return values
+
+
 @event.listens_for(Lane, 'after_insert')
 @event.listens_for(Lane, 'after_delete')
 @event.listens_for(LaneGenre, 'after_insert')
 @event.listens_for(LaneGenre, 'after_delete')
 def configuration_relevant_lifecycle_event(mapper, connection, target):
     site_configuration_has_changed(target)
+    LaneIndex.reset()
 
 
 @event.listens_for(Lane, 'after_update')
 @event.listens_for(LaneGenre, 'after_update')
 def configuration_relevant_update(mapper, connection, target):
+    # Changes to a Lane's CustomLists don't count as a direct
+    # modification, but they do affect the LaneIndex.
+    LaneIndex.reset()
     if directly_modified(target):
         site_configuration_has_changed(target)
 
@@ -3125,3 +3418,17 @@ def configuration_relevant_update(mapper, connection, target):
         # Remove this information whenever the Lane configuration
         # changes. This will force it to be recalculated.
         Library._has_root_lane_cache.clear()
+    elif (isinstance(target, Lane)
+          and inspect(target).attrs.customlists.history.has_changes()):
+        # Other processes need to rebuild their LaneIndexes.
+        site_configuration_has_changed(target)
+
+
+@event.listens_for(CustomList, 'after_delete')
+@event.listens_for(Genre, 'after_insert')
+@event.listens_for(Genre, 'after_delete')
+def lane_index_relevant_lifecycle_event(mapper, connection, target):
+    # A deleted CustomList may have been associated with a Lane, and
+    # a new or deleted Genre may change the genres associated with a
+    # Lane.
+    LaneIndex.reset()
@@ -2,6 +2,7 @@ from flask_babel import lazy_gettext as _
 from .model import (
     Session,
     CirculationEvent,
+    CirculationEventBuffer,
     ExternalIntegration,
     get_one,
     create
@@ -64,6 +65,15 @@ class LocalAnalyticsProvider(object):
         if self.location_source == self.LOCATION_SOURCE_NEIGHBORHOOD:
             neighborhood = kwargs.pop("neighborhood", None)
 
+        buffer = CirculationEventBuffer.for_session(_db)
+        if buffer is not None:
+            # The event will be written to the database later, along
+            # with a lot of other events.
+            return buffer.add(
+                license_pool, event_type, old_value, new_value, start=time,
+                library=library, location=neighborhood
+            )
+
         return CirculationEvent.log(
             _db, license_pool, event_type, old_value, new_value, start=time,
             library=library, location=neighborhood
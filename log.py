@@ -1,18 +1,20 @@
 
+import atexit
+import copy
 import logging
 import json
 import os
 import socket
 from flask_babel import lazy_gettext as _
 from io import StringIO
+from logging.handlers import QueueHandler, QueueListener
+from queue import Empty, Full, Queue
 from loggly.handlers import HTTPSHandler as LogglyHandler
-from watchtower import CloudWatchLogHandler
-from boto3.session import Session as AwsSession
 
 from .config import Configuration
 from .config import CannotLoadConfiguration
 from .model import ExternalIntegration, ConfigurationSetting
-from .util.datetime_helpers import utc_now
+from .util.datetime_helpers import from_timestamp
 
 class JSONFormatter(logging.Formatter):
     hostname = socket.gethostname()
@@ -24,7 +26,9 @@ class JSONFormatter(logging.Formatter):
         super(JSONFormatter, self).__init__()
         self.app_name = app_name or LogConfiguration.DEFAULT_APP_NAME
 
-    def format(self, record):
+    @classmethod
+    def format_message(cls, record):
+        """Interpolate a record's arguments into its message."""
         def ensure_str(s):
             """Ensure that unicode strings are used for a record's message.
             We don't want to try to interpolate an incompatible byte type; it
@@ -50,17 +54,25 @@ class JSONFormatter(logging.Formatter):
                 message = "Log message could not be formatted. Exception: %r. Original message: message=%r args=%r" % (
                     e, message, record_args
                 )
+        return message
+
+    def format(self, record):
         data = dict(
             host=self.hostname,
             app=self.app_name,
             name=record.name,
             level=record.levelname,
             filename=record.filename,
-            message=message,
-            timestamp=utc_now().isoformat()
+            message=self.format_message(record),
+            # Use the time the record was created, not the current
+            # time -- the record may have spent some time in a queue.
+            timestamp=from_timestamp(record.created).isoformat()
         )
         if record.exc_info:
             data['traceback'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            # The traceback was rendered when the record was queued.
+            data['traceback'] = record.exc_text
         return json.dumps(data)
 
 
@@ -337,6 +349,11 @@ class CloudwatchLogs(Logger):
     def get_handler(cls, settings, testing=False):
         """Turn ExternalIntegration into a log handler.
         """
+        # boto3 is slow to import, so only import it if Cloudwatch
+        # logging is actually configured.
+        from watchtower import CloudWatchLogHandler
+        from boto3.session import Session as AwsSession
+
         group = settings.setting(cls.GROUP).value or cls.DEFAULT_APP_NAME
         stream = settings.setting(cls.STREAM).value or cls.DEFAULT_APP_NAME
         interval = settings.setting(cls.INTERVAL).value or cls.DEFAULT_INTERVAL
@@ -369,6 +386,152 @@ class CloudwatchLogs(Logger):
         handler.addFilter(BotoFilter())
         return handler
 
+class DroppingQueueHandler(QueueHandler):
+    """Put log records on a bounded queue instead of handling them
+    in the calling thread.
+
+    If the queue is full, a record below WARNING is dropped
+    immediately. A more serious record is allowed to block the caller
+    for up to `block_timeout` seconds (backpressure) before it, too, is
+    dropped. The next record to make it onto the queue is followed by a
+    warning saying how many records were lost.
+    """
+
+    def __init__(self, queue, block_timeout=1):
+        super(DroppingQueueHandler, self).__init__(queue)
+        self.block_timeout = block_timeout
+        self.dropped = 0
+        self.blocked = 0
+        self._reported_dropped = 0
+
+    def prepare(self, record):
+        """Make the record safe to format later, in another thread.
+
+        Only the cheap work happens here: the message is interpolated
+        while its arguments still have the values they had when it was
+        logged, and any traceback is rendered so the record doesn't
+        keep stack frames alive. Turning the record into JSON is left
+        to the listener.
+        """
+        record = copy.copy(record)
+        record.msg = JSONFormatter.format_message(record)
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = _traceback_formatter.formatException(
+                    record.exc_info
+                )
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        # This is called from Handler.handle(), which holds self.lock,
+        # so the counters don't need any further protection.
+        try:
+            self.queue.put_nowait(record)
+        except Full:
+            if record.levelno < logging.WARNING:
+                self.dropped += 1
+                return
+            self.blocked += 1
+            try:
+                self.queue.put(record, timeout=self.block_timeout)
+            except Full:
+                self.dropped += 1
+                return
+        if self.dropped > self._reported_dropped:
+            self._report_dropped()
+
+    def _report_dropped(self):
+        count = self.dropped - self._reported_dropped
+        record = logging.makeLogRecord(dict(
+            name=__name__, levelno=logging.WARNING, levelname="WARNING",
+            msg="Log queue was full; dropped %d log message(s)." % count,
+        ))
+        try:
+            self.queue.put_nowait(record)
+        except Full:
+            # Try again next time.
+            return
+        self._reported_dropped = self.dropped
+
+
+class BatchingQueueListener(QueueListener):
+    """Take log records off a queue in a background thread and pass
+    them to the real handlers in batches.
+
+    Stream handlers get a whole batch written before being flushed
+    once; other handlers (Loggly, Cloudwatch) see the records one at a
+    time, but in the background thread.
+    """
+
+    def __init__(self, queue, *handlers, batch_size=100):
+        super(BatchingQueueListener, self).__init__(
+            queue, *handlers, respect_handler_level=True
+        )
+        self.batch_size = batch_size
+
+    def _monitor(self):
+        q = self.queue
+        has_task_done = hasattr(q, 'task_done')
+        done = False
+        while not done:
+            batch = []
+            record = self.dequeue(True)
+            while True:
+                if record is self._sentinel:
+                    done = True
+                else:
+                    batch.append(record)
+                if has_task_done:
+                    q.task_done()
+                if done or len(batch) >= self.batch_size:
+                    break
+                try:
+                    record = self.dequeue(False)
+                except Empty:
+                    break
+            if batch:
+                self.handle_batch(batch)
+
+    def handle_batch(self, records):
+        for handler in self.handlers:
+            batch = [
+                record for record in records
+                if record.levelno >= handler.level
+            ]
+            if not batch:
+                continue
+            if isinstance(handler, logging.StreamHandler):
+                self._write_batch(handler, batch)
+            else:
+                for record in batch:
+                    handler.handle(record)
+
+    def _write_batch(self, handler, records):
+        lines = []
+        for record in records:
+            if not handler.filter(record):
+                continue
+            try:
+                lines.append(handler.format(record) + handler.terminator)
+            except Exception:
+                handler.handleError(record)
+        if not lines:
+            return
+        handler.acquire()
+        try:
+            handler.stream.write("".join(lines))
+            handler.flush()
+        except Exception:
+            handler.handleError(records[-1])
+        finally:
+            handler.release()
+
+# Used to render tracebacks before a record is queued.
+_traceback_formatter = logging.Formatter()
+
+
 class LogConfiguration(object):
     """Configures the active Python logging handlers based on logging
     configuration from the database.
@@ -387,6 +550,15 @@ class LogConfiguration(object):
     DEFAULT_LOG_LEVEL = INFO
     DEFAULT_DATABASE_LOG_LEVEL = WARN
 
+    # Outside of unit tests, log records are put on a queue of this
+    # size, and a background thread hands them to the real handlers
+    # this many at a time.
+    QUEUE_SIZE = 10000
+    BATCH_SIZE = 100
+
+    # The BatchingQueueListener currently feeding the real handlers.
+    _listener = None
+
     # Settings for the integration with protocol=INTERNAL_LOGGING
     LOG_LEVEL = 'log_level'
     DATABASE_LOG_LEVEL = 'database_log_level'
@@ -429,12 +601,24 @@ class LogConfiguration(object):
         # Replace the set of handlers associated with the root logger.
         logger = logging.getLogger()
         logger.setLevel(log_level)
+        for handler in new_handlers:
+            handler.setLevel(log_level)
+        old_listener = cls._listener
+        cls._listener = None
+        if not testing:
+            # Application threads only put records on a queue; the
+            # handlers do their work in a background thread. (Unit
+            # tests expect log output to show up immediately.)
+            new_handlers = [cls.start_listener(new_handlers)]
         old_handlers = list(logger.handlers)
         for handler in new_handlers:
             logger.addHandler(handler)
-            handler.setLevel(log_level)
         for handler in old_handlers:
             logger.removeHandler(handler)
+        if old_listener:
+            # Nothing new can reach the old queue now, so whatever's
+            # left in it can be written out.
+            old_listener.stop()
 
         # Set the loggers for various verbose libraries to the database
         # log level, which is probably higher than the normal log level.
@@ -462,6 +646,50 @@ class LogConfiguration(object):
 
         return log_level
 
+    @classmethod
+    def start_listener(cls, handlers):
+        """Start a background thread that passes queued log records
+        on to `handlers`.
+
+        :return: A DroppingQueueHandler that feeds the new thread.
+        """
+        log_queue = Queue(cls.QUEUE_SIZE)
+        cls._listener = BatchingQueueListener(
+            log_queue, *handlers, batch_size=cls.BATCH_SIZE
+        )
+        cls._listener.start()
+        return DroppingQueueHandler(log_queue)
+
+    @classmethod
+    def stop_listener(cls):
+        """Hand every queued log record to its handlers, then stop
+        the background thread.
+        """
+        listener = cls._listener
+        cls._listener = None
+        if listener:
+            listener.stop()
+
+    @classmethod
+    def _restart_listener_after_fork(cls):
+        """Give a child process its own queue and background thread.
+
+        The parent's thread doesn't survive a fork. Its queue does, but
+        the queue's locks may have been held by a thread that's gone,
+        and any records already on it will be written by the parent.
+        """
+        listener = cls._listener
+        if not listener:
+            return
+        new_handler = cls.start_listener(listener.handlers)
+        logger = logging.getLogger()
+        for handler in list(logger.handlers):
+            if (isinstance(handler, DroppingQueueHandler)
+                and handler.queue is listener.queue):
+                new_handler.setLevel(handler.level)
+                logger.removeHandler(handler)
+        logger.addHandler(new_handler)
+
     @classmethod
     def from_configuration(cls, _db, testing=False):
         """Return the logging policy as configured in the database.
@@ -510,3 +738,11 @@ class LogConfiguration(object):
                 )
 
         return log_level, database_log_level, handlers, errors
+
+
+# Make sure queued log records are written out before the logging
+# module closes the handlers at exit.
+atexit.register(LogConfiguration.stop_listener)
+os.register_at_fork(
+    after_in_child=LogConfiguration._restart_listener_after_fork
+)
@@ -16,9 +16,9 @@ from sqlalchemy.orm.exc import (
 from sqlalchemy.orm import aliased
 import csv
 import datetime
+import functools
 import logging
 import re
-from pymarc import MARCReader
 
 from .classifier import Classifier
 from .util import LanguageCodes
@@ -706,12 +706,67 @@ class MetaToModelUtility(object):
 
     log = logging.getLogger("Abstract metadata layer - mirror code")
 
-    def mirror_link(self, model_object, data_source, link, link_obj, policy):
+    @classmethod
+    def can_stream(cls, link, mirror, policy):
+        """Can the content of this link be streamed from its source
+        to the mirror, without being held in memory?
+        """
+        return bool(
+            getattr(mirror, "STREAMING_UPLOADS", False)
+            and not policy.content_modifier
+            and (link.media_type in Representation.BOOK_MEDIA_TYPES
+                 or link.media_type in Representation.AUDIOBOOK_MEDIA_TYPES)
+        )
+
+    @classmethod
+    def make_thumbnails(cls, thumbnails, executor=None):
+        """Scale down a batch of full-size images and mirror the
+        resulting thumbnails.
+
+        The images are scaled in a pool of worker processes, and the
+        thumbnails are uploaded concurrently.
+
+        :param thumbnails: A list of 4-tuples (Representation,
+            thumbnail_url, mirror, collection), as gathered by
+            `mirror_link`.
+        :param executor: Passed into `Representation.scale_many`.
+        """
+        if not thumbnails:
+            return
+        results = Representation.scale_many(
+            [(representation, url)
+             for representation, url, mirror, collection in thumbnails],
+            max_height=Edition.MAX_THUMBNAIL_HEIGHT,
+            max_width=Edition.MAX_THUMBNAIL_WIDTH,
+            destination_media_type=Representation.PNG_MEDIA_TYPE,
+            force=True, executor=executor
+        )
+
+        # Group the new thumbnails by where they're going, so each
+        # mirror can upload its own thumbnails concurrently.
+        by_mirror = defaultdict(list)
+        for (representation, url, mirror, collection), (thumbnail, is_new) in zip(
+            thumbnails, results
+        ):
+            if is_new:
+                # A thumbnail was created distinct from the original
+                # image. Mirror it as well.
+                by_mirror[(mirror, collection)].append((thumbnail, url))
+        for (mirror, collection), batch in list(by_mirror.items()):
+            mirror.mirror_batch(batch, collection=collection)
+
+    def mirror_link(self, model_object, data_source, link, link_obj, policy,
+                    thumbnails=None):
         """Retrieve a copy of the given link and make sure it gets
         mirrored. If it's a full-size image, create a thumbnail and
         mirror that too.
 
         The model_object can be either a pool or an edition.
+
+        :param thumbnails: If this is a list, thumbnailing a full-size
+            image is put off until later; the image is added to this
+            list, and the caller is expected to pass the whole list
+            into `make_thumbnails`.
         """
         if link_obj.rel not in Hyperlink.MIRRORED:
             # we only host locally open-source epubs and cover images
@@ -743,6 +798,13 @@ class MetaToModelUtility(object):
             return
 
         http_get = policy.http_get
+        if self.can_stream(link, mirror, policy):
+            # Books and audiobooks can be huge. Rather than reading
+            # the whole file into memory, pass the response body
+            # straight through to the mirror.
+            http_get = functools.partial(
+                http_get or Representation.simple_http_get, stream=True
+            )
 
         _db = Session.object_session(link_obj)
         original_url = link.href
@@ -788,122 +850,134 @@ class MetaToModelUtility(object):
             max_age=max_age,
         )
 
-        # Make sure the (potentially newly-fetched) representation is
-        # associated with the resource.
-        link_obj.resource.representation = representation
-
-        # If we couldn't fetch this representation, don't mirror it,
-        # and if this was an open/protected access link, then suppress the associated
-        # license pool until someone fixes it manually.
-        # The license pool to suppress will be either the passed-in model_object (if it's of type pool),
-        # or the license pool associated with the passed-in model object (if it's of type edition).
-        if representation.fetch_exception:
-            if pools and link.rel == Hyperlink.OPEN_ACCESS_DOWNLOAD:
-                for pool in pools:
-                    pool.suppressed = True
-                    pool.license_exception = "Fetch exception: %s" % representation.fetch_exception
-                    self.log.error(pool.license_exception)
-            return
-
-        # If we fetched the representation and it hasn't changed,
-        # the previously mirrored version is fine. Don't mirror it
-        # again.
-        if representation.status_code == 304 and representation.mirror_url:
-            self.log.info(
-                "Representation has not changed, assuming mirror at %s is up to date.", representation.mirror_url
-            )
-            return
-
-        if representation.status_code // 100 not in (2,3):
-            self.log.info(
-                "Representation %s gave %s status code, not mirroring.",
-                representation.url, representation.status_code
-            )
-            return
+        # If the body is being streamed, the connection has to be
+        # released however this turns out.
+        stream = representation.content_stream
+        try:
+            # Make sure the (potentially newly-fetched) representation is
+            # associated with the resource.
+            link_obj.resource.representation = representation
+
+            # If we couldn't fetch this representation, don't mirror it,
+            # and if this was an open/protected access link, then suppress the associated
+            # license pool until someone fixes it manually.
+            # The license pool to suppress will be either the passed-in model_object (if it's of type pool),
+            # or the license pool associated with the passed-in model object (if it's of type edition).
+            if representation.fetch_exception:
+                if pools and link.rel == Hyperlink.OPEN_ACCESS_DOWNLOAD:
+                    for pool in pools:
+                        pool.suppressed = True
+                        pool.license_exception = "Fetch exception: %s" % representation.fetch_exception
+                        self.log.error(pool.license_exception)
+                return
 
-        if policy.content_modifier:
-            policy.content_modifier(representation)
-
-        # The metadata may have some idea about the media type for this
-        # LinkObject, but it could be wrong. If the representation we
-        # actually just saw is a mirrorable media type, that takes
-        # precedence. If we were expecting this link to be mirrorable
-        # but we actually saw something that's not, assume our original
-        # metadata was right and the server told us the wrong media type.
-        if representation.media_type and representation.mirrorable_media_type:
-            link.media_type = representation.media_type
-
-        if not representation.mirrorable_media_type:
-            if link.media_type:
-                self.log.info("Saw unsupported media type for %s: %s. Assuming original media type %s is correct",
-                              representation.url, representation.media_type, link.media_type)
-                representation.media_type = link.media_type
-            else:
-                self.log.info("Not mirroring %s: unsupported media type %s",
-                              representation.url, representation.media_type)
+            # If we fetched the representation and it hasn't changed,
+            # the previously mirrored version is fine. Don't mirror it
+            # again.
+            if representation.status_code == 304 and representation.mirror_url:
+                self.log.info(
+                    "Representation has not changed, assuming mirror at %s is up to date.", representation.mirror_url
+                )
                 return
 
-        # Determine the best URL to use when mirroring this
-        # representation.
-        if link.media_type in Representation.BOOK_MEDIA_TYPES or \
-                link.media_type in Representation.AUDIOBOOK_MEDIA_TYPES:
-            url_title = title or identifier.identifier
-            extension = representation.extension()
-            mirror_url = mirror.book_url(
-                identifier,
-                data_source=data_source,
-                title=url_title,
-                extension=extension,
-                open_access=link.rel == Hyperlink.OPEN_ACCESS_DOWNLOAD
-            )
-        else:
-            filename = representation.default_filename(
-                link_obj, representation.media_type
-            )
-            mirror_url = mirror.cover_image_url(
-                data_source, identifier, filename
-            )
+            if representation.status_code // 100 not in (2,3):
+                self.log.info(
+                    "Representation %s gave %s status code, not mirroring.",
+                    representation.url, representation.status_code
+                )
+                return
 
-        # Mirror it.
-        collection = pools[0].collection if pools else None
-        mirror.mirror_one(representation, mirror_to=mirror_url, collection=collection)
-
-        # If we couldn't mirror an open/protected access link representation, suppress
-        # the license pool until someone fixes it manually.
-        if representation.mirror_exception:
-            if pools and link.rel == Hyperlink.OPEN_ACCESS_DOWNLOAD:
-                for pool in pools:
-                    pool.suppressed = True
-                    pool.license_exception = "Mirror exception: %s" % representation.mirror_exception
-                    self.log.error(pool.license_exception)
-
-        if link_obj.rel == Hyperlink.IMAGE:
-            # Create and mirror a thumbnail.
-            thumbnail_filename = representation.default_filename(
-                link_obj, Representation.PNG_MEDIA_TYPE
-            )
-            thumbnail_url = mirror.cover_image_url(
-                data_source, identifier, thumbnail_filename,
-                Edition.MAX_THUMBNAIL_HEIGHT
-            )
-            thumbnail, is_new = representation.scale(
-                max_height=Edition.MAX_THUMBNAIL_HEIGHT,
-                max_width=Edition.MAX_THUMBNAIL_WIDTH,
-                destination_url=thumbnail_url,
-                destination_media_type=Representation.PNG_MEDIA_TYPE,
-                force=True
-            )
-            if is_new:
-                # A thumbnail was created distinct from the original
-                # image. Mirror it as well.
-                mirror.mirror_one(thumbnail, mirror_to=thumbnail_url, collection=collection)
+            if policy.content_modifier:
+                policy.content_modifier(representation)
+
+            # The metadata may have some idea about the media type for this
+            # LinkObject, but it could be wrong. If the representation we
+            # actually just saw is a mirrorable media type, that takes
+            # precedence. If we were expecting this link to be mirrorable
+            # but we actually saw something that's not, assume our original
+            # metadata was right and the server told us the wrong media type.
+            if representation.media_type and representation.mirrorable_media_type:
+                link.media_type = representation.media_type
+
+            if not representation.mirrorable_media_type:
+                if link.media_type:
+                    self.log.info("Saw unsupported media type for %s: %s. Assuming original media type %s is correct",
+                                  representation.url, representation.media_type, link.media_type)
+                    representation.media_type = link.media_type
+                else:
+                    self.log.info("Not mirroring %s: unsupported media type %s",
+                                  representation.url, representation.media_type)
+                    return
+
+            # Determine the best URL to use when mirroring this
+            # representation.
+            if link.media_type in Representation.BOOK_MEDIA_TYPES or \
+                    link.media_type in Representation.AUDIOBOOK_MEDIA_TYPES:
+                url_title = title or identifier.identifier
+                extension = representation.extension()
+                mirror_url = mirror.book_url(
+                    identifier,
+                    data_source=data_source,
+                    title=url_title,
+                    extension=extension,
+                    open_access=link.rel == Hyperlink.OPEN_ACCESS_DOWNLOAD
+                )
+            else:
+                filename = representation.default_filename(
+                    link_obj, representation.media_type
+                )
+                mirror_url = mirror.cover_image_url(
+                    data_source, identifier, filename
+                )
 
-        if link_obj.rel in Hyperlink.SELF_HOSTED_BOOKS:
-            # If we mirrored book content successfully, remove it from
-            # the database to save space. We do keep images in case we
-            # ever need to resize them or mirror them elsewhere.
-            if representation.mirrored_at and not representation.mirror_exception:
-                representation.content = None
+            # Mirror it.
+            collection = pools[0].collection if pools else None
+            mirror.mirror_one(representation, mirror_to=mirror_url, collection=collection)
+
+            # If we couldn't mirror an open/protected access link representation, suppress
+            # the license pool until someone fixes it manually.
+            if representation.mirror_exception:
+                if pools and link.rel == Hyperlink.OPEN_ACCESS_DOWNLOAD:
+                    for pool in pools:
+                        pool.suppressed = True
+                        pool.license_exception = "Mirror exception: %s" % representation.mirror_exception
+                        self.log.error(pool.license_exception)
+
+            if link_obj.rel == Hyperlink.IMAGE:
+                # Create and mirror a thumbnail.
+                thumbnail_filename = representation.default_filename(
+                    link_obj, Representation.PNG_MEDIA_TYPE
+                )
+                thumbnail_url = mirror.cover_image_url(
+                    data_source, identifier, thumbnail_filename,
+                    Edition.MAX_THUMBNAIL_HEIGHT
+                )
+                if thumbnails is not None:
+                    thumbnails.append(
+                        (representation, thumbnail_url, mirror, collection)
+                    )
+                    return
+                thumbnail, is_new = representation.scale(
+                    max_height=Edition.MAX_THUMBNAIL_HEIGHT,
+                    max_width=Edition.MAX_THUMBNAIL_WIDTH,
+                    destination_url=thumbnail_url,
+                    destination_media_type=Representation.PNG_MEDIA_TYPE,
+                    force=True
+                )
+                if is_new:
+                    # A thumbnail was created distinct from the original
+                    # image. Mirror it as well.
+                    mirror.mirror_one(thumbnail, mirror_to=thumbnail_url, collection=collection)
+
+            if link_obj.rel in Hyperlink.SELF_HOSTED_BOOKS:
+                # If we mirrored book content successfully, remove it from
+                # the database to save space. We do keep images in case we
+                # ever need to resize them or mirror them elsewhere.
+                if representation.mirrored_at and not representation.mirror_exception:
+                    representation.content = None
+        finally:
+            if stream is not None:
+                stream.close()
 
 
 class CirculationData(MetaToModelUtility):
@@ -2378,6 +2452,7 @@ class MARCExtractor(object):
 
     @classmethod
     def parse(cls, file, data_source_name, default_medium_type=None):
+        from pymarc import MARCReader
         reader = MARCReader(file)
         metadata_records = []
 
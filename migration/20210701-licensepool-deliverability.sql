@@ -0,0 +1,24 @@
+-- Precalculate whether each LicensePool can show up in a feed.
+CREATE TABLE IF NOT EXISTS licensepooldeliverability (
+    licensepool_id integer NOT NULL PRIMARY KEY REFERENCES licensepools(id) ON DELETE CASCADE,
+    collection_id integer NOT NULL REFERENCES collections(id) ON DELETE CASCADE,
+    work_id integer REFERENCES works(id) ON DELETE SET NULL,
+    deliverable boolean NOT NULL DEFAULT false,
+    licensed boolean NOT NULL DEFAULT false,
+    available boolean NOT NULL DEFAULT false,
+    suppressed boolean NOT NULL DEFAULT false
+);
+
+CREATE INDEX IF NOT EXISTS ix_licensepooldeliverability_work_id on licensepooldeliverability (work_id);
+CREATE INDEX IF NOT EXISTS ix_licensepooldeliverability_collection_id_work_id on licensepooldeliverability (collection_id, work_id);
+
+-- Fill it in for every existing LicensePool. From now on it will be
+-- kept up to date by the application.
+INSERT INTO licensepooldeliverability (licensepool_id, collection_id, work_id, deliverable, licensed, available, suppressed)
+SELECT lp.id, lp.collection_id, lp.work_id,
+    EXISTS (SELECT 1 FROM licensepooldeliveries lpdm WHERE lpdm.data_source_id = lp.data_source_id AND lpdm.identifier_id = lp.identifier_id),
+    coalesce(lp.licenses_owned > 0 OR lp.open_access OR lp.licenses_owned = -1 OR lp.self_hosted, false),
+    coalesce(lp.licenses_available > 0 OR lp.open_access OR lp.licenses_owned = -1 OR lp.self_hosted, false),
+    coalesce(lp.suppressed, false)
+FROM licensepools lp
+ON CONFLICT (licensepool_id) DO NOTHING;
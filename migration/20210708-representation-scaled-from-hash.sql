@@ -0,0 +1,3 @@
+-- Remember which version of an image each thumbnail was made from, so
+-- unchanged images don't have to be scaled again.
+ALTER TABLE representations ADD COLUMN IF NOT EXISTS scaled_from_hash varchar;
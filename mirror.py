@@ -1,4 +1,5 @@
 from abc import abstractmethod, ABCMeta
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlsplit
 
 from .config import CannotLoadConfiguration
@@ -18,6 +19,13 @@ class MirrorUploader(metaclass=ABCMeta):
     # to itself.
     IMPLEMENTATION_REGISTRY = {}
 
+    # The number of uploads mirror_batch() will run at once.
+    MIRROR_BATCH_CONCURRENCY = 4
+
+    # Set this to True if mirror_one() can upload content read from a
+    # stream, without needing the whole thing in memory.
+    STREAMING_UPLOADS = False
+
     @classmethod
     def mirror(cls, _db, storage_name=None, integration=None):
         """Create a MirrorUploader from an integration or storage name.
@@ -128,11 +136,71 @@ class MirrorUploader(metaclass=ABCMeta):
         else:
             representation.mirrored_at = now
 
-    def mirror_batch(self, representations):
-        """Mirror a batch of Representations at once."""
+    def mirror_batch(self, representations, collection=None):
+        """Mirror a batch of Representations at once.
+
+        If this uploader implements prepare_upload(), up to
+        MIRROR_BATCH_CONCURRENCY uploads run at the same time.
+        Otherwise each Representation is mirrored in turn with
+        mirror_one().
+
+        :param representations: A list of Representations, or of
+            2-tuples (Representation, mirror_to).
+        :param collection: Passed into `mirror_one`.
+        """
+        with ThreadPoolExecutor(self.MIRROR_BATCH_CONCURRENCY) as executor:
+            uploads = []
+            for item in representations:
+                if isinstance(item, tuple):
+                    representation, mirror_to = item
+                else:
+                    representation, mirror_to = item, ''
+                prepared = self.prepare_upload(
+                    representation, mirror_to, collection=collection
+                )
+                if prepared is None:
+                    self.mirror_one(
+                        representation, mirror_to=mirror_to,
+                        collection=collection
+                    )
+                    continue
+                # Only the upload itself happens on the thread pool.
+                # A Representation belongs to a database session,
+                # which isn't thread-safe, so it's only read and
+                # changed on this thread.
+                uploads.append(
+                    (representation, prepared,
+                     executor.submit(self.upload, prepared))
+                )
+            for representation, prepared, future in uploads:
+                self.finish_upload(
+                    representation, prepared, future.exception()
+                )
+
+    def prepare_upload(self, representation, mirror_to, collection=None):
+        """Read everything needed to mirror a Representation, so that
+        the upload can happen on another thread.
+
+        :return: An object to pass into upload() and finish_upload(),
+            or None if this uploader can only mirror a Representation
+            with mirror_one().
+        """
+        return None
+
+    def upload(self, prepared):
+        """Upload something returned by prepare_upload().
 
-        for representation in representations:
-            self.mirror_one(representation, '')
+        This may be called on a worker thread, so it must not touch the
+        database or any database objects.
+        """
+        raise NotImplementedError()
+
+    def finish_upload(self, representation, prepared, exception=None):
+        """Record the outcome of upload() on a Representation.
+
+        :param exception: The exception raised by upload(), if any.
+        """
+        raise NotImplementedError()
 
     def book_url(self, identifier, extension='.epub', open_access=True,
                  data_source=None, title=None):
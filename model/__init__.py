@@ -474,6 +474,13 @@ def production_session(initialize_data=True):
     # with the right arguments.
     from ..log import LogConfiguration
     LogConfiguration.initialize(_db)
+
+    if initialize_data:
+        # Find out about site configuration changes made by other
+        # processes through notifications, rather than by checking
+        # the database on every request.
+        from .listeners import SiteConfigurationChangeListener
+        SiteConfigurationChangeListener.start(_db)
     return _db
 
 from .admin import (
@@ -491,7 +498,10 @@ from .cachedfeed import (
     WillNotGenerateExpensiveFeed,
     CachedMARCFile,
 )
-from .circulationevent import CirculationEvent
+from .circulationevent import (
+    CirculationEvent,
+    CirculationEventBuffer,
+)
 from .classification import (
     Classification,
     Genre,
@@ -535,6 +545,7 @@ from .licensing import (
     DeliveryMechanism,
     License,
     LicensePool,
+    LicensePoolDeliverability,
     LicensePoolDeliveryMechanism,
     PolicyException,
     RightsStatus,
@@ -2,7 +2,9 @@
 # CirculationEvent
 
 
+import contextlib
 import logging
+import time
 from sqlalchemy import (
     Column,
     DateTime,
@@ -12,6 +14,7 @@ from sqlalchemy import (
     String,
     Unicode,
 )
+from sqlalchemy.dialects.postgresql import insert
 
 from . import (
     Base,
@@ -157,3 +160,154 @@ class CirculationEvent(Base):
         if was_new:
             logging.info("EVENT %s %s=>%s", event_name, old_value, new_value)
         return event, was_new
+
+    @classmethod
+    def log_many(cls, _db, events):
+        """Log a number of CirculationEvents to the database with a
+        single INSERT, ignoring any that have already been recorded.
+
+        :param events: A list of dictionaries, each containing values
+            for the columns of one CirculationEvent (license_pool_id,
+            library_id, type, start, etc.) Every dictionary must have
+            the same keys.
+
+        :return: The number of CirculationEvents actually created.
+        """
+        if not events:
+            return 0
+        statement = insert(cls.__table__).values(
+            events
+        ).on_conflict_do_nothing()
+        result = _db.execute(statement)
+        return result.rowcount
+
+
+class CirculationEventBuffer(object):
+    """Collect CirculationEvents in memory and write them to the
+    database in batches, rather than making two database round trips
+    per event.
+
+    While a buffer is installed on a database session (see
+    buffering()), LocalAnalyticsProvider sends events to the buffer
+    instead of calling CirculationEvent.log. The buffer is flushed
+    when it gets full, when it gets old, and whenever the session is
+    committed.
+    """
+
+    # Flush the buffer once this many events have piled up.
+    DEFAULT_BATCH_SIZE = 1000
+
+    # Flush the buffer once its oldest event has been waiting this
+    # many seconds.
+    DEFAULT_MAX_AGE = 60
+
+    # The key under which the buffer is stored in Session.info.
+    SESSION_KEY = 'circulation_event_buffer'
+
+    def __init__(self, _db, batch_size=None, max_age=None):
+        self._db = _db
+        self.batch_size = batch_size or self.DEFAULT_BATCH_SIZE
+        if max_age is None:
+            max_age = self.DEFAULT_MAX_AGE
+        self.max_age = max_age
+        self.events = {}
+        self.oldest = None
+
+    def __len__(self):
+        return len(self.events)
+
+    @classmethod
+    def for_session(cls, _db):
+        """Find the buffer installed on a database session, if any."""
+        return _db.info.get(cls.SESSION_KEY)
+
+    @classmethod
+    @contextlib.contextmanager
+    def buffering(cls, _db, **kwargs):
+        """Buffer all CirculationEvents logged through this database session
+        for the duration of a `with` block.
+
+        Anything left in the buffer is written to the database when
+        the block ends normally. If the block raises an exception, the
+        buffer is discarded, so that the original exception isn't
+        replaced by one raised while writing events to a session that
+        is about to be rolled back. A caller that will commit the
+        session anyway must flush the buffer itself before the
+        exception leaves the block.
+        """
+        previous = cls.for_session(_db)
+        buffer = cls(_db, **kwargs)
+        _db.info[cls.SESSION_KEY] = buffer
+        try:
+            yield buffer
+        finally:
+            if previous is None:
+                del _db.info[cls.SESSION_KEY]
+            else:
+                _db.info[cls.SESSION_KEY] = previous
+        buffer.flush()
+
+    def add(self, license_pool, event_name, old_value, new_value,
+            start=None, end=None, library=None, location=None):
+        """Buffer a CirculationEvent, assuming it hasn't already been
+        buffered.
+
+        :return: True if the event was added to the buffer, False
+            if it duplicated an event already in the buffer.
+        """
+        if not start:
+            start = utc_now()
+        key = (license_pool, event_name, start, library)
+        if key in self.events:
+            return False
+
+        if new_value is None or old_value is None:
+            delta = None
+        else:
+            delta = new_value - old_value
+        self.events[key] = dict(
+            old_value=old_value, new_value=new_value, delta=delta,
+            end=end or start, location=location
+        )
+        if self.oldest is None:
+            self.oldest = time.time()
+
+        if (len(self.events) >= self.batch_size
+            or time.time() - self.oldest >= self.max_age):
+            self.flush()
+        return True
+
+    def flush(self):
+        """Write all buffered events to the database.
+
+        :return: The number of CirculationEvents created.
+        """
+        if not self.events:
+            return 0
+        events = self.events
+        self.events = {}
+        self.oldest = None
+
+        # A LicensePool or Library created in this session may not
+        # have been assigned an ID yet.
+        for license_pool, ignore, ignore, library in events:
+            if ((license_pool is not None and license_pool.id is None)
+                or (library is not None and library.id is None)):
+                self._db.flush()
+                break
+
+        rows = []
+        for (license_pool, event_name, start, library), values in events.items():
+            row = dict(
+                license_pool_id=license_pool.id if license_pool else None,
+                library_id=library.id if library else None,
+                type=event_name, start=start,
+            )
+            row.update(values)
+            rows.append(row)
+        created = CirculationEvent.log_many(self._db, rows)
+        logging.info(
+            "Logged %d new circulation events (%d buffered)",
+            created, len(rows)
+        )
+        return created
@@ -4,7 +4,6 @@ from abc import ABCMeta, abstractmethod
 
 from sqlalchemy import (
     Column,
-    exists,
     ForeignKey,
     func,
     Integer,
@@ -45,7 +44,7 @@ from .integrationclient import IntegrationClient
 from .library import Library
 from .licensing import (
     LicensePool,
-    LicensePoolDeliveryMechanism,
+    LicensePoolDeliverability,
 )
 from .work import Work
 from . import (
@@ -768,13 +767,14 @@ class Collection(Base, HasFullTableCache):
         # Only find presentation-ready works.
         query = query.filter(Work.presentation_ready == True)
 
-        # Only find books that have some kind of DeliveryMechanism.
-        LPDM = LicensePoolDeliveryMechanism
-        exists_clause = exists().where(
-            and_(LicensePool.data_source_id==LPDM.data_source_id,
-                LicensePool.identifier_id==LPDM.identifier_id)
+        # Only find books with unsuppressed LicensePools that have
+        # some kind of DeliveryMechanism and available licenses (or
+        # come from self-hosted collections), in an appropriate
+        # collection. This was all worked out ahead of time.
+        query = LicensePoolDeliverability.restrict(
+            query, collection_ids=collection_ids,
+            show_suppressed=show_suppressed, allow_holds=allow_holds
         )
-        query = query.filter(exists_clause)
 
         # Some sources of audiobooks may be excluded because the
         # server can't fulfill them or the expected client can't play
@@ -789,37 +789,6 @@ class Collection(Base, HasFullTableCache):
                 or_(Edition.medium != EditionConstants.AUDIO_MEDIUM,
                     ~LicensePool.data_source_id.in_(audio_excluded_ids))
             )
-
-        # Only find books with unsuppressed LicensePools.
-        if not show_suppressed:
-            query = query.filter(LicensePool.suppressed==False)
-
-        # Only find books with available licenses or books from self-hosted collections using MirrorUploader
-        query = query.filter(
-            or_(
-                LicensePool.licenses_owned > 0,
-                LicensePool.open_access,
-                LicensePool.unlimited_access,
-                LicensePool.self_hosted
-            )
-        )
-
-        # Only find books in an appropriate collection.
-        if collection_ids is not None:
-            query = query.filter(
-                LicensePool.collection_id.in_(collection_ids)
-            )
-
-        # If we don't allow holds, hide any books with no available copies.
-        if not allow_holds:
-            query = query.filter(
-                or_(
-                    LicensePool.licenses_available > 0,
-                    LicensePool.open_access,
-                    LicensePool.self_hosted,
-                    LicensePool.unlimited_access
-                )
-            )
         return query
 
     def delete(self, search_index=None):
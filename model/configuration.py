@@ -6,6 +6,7 @@ import logging
 from abc import ABCMeta, abstractmethod
 from contextlib import contextmanager
 from enum import Enum
+from types import MappingProxyType
 
 from flask_babel import lazy_gettext as _
 from sqlalchemy import Column, ForeignKey, Index, Integer, Unicode, UniqueConstraint
@@ -458,9 +459,18 @@ class ExternalIntegration(Base, HasFullTableCache):
             key, self
         )
 
+    @property
+    def settings_snapshot(self):
+        """The values of all of this ExternalIntegration's
+        ConfigurationSettings, as an immutable dictionary.
+        """
+        return ConfigurationSetting.snapshot(
+            Session.object_session(self), external_integration=self
+        )
+
     @hybrid_property
     def url(self):
-        return self.setting(self.URL).value
+        return self.settings_snapshot.get(self.URL)
 
     @url.setter
     def url(self, new_url):
@@ -468,7 +478,7 @@ class ExternalIntegration(Base, HasFullTableCache):
 
     @hybrid_property
     def username(self):
-        return self.setting(self.USERNAME).value
+        return self.settings_snapshot.get(self.USERNAME)
 
     @username.setter
     def username(self, new_username):
@@ -476,7 +486,7 @@ class ExternalIntegration(Base, HasFullTableCache):
 
     @hybrid_property
     def password(self):
-        return self.setting(self.PASSWORD).value
+        return self.settings_snapshot.get(self.PASSWORD)
 
     @password.setter
     def password(self, new_password):
@@ -611,6 +621,15 @@ class ConfigurationSetting(Base, HasFullTableCache):
     _cache = HasFullTableCache.RESET
     _id_cache = HasFullTableCache.RESET
 
+    # The raw values of every ConfigurationSetting, grouped by
+    # (library_id, external_integration_id), and the site
+    # configuration version they were loaded at. Values with
+    # inheritance taken into account go into _snapshot_cache as
+    # they're needed.
+    _raw_values = HasFullTableCache.RESET
+    _raw_values_version = None
+    _snapshot_cache = {}
+
     def __repr__(self):
         return '<ConfigurationSetting: key=%s, ID=%d>' % (
             self.key, self.id)
@@ -708,6 +727,96 @@ class ConfigurationSetting(Base, HasFullTableCache):
         setting, ignore = cls.by_cache_key(_db, cache_key, create)
         return setting
 
+    @classmethod
+    def reset_cache(cls):
+        super(ConfigurationSetting, cls).reset_cache()
+        cls.reset_snapshots()
+
+    @classmethod
+    def reset_snapshots(cls):
+        """Make sure the next call to snapshot() loads fresh values
+        from the database.
+        """
+        cls._raw_values = cls.RESET
+        cls._snapshot_cache = {}
+
+    @classmethod
+    def snapshot(cls, _db, library=None, external_integration=None):
+        """Get the values of all ConfigurationSettings associated with
+        a Library and/or an ExternalIntegration.
+
+        This is a much faster way to read a lot of settings than
+        calling for_library_and_externalintegration() for each one.
+        Every snapshot is built from a single query against the
+        configurationsettings table, which is run again whenever a
+        ConfigurationSetting changes or the site configuration is
+        updated.
+
+        :return: An immutable dictionary mapping keys to values, with
+            the same inheritance rules as ConfigurationSetting.value.
+            A setting that doesn't exist is simply missing from the
+            dictionary; it is not created.
+        """
+        library_id = library.id if library else None
+        integration_id = (
+            external_integration.id if external_integration else None
+        )
+        if ((library and library_id is None)
+            or (external_integration and integration_id is None)):
+            # This object hasn't been written to the database yet.
+            _db.flush()
+            library_id = library.id if library else None
+            integration_id = (
+                external_integration.id if external_integration else None
+            )
+
+        version = Configuration.site_configuration_version()
+        if (cls._raw_values is cls.RESET
+            or cls._raw_values_version != version):
+            cls._load_raw_values(_db, version)
+
+        snapshot_key = (library_id, integration_id)
+        snapshot = cls._snapshot_cache.get(snapshot_key)
+        if snapshot is None:
+            snapshot = cls._build_snapshot(library_id, integration_id)
+            cls._snapshot_cache[snapshot_key] = snapshot
+        return snapshot
+
+    @classmethod
+    def _load_raw_values(cls, _db, version):
+        """Load the raw value of every ConfigurationSetting from the
+        database.
+        """
+        # Use a Query rather than a bare SELECT so that any pending
+        # changes are flushed first. This may reset the snapshots,
+        # so don't touch them until the query has run.
+        rows = _db.query(
+            cls.library_id, cls.external_integration_id, cls.key,
+            cls._value
+        ).all()
+        raw_values = {}
+        for library_id, integration_id, key, value in rows:
+            raw_values.setdefault((library_id, integration_id), {})[key] = value
+        cls._raw_values = raw_values
+        cls._raw_values_version = version
+        cls._snapshot_cache = {}
+
+    @classmethod
+    def _build_snapshot(cls, library_id, integration_id):
+        """Apply the ConfigurationSetting.value inheritance rules to the
+        raw values for a (library_id, integration_id) pair.
+        """
+        raw_values = cls._raw_values
+        values = dict(raw_values.get((library_id, integration_id), {}))
+        if library_id is not None:
+            # A library-specific setting inherits from the
+            # ExternalIntegration's setting or the sitewide setting.
+            defaults = raw_values.get((None, integration_id), {})
+            for key in set(values) | set(defaults):
+                if not values.get(key):
+                    values[key] = defaults.get(key)
+        return MappingProxyType(values)
+
     @hybrid_property
     def value(self):
 
@@ -772,8 +881,15 @@ class ConfigurationSetting(Base, HasFullTableCache):
         """Turn the value into a boolean if possible.
         :return: A boolean, or None if there is no value.
         """
-        if self.value:
-            if self.value.lower() in self.MEANS_YES:
+        return self.parse_bool(self.value)
+
+    @classmethod
+    def parse_bool(cls, value):
+        """Interpret a setting value as a boolean.
+        :return: A boolean, or None if there is no value.
+        """
+        if value:
+            if value.lower() in cls.MEANS_YES:
                 return True
             return False
         return None
@@ -784,8 +900,15 @@ class ConfigurationSetting(Base, HasFullTableCache):
         :return: An integer, or None if there is no value.
         :raise ValueError: If the value cannot be converted to an int.
         """
-        if self.value:
-            return int(self.value)
+        return self.parse_int(self.value)
+
+    @classmethod
+    def parse_int(cls, value):
+        """Interpret a setting value as an int.
+        :raise ValueError: If the value cannot be converted to an int.
+        """
+        if value:
+            return int(value)
         return None
 
     @property
@@ -794,8 +917,15 @@ class ConfigurationSetting(Base, HasFullTableCache):
         :return: A float, or None if there is no value.
         :raise ValueError: If the value cannot be converted to a float.
         """
-        if self.value:
-            return float(self.value)
+        return self.parse_float(self.value)
+
+    @classmethod
+    def parse_float(cls, value):
+        """Interpret a setting value as a float.
+        :raise ValueError: If the value cannot be converted to a float.
+        """
+        if value:
+            return float(value)
         return None
 
     @property
@@ -804,8 +934,15 @@ class ConfigurationSetting(Base, HasFullTableCache):
         :return: An object, or None if there is no value.
         :raise ValueError: If the value cannot be parsed as JSON.
         """
-        if self.value:
-            return json.loads(self.value)
+        return self.parse_json(self.value)
+
+    @classmethod
+    def parse_json(cls, value):
+        """Interpret a setting value as JSON.
+        :raise ValueError: If the value cannot be parsed as JSON.
+        """
+        if value:
+            return json.loads(value)
         return None
 
     # As of this release of the software, this is our best guess as to
@@ -13,6 +13,7 @@ from sqlalchemy import (
     Integer,
     Unicode,
     UniqueConstraint,
+    func,
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql.expression import or_
@@ -275,7 +276,11 @@ class CustomList(Base):
         return qu
 
     def update_size(self):
-        self.size = len(self.entries)
+        """Recount the entries in this list without loading them."""
+        _db = Session.object_session(self)
+        self.size = _db.query(func.count(CustomListEntry.id)).filter(
+            CustomListEntry.list_id==self.id
+        ).scalar()
 
 
 class CustomListEntry(Base):
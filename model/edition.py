@@ -41,7 +41,9 @@ from sqlalchemy import (
 from sqlalchemy.dialects.postgresql import JSON
 from sqlalchemy.ext.mutable import MutableDict
 from sqlalchemy.orm import relationship
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.orm.session import Session
+from sqlalchemy.sql.expression import bindparam
 from ..util import (
     LanguageCodes,
     TitleProcessor
@@ -617,6 +619,62 @@ class Edition(Base, EditionConstants):
         return WorkIDCalculator.permanent_id(
             norm_title, norm_author, medium)
 
+    @classmethod
+    def calculate_permanent_work_ids(cls, _db, editions):
+        """Calculate the permanent work IDs of many Editions at once.
+
+        Any permanent work IDs that changed are written to the database
+        with a single bulk UPDATE, rather than one UPDATE per Edition.
+
+        :param editions: A list of Editions.
+        :return: The number of Editions whose permanent work ID changed.
+        """
+        # Make sure every Edition has an ID we can UPDATE by.
+        _db.flush()
+
+        keys = []
+        for edition in editions:
+            title = edition.title_for_permanent_work_id
+            medium = cls.medium_for_permanent_work_id.get(edition.medium, None)
+            if not title or not medium:
+                # If a book has no title or medium, it has no
+                # permanent work ID.
+                key = None
+            else:
+                key = (title, edition.author_for_permanent_work_id, medium)
+            keys.append((edition, key))
+
+        permanent_ids = WorkIDCalculator.permanent_ids(
+            key for edition, key in keys if key
+        )
+
+        changes = []
+        for edition, key in keys:
+            old_id = edition.permanent_work_id
+            new_id = permanent_ids.get(key)
+            if new_id == old_id:
+                continue
+            logging.info(
+                "Permanent work ID for %d: %r -> %s (was %s)",
+                edition.id, key, new_id, old_id
+            )
+            changes.append(
+                dict(edition_id=edition.id, new_permanent_work_id=new_id)
+            )
+            # The database is about to be brought up to date, so
+            # there's no need for the ORM to write this value again.
+            set_committed_value(edition, 'permanent_work_id', new_id)
+
+        if changes:
+            table = cls.__table__
+            update = table.update().where(
+                table.c.id==bindparam('edition_id')
+            ).values(
+                permanent_work_id=bindparam('new_permanent_work_id')
+            )
+            _db.execute(update, changes)
+        return len(changes)
+
     UNKNOWN_AUTHOR = "[Unknown]"
 
 
@@ -6,6 +6,7 @@ from urllib.parse import quote, unquote
 from abc import ABCMeta, abstractmethod
 from collections import defaultdict
 from functools import total_ordering
+from expiringdict import ExpiringDict
 import isbnlib
 from sqlalchemy import (
     Boolean,
@@ -16,10 +17,14 @@ from sqlalchemy import (
     String,
     UniqueConstraint,
     func,
+    inspect,
+    tuple_,
 )
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import joinedload, relationship
 from sqlalchemy.orm.exc import MultipleResultsFound, NoResultFound
 from sqlalchemy.orm.session import Session
+from sqlalchemy.orm.util import identity_key
 from sqlalchemy.sql import select
 from sqlalchemy.sql.expression import and_, or_
 
@@ -127,6 +132,11 @@ class Identifier(Base, IdentifierConstants):
         UniqueConstraint('type', 'identifier'),
     )
 
+    # Maps (type, identifier) to the database ID of an Identifier
+    # that was recently looked up by parse_urns. Popular identifiers
+    # can then be found by ID -- often without a database query.
+    _id_cache = ExpiringDict(max_len=10000, max_age_seconds=3600)
+
     @classmethod
     def from_asin(cls, _db, asin, autocreate=True):
         """Turn an ASIN-like string into an Identifier.
@@ -308,55 +318,65 @@ class Identifier(Base, IdentifierConstants):
             except ValueError as e:
                 failures.append(urn)
 
-        identifiers_by_urn = dict()
-        def find_existing_identifiers(identifier_details):
-            if not identifier_details:
-                return
-            and_clauses = list()
-            for type, identifier in identifier_details:
-                and_clauses.append(
-                    and_(cls.type==type, cls.identifier==identifier)
-                )
-
-            identifiers = _db.query(cls).filter(or_(*and_clauses)).all()
+        identifiers_by_details = dict()
+        def found(identifiers):
             for identifier in identifiers:
-                identifiers_by_urn[identifier.urn] = identifier
-
-        # Find identifiers that are already in the database.
-        find_existing_identifiers(list(identifier_details.values()))
-
-        # Remove the existing identifiers from the identifier_details list,
-        # regardless of whether the provided URN was accurate.
-        existing_details = [(i.type, i.identifier) for i in list(identifiers_by_urn.values())]
-        identifier_details = {
-            k: v for k, v in list(identifier_details.items())
-            if v not in existing_details and k not in list(identifiers_by_urn.keys())
-        }
-
-        if not autocreate:
-            # Don't make new identifiers. Send back unfound urns as failures.
-            failures.extend(list(identifier_details.keys()))
-            return identifiers_by_urn, failures
-
-        # Find any identifier details that don't correspond to an existing
-        # identifier. Try to create them.
-        new_identifiers = list()
-        new_identifiers_details = set([])
-        for urn, details in list(identifier_details.items()):
-            if details in new_identifiers_details:
-                # For some reason, this identifier is here twice.
-                # Don't try to insert it twice.
+                details = (identifier.type, identifier.identifier)
+                identifiers_by_details[details] = identifier
+                cls._id_cache[details] = identifier.id
+
+        def missing():
+            return [
+                x for x in set(identifier_details.values())
+                if x not in identifiers_by_details
+            ]
+
+        # Look up any identifiers we've seen recently by ID. They may
+        # already be in the session.
+        cached_ids = dict()
+        for details in missing():
+            id = cls._id_cache.get(details)
+            if id is None:
                 continue
-            new_identifiers.append(dict(type=details[0], identifier=details[1]))
-            new_identifiers_details.add(details)
+            identifier = _db.identity_map.get(identity_key(cls, id))
+            if (identifier is not None
+                and not inspect(identifier).unloaded & {'type', 'identifier'}):
+                found([identifier])
+            else:
+                cached_ids[id] = details
+        if cached_ids:
+            found(_db.query(cls).filter(cls.id.in_(list(cached_ids.keys()))))
 
-        # Insert new identifiers into the database, then add them to the
-        # results.
-        if new_identifiers:
-            _db.bulk_insert_mappings(cls, new_identifiers)
-            _db.commit()
-        find_existing_identifiers(list(identifier_details.values()))
+        # Look up everything else by value, all at once.
+        find_existing = lambda details: _db.query(cls).filter(
+            tuple_(cls.type, cls.identifier).in_(details)
+        )
+        remaining = missing()
+        if remaining:
+            found(find_existing(remaining))
+            remaining = missing()
+
+        # Create any identifiers that don't exist yet. If some other
+        # process creates one in the meantime, that's fine.
+        if remaining and autocreate:
+            _db.execute(
+                insert(cls.__table__).values(
+                    [dict(type=type, identifier=identifier)
+                     for type, identifier in remaining]
+                ).on_conflict_do_nothing(
+                    index_elements=['type', 'identifier']
+                )
+            )
+            found(find_existing(remaining))
 
+        identifiers_by_urn = dict(
+            (identifier.urn, identifier)
+            for identifier in list(identifiers_by_details.values())
+        )
+        failures.extend(
+            urn for urn, details in list(identifier_details.items())
+            if details not in identifiers_by_details
+        )
         return identifiers_by_urn, failures
 
     @classmethod
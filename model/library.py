@@ -207,6 +207,17 @@ class Library(Base, HasFullTableCache):
             key, self
         )
 
+    @property
+    def settings_snapshot(self):
+        """The values of all of this Library's ConfigurationSettings
+        (including values inherited from sitewide settings), as an
+        immutable dictionary.
+        """
+        from .configuration import ConfigurationSetting
+        return ConfigurationSetting.snapshot(
+            Session.object_session(self), library=self
+        )
+
     @property
     def all_collections(self):
         for collection in self.collections:
@@ -241,7 +252,10 @@ class Library(Base, HasFullTableCache):
     @property
     def allow_holds(self):
         """Does this library allow patrons to put items on hold?"""
-        value = self.setting(self.ALLOW_HOLDS).bool_value
+        from .configuration import ConfigurationSetting
+        value = ConfigurationSetting.parse_bool(
+            self.settings_snapshot.get(self.ALLOW_HOLDS)
+        )
         if value is None:
             # If the library has not set a value for this setting,
             # holds are allowed.
@@ -251,7 +265,10 @@ class Library(Base, HasFullTableCache):
     @property
     def minimum_featured_quality(self):
         """The minimum quality a book must have to be 'featured'."""
-        value = self.setting(self.MINIMUM_FEATURED_QUALITY).float_value
+        from .configuration import ConfigurationSetting
+        value = ConfigurationSetting.parse_float(
+            self.settings_snapshot.get(self.MINIMUM_FEATURED_QUALITY)
+        )
         if value is None:
             value = 0.65
         return value
@@ -259,7 +276,10 @@ class Library(Base, HasFullTableCache):
     @property
     def featured_lane_size(self):
         """The minimum quality a book must have to be 'featured'."""
-        value = self.setting(self.FEATURED_LANE_SIZE).int_value
+        from .configuration import ConfigurationSetting
+        value = ConfigurationSetting.parse_int(
+            self.settings_snapshot.get(self.FEATURED_LANE_SIZE)
+        )
         if value is None:
             value = 15
         return value
@@ -267,7 +287,10 @@ class Library(Base, HasFullTableCache):
     @property
     def entrypoints(self):
         """The EntryPoints enabled for this library."""
-        values = self.setting(EntryPoint.ENABLED_SETTING).json_value
+        from .configuration import ConfigurationSetting
+        values = ConfigurationSetting.parse_json(
+            self.settings_snapshot.get(EntryPoint.ENABLED_SETTING)
+        )
         if values is None:
             # No decision has been made about enabled EntryPoints.
             for cls in EntryPoint.DEFAULT_ENABLED:
@@ -282,12 +305,15 @@ class Library(Base, HasFullTableCache):
 
     def enabled_facets(self, group_name):
         """Look up the enabled facets for a given facet group."""
-        setting = self.enabled_facets_setting(group_name)
+        from .configuration import ConfigurationSetting
+        raw_value = self.settings_snapshot.get(
+            self.ENABLED_FACETS_KEY_PREFIX + group_name
+        )
         try:
-            value = setting.json_value
+            value = ConfigurationSetting.parse_json(raw_value)
         except ValueError as e:
             logging.error("Invalid list of enabled facets for %s: %s",
-                          group_name, setting.value)
+                          group_name, raw_value)
         if value is None:
             value = list(
                 FacetConstants.DEFAULT_ENABLED_FACETS.get(group_name, [])
@@ -372,7 +398,9 @@ class Library(Base, HasFullTableCache):
 
     def default_facet(self, group_name):
         """Look up the default facet for a given facet group."""
-        value = self.default_facet_setting(group_name).value
+        value = self.settings_snapshot.get(
+            self.DEFAULT_FACET_KEY_PREFIX + group_name
+        )
         if not value:
             value = FacetConstants.DEFAULT_FACET.get(group_name)
         return value
@@ -12,13 +12,25 @@ from sqlalchemy import (
     String,
     Unicode,
     UniqueConstraint,
+    and_,
+    bindparam,
+    exists,
+    or_,
+    select,
+    tuple_,
 )
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.util import identity_key
 from sqlalchemy.orm.session import Session
 from sqlalchemy.sql.functions import func
 
-from .circulationevent import CirculationEvent
+from .circulationevent import (
+    CirculationEvent,
+    CirculationEventBuffer,
+)
 from .complaint import Complaint
 from .constants import DataSourceConstants, EditionConstants, LinkRelations, MediaTypes
 from .hasfulltablecache import HasFullTableCache
@@ -627,6 +639,196 @@ class LicensePool(Base):
                 old_value=old_value, new_value=new_value
             )
 
+    # The events implied by an increase or decrease in each of the
+    # availability counters, in the order update_availability checks
+    # them.
+    AVAILABILITY_EVENTS = [
+        ('patrons_in_hold_queue', CirculationEvent.DISTRIBUTOR_HOLD_PLACE,
+         CirculationEvent.DISTRIBUTOR_HOLD_RELEASE),
+        ('licenses_available', CirculationEvent.DISTRIBUTOR_CHECKIN,
+         CirculationEvent.DISTRIBUTOR_CHECKOUT),
+        ('licenses_reserved', CirculationEvent.DISTRIBUTOR_AVAILABILITY_NOTIFY,
+         None),
+        ('licenses_owned', CirculationEvent.DISTRIBUTOR_LICENSE_ADD,
+         CirculationEvent.DISTRIBUTOR_LICENSE_REMOVE),
+    ]
+
+    # How the availability counters are described in log messages.
+    CHANGELOG_LABELS = [
+        ("OWN", 'licenses_owned'),
+        ("AVAIL", 'licenses_available'),
+        ("RSRV", 'licenses_reserved'),
+        ("HOLD", 'patrons_in_hold_queue'),
+    ]
+
+    @classmethod
+    def update_availability_bulk(cls, _db, availability, analytics=None):
+        """Update a large number of LicensePools with new availability
+        information, without loading them into the session.
+
+        This has the same effect as calling update_availability()
+        on each LicensePool, except that a Work's last_update_time is
+        only changed (and its search document only reindexed) if the
+        availability of one of its LicensePools actually changed.
+
+        :param availability: A list of 6-tuples (license_pool_id,
+            licenses_owned, licenses_available, licenses_reserved,
+            patrons_in_hold_queue, as_of). As with
+            update_availability(), a value of None means the number
+            is unknown, and an `as_of` of CirculationEvent.NO_DATE
+            means LicensePool.last_checked should not be updated.
+
+        :param analytics: The implied CirculationEvents will be
+            collected by this Analytics object.
+
+        :return: A list of IDs of the LicensePools whose availability
+            changed.
+        """
+        from .coverage import WorkCoverageRecord
+        from .work import Work
+        if not availability:
+            return []
+
+        # Make sure we see any changes made in this session.
+        _db.flush()
+
+        fields = [x[0] for x in cls.AVAILABILITY_EVENTS]
+        table = cls.__table__
+        columns = [table.c[x] for x in fields]
+        pool_ids = [x[0] for x in availability]
+        current = dict(
+            (row[0], row[1:]) for row in _db.execute(
+                select(
+                    [table.c.id, table.c.work_id, table.c.last_checked]
+                    + columns
+                ).where(table.c.id.in_(pool_ids))
+            )
+        )
+
+        now = utc_now()
+        updates = []
+        changed = []
+        events = []
+        work_update_times = {}
+        for pool_id, owned, available, reserved, holds, as_of in availability:
+            if pool_id not in current:
+                continue
+            work_id, last_checked = current[pool_id][:2]
+            old_values = dict(zip(fields, current[pool_id][2:]))
+            new_values = dict(
+                licenses_owned=owned, licenses_available=available,
+                licenses_reserved=reserved, patrons_in_hold_queue=holds,
+            )
+            if not as_of:
+                as_of = now
+            elif as_of == CirculationEvent.NO_DATE:
+                as_of = None
+
+            changes_made = False
+            for field, more_event, fewer_event in cls.AVAILABILITY_EVENTS:
+                old_value = old_values[field]
+                new_value = new_values[field]
+                if new_value is None:
+                    new_values[field] = old_value
+                    continue
+                if old_value == new_value:
+                    continue
+                changes_made = True
+                if old_value < new_value:
+                    event_name = more_event
+                else:
+                    event_name = fewer_event
+                if event_name:
+                    events.append(
+                        (pool_id, event_name, as_of, old_value, new_value)
+                    )
+
+            any_data = any(
+                x is not None for x in (owned, available, reserved, holds)
+            )
+            if not (changes_made or (as_of and any_data)):
+                continue
+
+            if as_of:
+                new_values['last_checked'] = as_of
+            else:
+                new_values['last_checked'] = last_checked
+            new_values['pool_id'] = pool_id
+            updates.append(new_values)
+
+            if changes_made:
+                changed.append(pool_id)
+                message = "CHANGED LicensePool %s"
+                args = [pool_id]
+                for label, field in cls.CHANGELOG_LABELS:
+                    if old_values[field] != new_values[field]:
+                        message += " %s: %s=>%s"
+                        args.extend(
+                            [label, old_values[field], new_values[field]]
+                        )
+                logging.info(message, *args)
+                if as_of and work_id:
+                    latest = work_update_times.get(work_id)
+                    if not latest or as_of > latest:
+                        work_update_times[work_id] = as_of
+
+        if updates:
+            values = dict((field, bindparam(field)) for field in fields)
+            values['last_checked'] = bindparam('last_checked')
+            _db.execute(
+                table.update().where(
+                    table.c.id==bindparam('pool_id')
+                ).values(**values),
+                updates
+            )
+            # Don't let any LicensePools already in the session hold
+            # on to the old values.
+            for update in updates:
+                pool = _db.identity_map.get(
+                    identity_key(cls, update['pool_id'])
+                )
+                if pool is not None:
+                    _db.expire(pool, fields + ['last_checked'])
+            LicensePoolDeliverability.refresh(
+                _db, licensepool_ids=[x['pool_id'] for x in updates]
+            )
+
+        if work_update_times:
+            works_table = Work.__table__
+            _db.execute(
+                works_table.update().where(
+                    works_table.c.id==bindparam('work_id')
+                ).values(last_update_time=bindparam('new_last_update_time')),
+                [dict(work_id=work_id, new_last_update_time=as_of)
+                 for work_id, as_of in list(work_update_times.items())]
+            )
+            works = _db.query(Work).filter(
+                Work.id.in_(list(work_update_times.keys()))
+            ).all()
+            for work in works:
+                set_committed_value(
+                    work, 'last_update_time', work_update_times[work.id]
+                )
+            WorkCoverageRecord.bulk_add(
+                works, WorkCoverageRecord.UPDATE_SEARCH_INDEX_OPERATION,
+                status=WorkCoverageRecord.REGISTERED
+            )
+
+        if analytics and events:
+            pools = dict(
+                (pool.id, pool) for pool in _db.query(cls).filter(
+                    cls.id.in_(set(x[0] for x in events))
+                )
+            )
+            # Let the local analytics provider write all of these
+            # events at once.
+            with CirculationEventBuffer.buffering(_db):
+                for pool_id, event_name, as_of, old_value, new_value in events:
+                    pools[pool_id].collect_analytics_event(
+                        analytics, event_name, as_of, old_value, new_value
+                    )
+        return changed
+
     def update_availability_from_delta(self, event_type, event_date, delta, analytics=None):
         """Call update_availability based on a single change seen in the
         distributor data, rather than a complete snapshot of
@@ -1205,6 +1407,151 @@ class LicensePool(Base):
 
 Index("ix_licensepools_data_source_id_identifier_id_collection_id", LicensePool.collection_id, LicensePool.data_source_id, LicensePool.identifier_id, unique=True)
 
+
+class LicensePoolDeliverability(Base):
+    """A precalculated summary of whether a LicensePool can show up in
+    a feed.
+
+    Finding out whether a LicensePool is deliverable means looking
+    for a LicensePoolDeliveryMechanism, and finding out whether it's
+    licensed or available means looking at several different
+    fields. Every database-backed feed needs to know these things
+    about every LicensePool it considers, so the answers are kept
+    here, one row per LicensePool. They're kept up to date whenever a
+    LicensePool or LicensePoolDeliveryMechanism is written to the
+    database (see model.listeners).
+    """
+
+    __tablename__ = 'licensepooldeliverability'
+
+    licensepool_id = Column(
+        Integer, ForeignKey('licensepools.id', ondelete='CASCADE'),
+        primary_key=True
+    )
+
+    # These are copied from the LicensePool so that a feed can be
+    # restricted to certain collections without looking anything up
+    # in the licensepools table.
+    collection_id = Column(
+        Integer, ForeignKey('collections.id', ondelete='CASCADE'),
+        nullable=False
+    )
+    work_id = Column(
+        Integer, ForeignKey('works.id', ondelete='SET NULL'), index=True
+    )
+
+    # The LicensePool has at least one LicensePoolDeliveryMechanism.
+    deliverable = Column(Boolean, nullable=False, default=False)
+
+    # The LicensePool has licenses, or doesn't need them.
+    licensed = Column(Boolean, nullable=False, default=False)
+
+    # A copy could be checked out right now.
+    available = Column(Boolean, nullable=False, default=False)
+
+    suppressed = Column(Boolean, nullable=False, default=False)
+
+    __table_args__ = (
+        Index(
+            "ix_licensepooldeliverability_collection_id_work_id",
+            collection_id, work_id
+        ),
+    )
+
+    @classmethod
+    def refresh(cls, _db, licensepool_ids=None, delivery_mechanisms=None):
+        """Recalculate the deliverability of some LicensePools.
+
+        If neither `licensepool_ids` nor `delivery_mechanisms` is
+        provided, every LicensePool is recalculated.
+
+        :param licensepool_ids: Recalculate these LicensePools.
+
+        :param delivery_mechanisms: Recalculate every LicensePool
+            for any of these (data_source_id, identifier_id) 2-tuples.
+            This is how LicensePoolDeliveryMechanisms are associated
+            with LicensePools.
+        """
+        LPDM = LicensePoolDeliveryMechanism
+        deliverable = exists().where(
+            and_(LPDM.data_source_id==LicensePool.data_source_id,
+                 LPDM.identifier_id==LicensePool.identifier_id)
+        )
+        unlicensed_access = or_(
+            LicensePool.open_access==True,
+            LicensePool.unlimited_access,
+            LicensePool.self_hosted==True,
+        )
+        licensed = or_(LicensePool.licenses_owned > 0, unlicensed_access)
+        available = or_(LicensePool.licenses_available > 0, unlicensed_access)
+        qu = select([
+            LicensePool.id,
+            LicensePool.collection_id,
+            LicensePool.work_id,
+            deliverable,
+            func.coalesce(licensed, False),
+            func.coalesce(available, False),
+            func.coalesce(LicensePool.suppressed, False),
+        ])
+
+        clauses = []
+        if licensepool_ids:
+            clauses.append(LicensePool.id.in_(licensepool_ids))
+        if delivery_mechanisms:
+            clauses.append(
+                tuple_(LicensePool.data_source_id, LicensePool.identifier_id).in_(
+                    delivery_mechanisms
+                )
+            )
+        if clauses:
+            qu = qu.where(or_(*clauses))
+        elif licensepool_ids is not None or delivery_mechanisms is not None:
+            # We were given an empty list of things to refresh.
+            return
+
+        table = cls.__table__
+        columns = ['licensepool_id', 'collection_id', 'work_id',
+                   'deliverable', 'licensed', 'available', 'suppressed']
+        insert_stmt = insert(table).from_select(columns, qu)
+        _db.execute(
+            insert_stmt.on_conflict_do_update(
+                index_elements=[table.c.licensepool_id],
+                set_=dict(
+                    (column, insert_stmt.excluded[column])
+                    for column in columns[1:]
+                )
+            )
+        )
+
+    @classmethod
+    def restrict(cls, query, collection_ids=None, show_suppressed=False,
+                 allow_holds=True):
+        """Restrict a query to LicensePools that can show up in a feed.
+
+        This assumes the query has an active join against LicensePool.
+
+        :param collection_ids: Only include LicensePools in these
+            collections.
+
+        :param show_suppressed: Include suppressed LicensePools.
+
+        :param allow_holds: If false, LicensePools with no available
+            copies will be excluded.
+        """
+        query = query.filter(cls.licensepool_id==LicensePool.id)
+        query = query.filter(cls.deliverable==True)
+        if allow_holds:
+            query = query.filter(cls.licensed==True)
+        else:
+            # Anything that's available is also licensed.
+            query = query.filter(cls.available==True)
+        if not show_suppressed:
+            query = query.filter(cls.suppressed==False)
+        if collection_ids is not None:
+            query = query.filter(cls.collection_id.in_(collection_ids))
+        return query
+
+
 class LicensePoolDeliveryMechanism(Base):
     """A mechanism for delivering a specific book from a specific
     distributor.
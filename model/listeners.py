@@ -1,6 +1,7 @@
 # encoding: utf-8
 
 import datetime
+import logging
 from sqlalchemy import (
     event,
     text,
@@ -17,6 +18,7 @@ from .admin import (
     Admin,
     AdminRole,
 )
+from .circulationevent import CirculationEventBuffer
 from .datasource import DataSource
 from .classification import Genre
 from .collection import Collection
@@ -29,9 +31,11 @@ from .library import Library
 from .licensing import (
     DeliveryMechanism,
     LicensePool,
+    LicensePoolDeliverability,
+    LicensePoolDeliveryMechanism,
 )
 from .work import Work
-from ..util.datetime_helpers import to_utc, utc_now
+from ..util.datetime_helpers import strptime_utc, to_utc, utc_now
 
 
 site_configuration_has_changed_lock = RLock()
@@ -87,6 +91,10 @@ def _site_configuration_has_changed(_db, cooldown=1):
                  finish=now, earlier=earlier)
         )
 
+        # Tell other processes about the change. They'll hear about
+        # it when this transaction is committed.
+        SiteConfigurationChangeListener.notify(_db, now)
+
         # Update the Configuration's record of when the configuration
         # was updated. This will update our local record immediately
         # without requiring a trip to the database.
@@ -94,6 +102,161 @@ def _site_configuration_has_changed(_db, cooldown=1):
             _db, known_value=now
         )
 
+
+class SiteConfigurationChangeListener(object):
+    """Find out about site configuration changes made by other
+    processes, without having to poll the database.
+
+    site_configuration_has_changed() sends a Postgres NOTIFY whenever
+    it updates the timestamp. An instance of this class LISTENs for
+    those notifications on its own database connection. Checking for
+    notifications doesn't require a round trip to the database.
+
+    A connection that has silently died would never deliver another
+    notification, so once every HEARTBEAT_INTERVAL seconds poll()
+    makes sure the connection still works. If it doesn't, poll()
+    raises an exception and the caller goes back to polling the
+    database.
+    """
+
+    CHANNEL = "site_configuration_changed"
+
+    HEARTBEAT_INTERVAL = 60
+
+    # The format of the timestamp sent along with a notification.
+    TIME_FORMAT = "%Y-%m-%dT%H:%M:%S.%f"
+
+    log = logging.getLogger("Site configuration change listener")
+
+    def __init__(self, connection):
+        """Constructor.
+
+        :param connection: A psycopg2 connection which will be used
+            only for listening to notifications.
+        """
+        self.connection = connection
+        self.connection.autocommit = True
+        cursor = self.connection.cursor()
+        cursor.execute("LISTEN %s" % self.CHANNEL)
+        cursor.close()
+
+        # Request threads share this connection, and psycopg2
+        # connections aren't safe to use from two threads at once.
+        self.lock = RLock()
+        self.last_heartbeat = utc_now()
+
+    @classmethod
+    def start(cls, _db):
+        """Start listening for site configuration changes.
+
+        Once this is done, Configuration.site_configuration_last_update
+        will stop polling the database.
+
+        :return: A SiteConfigurationChangeListener, or None if it was
+            not possible to start listening.
+        """
+        if Configuration.site_configuration_change_listener:
+            # This process is already listening.
+            return Configuration.site_configuration_change_listener
+        try:
+            # Take a connection out of the pool for good.
+            connection = _db.get_bind().engine.raw_connection()
+            connection.detach()
+            listener = cls(connection.connection)
+        except Exception as e:
+            cls.log.error(
+                "Could not listen for site configuration changes; will poll the database instead.",
+                exc_info=e
+            )
+            return None
+
+        # We may have missed a change before we started listening.
+        Configuration.site_configuration_last_update(_db, timeout=0)
+        Configuration.site_configuration_change_listener = listener
+        return listener
+
+    def stop(self):
+        """Stop listening and go back to polling the database."""
+        if Configuration.site_configuration_change_listener is self:
+            Configuration.site_configuration_change_listener = None
+        with self.lock:
+            self.connection.close()
+
+    @classmethod
+    def notify(cls, _db, when):
+        """Tell every listening process that the site configuration
+        changed at the given time.
+        """
+        _db.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            dict(channel=cls.CHANNEL,
+                 payload=when.strftime(cls.TIME_FORMAT))
+        )
+
+    def _receive(self):
+        """Collect the payloads of any notifications that have arrived,
+        making sure the connection is still alive.
+
+        Must be called with self.lock held.
+        """
+        if self.connection.closed:
+            raise Exception("Listening connection was closed.")
+        now = utc_now()
+        if ((now - self.last_heartbeat).total_seconds()
+            >= self.HEARTBEAT_INTERVAL):
+            cursor = self.connection.cursor()
+            cursor.execute("SELECT 1")
+            cursor.close()
+            self.last_heartbeat = now
+        self.connection.poll()
+        payloads = []
+        while self.connection.notifies:
+            payloads.append(self.connection.notifies.pop(0).payload)
+        return payloads
+
+    def poll(self):
+        """Check for notifications without blocking.
+
+        If another process changed the site configuration, the
+        in-memory caches of configuration objects are reset.
+
+        :return: The most recent time the site configuration is known
+            to have changed, or None if there's no news.
+
+        :raise: An exception if the listening connection has stopped
+            working. The connection is closed first.
+        """
+        with self.lock:
+            try:
+                payloads = self._receive()
+            except Exception:
+                self.connection.close()
+                raise
+
+        latest = None
+        for payload in payloads:
+            try:
+                when = strptime_utc(payload, self.TIME_FORMAT)
+            except ValueError:
+                self.log.error(
+                    "Ignoring unparseable notification: %r", payload
+                )
+                continue
+            if not latest or when > latest:
+                latest = when
+
+        known = Configuration._site_configuration_last_update()
+        if not latest or (known and latest <= known):
+            # Either nothing happened, or it was this process that
+            # made the change.
+            return None
+
+        for cls in (Admin, AdminRole, Collection, ConfigurationSetting,
+                    DataSource, DeliveryMechanism, ExternalIntegration,
+                    Genre, Library):
+            cls.reset_cache()
+        return latest
+
 def directly_modified(obj):
     """Return True only if `obj` has itself been modified, as opposed to
     having an object added or removed to one of its associated
@@ -176,6 +339,19 @@ def refresh_configuration_settings(mapper, connection, target):
     # the cache will be repopulated.
     ConfigurationSetting.reset_cache()
 
+@event.listens_for(ConfigurationSetting._value, 'set')
+def configuration_setting_value_change(target, value, oldvalue, initiator):
+    # A new value may not be flushed to the database for a while, but
+    # anyone who looks at a settings snapshot must see it immediately.
+    if value != oldvalue:
+        ConfigurationSetting.reset_snapshots()
+
+@event.listens_for(Session, 'after_rollback')
+def configuration_setting_rollback(session):
+    # A settings snapshot may contain values that were never
+    # committed.
+    ConfigurationSetting.reset_snapshots()
+
 @event.listens_for(DataSource, 'after_insert')
 @event.listens_for(DataSource, 'after_delete')
 @event.listens_for(DataSource, 'after_update')
@@ -304,3 +480,35 @@ def last_update_time_change(target, value, oldvalue, initator):
     information changes.
     """
     target.external_index_needs_updating()
+
+@event.listens_for(Session, 'before_commit')
+def flush_circulation_event_buffer(session):
+    """Buffered CirculationEvents must be written to the database before
+    the transaction they belong to is committed.
+    """
+    buffer = CirculationEventBuffer.for_session(session)
+    if buffer is not None:
+        buffer.flush()
+
+@event.listens_for(Session, 'after_flush')
+def refresh_licensepool_deliverability(session, flush_context):
+    """Whenever a LicensePool or LicensePoolDeliveryMechanism is
+    written to the database, recalculate the deliverability of the
+    affected LicensePools.
+    """
+    licensepool_ids = set()
+    delivery_mechanisms = set()
+    for obj in session.new | session.dirty:
+        if isinstance(obj, LicensePool):
+            licensepool_ids.add(obj.id)
+        elif isinstance(obj, LicensePoolDeliveryMechanism):
+            delivery_mechanisms.add((obj.data_source_id, obj.identifier_id))
+    for obj in session.deleted:
+        # A deleted LicensePool takes its deliverability with it.
+        if isinstance(obj, LicensePoolDeliveryMechanism):
+            delivery_mechanisms.add((obj.data_source_id, obj.identifier_id))
+    if licensepool_ids or delivery_mechanisms:
+        LicensePoolDeliverability.refresh(
+            session, licensepool_ids=licensepool_ids,
+            delivery_mechanisms=delivery_mechanisms
+        )
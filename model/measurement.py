@@ -145,11 +145,7 @@ class Measurement(Base):
     def overall_quality(cls, measurements, popularity_weight=0.3,
                         rating_weight=0.7, default_value=0):
         """Turn a bunch of measurements into an overall measure of quality."""
-        if popularity_weight + rating_weight != 1.0:
-            raise ValueError(
-                "Popularity weight and rating weight must sum to 1! (%.2f + %.2f)" % (
-                    popularity_weight, rating_weight)
-        )
+        cls._check_weights(popularity_weight, rating_weight)
         popularities = []
         ratings = []
         qualities = []
@@ -168,6 +164,86 @@ class Measurement(Base):
         popularity = cls._average_normalized_value(popularities)
         rating = cls._average_normalized_value(ratings)
         quality = cls._average_normalized_value(qualities)
+        return cls._combine_quality(
+            popularity, rating, quality, popularity_weight, rating_weight,
+            default_value
+        )
+
+    @classmethod
+    def overall_quality_many(cls, measurements, default_values,
+                             popularity_weight=0.3, rating_weight=0.7):
+        """Calculate the overall quality of many things at once.
+
+        This does the same work as calling overall_quality() once for
+        each thing, but it works on raw values rather than Measurement
+        objects, so there's no need to load a Measurement (or its
+        DataSource) for each value.
+
+        :param measurements: An iterable of 6-tuples (key,
+            quantity_measured, data_source_name, value, weight,
+            normalized_value). `key` identifies the thing being
+            measured. `normalized_value` is the previously stored
+            normalized value, if any.
+        :param default_values: A dictionary mapping each key to the
+            quality it should get if there are no usable measurements
+            for it.
+
+        :return: A dictionary mapping each key in `default_values` to
+            its overall quality.
+        """
+        cls._check_weights(popularity_weight, rating_weight)
+
+        # For each key, the running total and total weight of its
+        # popularity, rating and quality measurements.
+        totals = dict(
+            (key, [0, 0, 0, 0, 0, 0]) for key in default_values
+        )
+        for (key, quantity_measured, data_source_name, value, weight,
+             normalized_value) in measurements:
+            running = totals.get(key)
+            if running is None:
+                continue
+            if not normalized_value:
+                normalized_value = cls.normalize(
+                    quantity_measured, data_source_name, value
+                )
+                if normalized_value is None:
+                    continue
+            if quantity_measured == cls.RATING:
+                i = 2
+            elif quantity_measured == cls.QUALITY:
+                i = 4
+            else:
+                i = 0
+            running[i] += normalized_value * weight
+            running[i+1] += weight
+
+        results = {}
+        for key, running in list(totals.items()):
+            popularity, rating, quality = [
+                running[i] / running[i+1] if running[i+1] else None
+                for i in (0, 2, 4)
+            ]
+            results[key] = cls._combine_quality(
+                popularity, rating, quality, popularity_weight,
+                rating_weight, default_values[key]
+            )
+        return results
+
+    @classmethod
+    def _check_weights(cls, popularity_weight, rating_weight):
+        if popularity_weight + rating_weight != 1.0:
+            raise ValueError(
+                "Popularity weight and rating weight must sum to 1! (%.2f + %.2f)" % (
+                    popularity_weight, rating_weight)
+        )
+
+    @classmethod
+    def _combine_quality(cls, popularity, rating, quality, popularity_weight,
+                         rating_weight, default_value):
+        """Combine average popularity, rating and quality scores into
+        an overall measure of quality.
+        """
         if popularity is None and rating is None and quality is None:
             # We have absolutely no idea about the quality of this work.
             return default_value
@@ -226,29 +302,46 @@ class Measurement(Base):
             pass
         elif self.value is None:
             return None
-        elif self.data_source.name == DataSourceConstants.METADATA_WRANGLER:
-            # Data from the metadata wrangler comes in pre-normalized.
-            self._normalized_value = self.value
-        elif (self.quantity_measured == self.RATING
-              and self.data_source.name in self.RATING_SCALES):
-            # Ratings need to be normalized from a scale that depends
-            # on the data source (e.g. Amazon's 1-5 stars) to a 0..1 scale.
-            scale_min, scale_max = self.RATING_SCALES[self.data_source.name]
-            width = float(scale_max-scale_min)
-            value = self.value-scale_min
-            self._normalized_value = value / width
-        elif self.quantity_measured in self.PERCENTILE_SCALES:
-            # Other measured quantities need to be normalized using
-            # a percentile scale determined emperically.
-            by_data_source = self.PERCENTILE_SCALES[
-                self.quantity_measured
-            ]
-            if not self.data_source.name in by_data_source:
+        else:
+            normalized_value = self.normalize(
+                self.quantity_measured, self.data_source.name, self.value
+            )
+            if normalized_value is not None:
+                self._normalized_value = normalized_value
+            elif self.quantity_measured in self.PERCENTILE_SCALES:
                 # We don't know how to normalize measurements from
                 # this data source. Ignore this data.
                 return None
-            percentiles = by_data_source[self.data_source.name]
-            position = bisect.bisect_left(percentiles, self.value)
-            self._normalized_value = position * 0.01
 
         return self._normalized_value
+
+    @classmethod
+    def normalize(cls, quantity_measured, data_source_name, value):
+        """Normalize a measured value to the 0..1 range.
+
+        :return: The normalized value, or None if there's no way to
+            normalize this kind of measurement.
+        """
+        if value is None:
+            return None
+        if data_source_name == DataSourceConstants.METADATA_WRANGLER:
+            # Data from the metadata wrangler comes in pre-normalized.
+            return value
+        if (quantity_measured == cls.RATING
+            and data_source_name in cls.RATING_SCALES):
+            # Ratings need to be normalized from a scale that depends
+            # on the data source (e.g. Amazon's 1-5 stars) to a 0..1 scale.
+            scale_min, scale_max = cls.RATING_SCALES[data_source_name]
+            width = float(scale_max-scale_min)
+            return (value-scale_min) / width
+        by_data_source = cls.PERCENTILE_SCALES.get(quantity_measured)
+        if by_data_source is None:
+            return None
+        # Other measured quantities need to be normalized using
+        # a percentile scale determined emperically.
+        percentiles = by_data_source.get(data_source_name)
+        if percentiles is None:
+            # We don't know how to normalize measurements from
+            # this data source.
+            return None
+        return bisect.bisect_left(percentiles, value) * 0.01
@@ -2,13 +2,14 @@
 # Resource, ResourceTransformation, Hyperlink, Representation
 
 
+from concurrent.futures import ProcessPoolExecutor
 from io import BytesIO
 import datetime
 import json
 import logging
+import multiprocessing
 from hashlib import md5
 import os
-from PIL import Image
 import re
 import requests
 from sqlalchemy import (
@@ -50,6 +51,7 @@ from .licensing import (
     LicensePool,
     LicensePoolDeliveryMechanism,
 )
+from ..util.async_fetch import AsyncFetcher
 from ..util.http import HTTP
 from ..util.datetime_helpers import utc_now
 
@@ -476,6 +478,95 @@ class Hyperlink(Base, LinkRelations):
         return self._default_filename(self.rel)
 
 
+def scale_image(content, max_width, max_height, pil_format):
+    """Scale an image down so it fits in the given dimensions.
+
+    This only deals in bytes, so it can be run in a worker process.
+
+    :return: A 2-tuple (content, None) with the scaled-down image, or
+        (None, error) if something went wrong. `error` is a 2-tuple
+        (stage, traceback), where `stage` is 'thumbnail' or 'save'.
+    """
+    from PIL import Image
+    image = Image.open(BytesIO(content))
+
+    # For JPEGs, this lets the decoder skip most of the work of
+    # decoding the full-size image.
+    image.draft(None, (max_width, max_height))
+
+    args = [(max_width, max_height), Image.LANCZOS]
+    try:
+        image.thumbnail(*args)
+    except IOError as e:
+        # I'm not sure why, but sometimes just trying
+        # it again works.
+        original_exception = traceback.format_exc()
+        try:
+            image.thumbnail(*args)
+        except IOError as e:
+            return None, ('thumbnail', original_exception)
+
+    output = BytesIO()
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+    try:
+        image.save(output, pil_format)
+    except Exception as e:
+        return None, ('save', traceback.format_exc())
+    return output.getvalue(), None
+
+
+class ScaleJob(object):
+    """An image that Representation.scale has decided to scale down,
+    and everything needed to store the result.
+    """
+
+    def __init__(self, original, thumbnail, source_hash, args):
+        self.original = original
+        self.thumbnail = thumbnail
+        self.source_hash = source_hash
+        self.args = args
+
+    def finish(self, result):
+        """Store the output of `scale_image`.
+
+        :return: A 2-tuple (Representation, is_new), as returned by
+            Representation.scale.
+        """
+        original = self.original
+        thumbnail = self.thumbnail
+        content, error = result
+        if error:
+            stage, exception = error
+            original.scale_exception = exception
+            original.scaled_at = None
+            if stage == 'save':
+                # This most likely indicates a problem during the
+                # fetch phase. Set fetch_exception so we'll retry the
+                # fetch.
+                original.fetch_exception = "Error found while scaling: %s" % (
+                    exception
+                )
+            return original, False
+
+        # Because the representation of this image is being
+        # changed, it will need to be mirrored later on.
+        thumbnail.mirrored_at = None
+        thumbnail.mirror_exception = None
+
+        # Save the thumbnail image to the database under
+        # thumbnail.content.
+        thumbnail.content = content
+        from PIL import Image
+        thumbnail.image_width, thumbnail.image_height = Image.open(
+            BytesIO(content)
+        ).size
+        thumbnail.scale_exception = None
+        thumbnail.scaled_at = utc_now()
+        thumbnail.scaled_from_hash = self.source_hash
+        return thumbnail, True
+
+
 class Representation(Base, MediaTypes):
     """A cached document obtained from (and possibly mirrored to) the Web
     at large.
@@ -527,6 +618,12 @@ class Representation(Base, MediaTypes):
     # to scale it down.
     scale_exception = Column(Unicode, index=True)
 
+    # If this image is a scaled-down version of some other image,
+    # this is an MD5 hash of the image it was scaled from and the
+    # size it was scaled to. If neither has changed, there's no need
+    # to scale it again.
+    scaled_from_hash = Column(Unicode)
+
     ### End records of things we tried to do with this representation.
 
     # An image Representation may be a thumbnail version of another
@@ -572,6 +669,17 @@ class Representation(Base, MediaTypes):
     # data root.
     local_content_path = Column(Unicode)
 
+    # Content that was fetched with a streaming request is neither
+    # stored in the database nor read into memory. It's kept here, as
+    # an open file-like object, until it's mirrored.
+    _content_stream = None
+
+    # The cache headers (etag, last_modified) that came with streamed
+    # content. They're only stored once the content has been mirrored;
+    # otherwise a conditional request could turn up a 304 for a
+    # Representation that has no content to mirror.
+    _streamed_cache_headers = None
+
     # A Representation may be a CachedMARCFile.
     marc_file = relationship(
         "CachedMARCFile", backref="representation",
@@ -734,7 +842,6 @@ class Representation(Base, MediaTypes):
         :return: A 2-tuple (representation, obtained_from_cache)
 
         """
-        representation = None
         do_get = do_get or cls.simple_http_get
 
         exception_handler = exception_handler or cls.record_exception
@@ -757,13 +864,9 @@ class Representation(Base, MediaTypes):
             a['media_type'] = accept
         representation = get_one(_db, Representation, 'interchangeable', **a)
 
-        usable_representation = fresh_representation = False
-        if representation:
-            # Do we already have a usable representation?
-            usable_representation = representation.is_usable
-
-            # Assuming we have a usable representation, is it fresh?
-            fresh_representation = representation.is_fresher_than(max_age)
+        usable_representation, fresh_representation = cls._check_cached(
+            representation, max_age
+        )
 
         if debug is True:
             debug_level = logging.DEBUG
@@ -781,6 +884,130 @@ class Representation(Base, MediaTypes):
         # We must make an HTTP request.
         if debug_level is not None:
             logging.log(debug_level, "Fetching %s", url)
+        headers = cls._request_headers(
+            representation if usable_representation else None,
+            extra_request_headers, accept
+        )
+
+        if pause_before:
+            time.sleep(pause_before)
+        fetched = cls._fetch(
+            url, headers, do_get, response_reviewer, presumed_media_type
+        )
+        return cls._record_fetch(
+            _db, normalized_url, representation, usable_representation,
+            fetched, exception_handler
+        )
+
+    @classmethod
+    def get_many(cls, _db, urls, do_get=None, extra_request_headers=None,
+                 accept=None, max_age=None, pause_before=0,
+                 presumed_media_type=None, response_reviewer=None,
+                 exception_handler=None, url_normalizer=None,
+                 max_concurrency=None, max_per_host=None):
+        """Retrieve representations for a batch of URLs, fetching the
+        ones that aren't cached concurrently.
+
+        This follows the same caching rules as `get` and takes the same
+        arguments, but HTTP requests are made by an `AsyncFetcher`,
+        with no more than `max_per_host` requests in flight against
+        any one host. `pause_before` is applied per host.
+
+        Nothing is committed; the caller is expected to commit once
+        the batch (or a chunk of it) has been processed.
+
+        :param urls: A list of URLs to retrieve.
+        :param do_get: A function that takes arguments (url, headers)
+           and retrieves a representation over the network. It will be
+           called from worker threads.
+
+        :yield: A 3-tuple (url, representation, obtained_from_cache)
+            for each distinct URL, cached representations first and
+            then fetched ones in the order the requests complete. URLs
+            that normalize to the same URL share a single request and
+            a single Representation.
+        """
+        do_get = do_get or cls.simple_http_get
+        exception_handler = exception_handler or cls.record_exception
+        url_normalizer = url_normalizer or (lambda x: x)
+
+        # Only one Representation can be stored per normalized URL, so
+        # that's what the URLs are grouped by.
+        by_normalized_url = {}
+        for url in urls:
+            originals = by_normalized_url.setdefault(url_normalizer(url), [])
+            if url not in originals:
+                originals.append(url)
+
+        # Look up every cached representation with a single query.
+        cached = {}
+        if by_normalized_url:
+            qu = _db.query(Representation).filter(
+                Representation.url.in_(list(by_normalized_url))
+            )
+            if accept:
+                qu = qu.filter(Representation.media_type==accept)
+            for representation in qu:
+                cached.setdefault(representation.url, representation)
+
+        stale = {}
+        jobs = []
+        for normalized_url, originals in by_normalized_url.items():
+            representation = cached.get(normalized_url)
+            usable, fresh = cls._check_cached(representation, max_age)
+            if fresh:
+                for url in originals:
+                    yield url, representation, True
+                continue
+            headers = cls._request_headers(
+                representation if usable else None,
+                extra_request_headers, accept
+            )
+            # The request goes to the first of the original URLs, as
+            # it would if they were passed into `get` one at a time.
+            url = originals[0]
+            stale[url] = (normalized_url, representation, usable, originals)
+            jobs.append((url, headers))
+
+        def fetch(url, headers):
+            return cls._fetch(
+                url, headers, do_get, response_reviewer, presumed_media_type
+            )
+
+        fetcher = AsyncFetcher(
+            max_concurrency=max_concurrency, max_per_host=max_per_host,
+            pause_before=pause_before
+        )
+        for url, fetched in fetcher.run(jobs, fetch):
+            normalized_url, representation, usable, originals = stale[url]
+            representation, from_cache = cls._record_fetch(
+                _db, normalized_url, representation, usable, fetched,
+                exception_handler
+            )
+            for url in originals:
+                yield url, representation, from_cache
+
+    @classmethod
+    def _check_cached(cls, representation, max_age):
+        """Decide whether a cached representation can be used as-is.
+
+        :return: A 2-tuple (usable, fresh).
+        """
+        if not representation:
+            return False, False
+        # Do we already have a usable representation? Assuming we do,
+        # is it fresh?
+        return (
+            representation.is_usable,
+            representation.is_fresher_than(max_age)
+        )
+
+    @classmethod
+    def _request_headers(cls, usable_representation, extra_request_headers,
+                         accept):
+        """Build the headers for a request that will replace or
+        revalidate `usable_representation`.
+        """
         headers = {}
         if extra_request_headers:
             headers.update(extra_request_headers)
@@ -791,14 +1018,24 @@ class Representation(Base, MediaTypes):
             # We have a representation but it's not fresh. We will
             # be making a conditional HTTP request to see if there's
             # a new version.
-            if representation.last_modified:
-                headers['If-Modified-Since'] = representation.last_modified
-            if representation.etag:
-                headers['If-None-Match'] = representation.etag
+            if usable_representation.last_modified:
+                headers['If-Modified-Since'] = usable_representation.last_modified
+            if usable_representation.etag:
+                headers['If-None-Match'] = usable_representation.etag
+        return headers
+
+    @classmethod
+    def _fetch(cls, url, headers, do_get, response_reviewer,
+               presumed_media_type):
+        """Make the HTTP request for a representation.
+
+        This doesn't touch the database, so it's safe to call from
+        a worker thread.
 
+        :return: A 7-tuple (fetched_at, status_code, headers, content,
+            media_type, exception, traceback).
+        """
         fetched_at = utc_now()
-        if pause_before:
-            time.sleep(pause_before)
         media_type = None
         fetch_exception = None
         exception_traceback = None
@@ -808,7 +1045,6 @@ class Representation(Base, MediaTypes):
                 # An optional function passed to raise errors if the
                 # post response isn't worth caching.
                 response_reviewer((status_code, headers, content))
-            exception = None
             media_type = cls._best_media_type(url, headers, presumed_media_type)
             if isinstance(content, str):
                 content = content.encode("utf8")
@@ -824,6 +1060,20 @@ class Representation(Base, MediaTypes):
             headers = None
             content = None
             media_type = None
+        return (
+            fetched_at, status_code, headers, content, media_type,
+            fetch_exception, exception_traceback
+        )
+
+    @classmethod
+    def _record_fetch(cls, _db, normalized_url, representation,
+                      usable_representation, fetched, exception_handler):
+        """Store the outcome of `_fetch` in a Representation.
+
+        :return: A 2-tuple (representation, obtained_from_cache)
+        """
+        (fetched_at, status_code, headers, content, media_type,
+         fetch_exception, exception_traceback) = fetched
 
         # At this point we can create/fetch a Representation object if
         # we don't have one already, or if the URL or media type we
@@ -859,18 +1109,37 @@ class Representation(Base, MediaTypes):
         if status_code_series in (2,3) or status_code in (404, 410):
             # We have a new, good representation. Update the
             # Representation object and return it as fresh.
+            streamed = False
+            if hasattr(content, 'read'):
+                if media_type and media_type.startswith('image/'):
+                    # We need images in hand to make thumbnails.
+                    content = content.read()
+                else:
+                    representation._content_stream = content
+                    content = None
+                    streamed = True
             representation.status_code = status_code
             representation.content = content
             representation.media_type = media_type
 
+            values = {}
             for header, field in (
                     ('etag', 'etag'),
                     ('last-modified', 'last_modified'),
                     ('location', 'location')):
                 if header in headers:
-                    value = headers[header]
+                    values[field] = headers[header]
                 else:
-                    value = None
+                    values[field] = None
+
+            if streamed:
+                representation._streamed_cache_headers = dict(
+                    etag=values.pop('etag'),
+                    last_modified=values.pop('last_modified'),
+                )
+                representation.etag = None
+                representation.last_modified = None
+            for field, value in list(values.items()):
                 setattr(representation, field, value)
 
             representation.headers = cls.headers_to_string(headers)
@@ -1014,6 +1283,12 @@ class Representation(Base, MediaTypes):
         self.mirror_url = mirror_url
         self.mirrored_at = utc_now()
         self.mirror_exception = None
+        if self._streamed_cache_headers:
+            # Now that the content is safely mirrored, a later
+            # conditional request can rely on it.
+            for field, value in list(self._streamed_cache_headers.items()):
+                setattr(self, field, value)
+            self._streamed_cache_headers = None
 
     @classmethod
     def headers_to_string(cls, d):
@@ -1023,10 +1298,19 @@ class Representation(Base, MediaTypes):
 
     @classmethod
     def simple_http_get(cls, url, headers, **kwargs):
-        """The most simple HTTP-based GET."""
+        """The most simple HTTP-based GET.
+
+        If `stream` is True, the body of a successful response isn't
+        read. A file-like object is returned in place of the content.
+        As with `response.content`, any Content-Encoding is decoded as
+        the body is read.
+        """
         if not 'allow_redirects' in kwargs:
             kwargs['allow_redirects'] = True
         response = HTTP.get_with_timeout(url, headers=headers, **kwargs)
+        if kwargs.get('stream') and response.status_code // 100 == 2:
+            response.raw.decode_content = True
+            return response.status_code, response.headers, response.raw
         return response.status_code, response.headers, response.content
 
     @classmethod
@@ -1273,11 +1557,23 @@ class Representation(Base, MediaTypes):
     def external_media_type(self):
         return self.media_type
 
+    @property
+    def content_stream(self):
+        """The open file-like object holding this representation's
+        streamed content, if it hasn't been handed to a mirror yet.
+        """
+        return self._content_stream
+
     def external_content(self):
         """Return a filehandle to the representation's contents, as they
         should be mirrored externally, and the media type to be used
         when mirroring.
         """
+        if self._content_stream is not None:
+            # The content can only be read once.
+            stream = self._content_stream
+            self._content_stream = None
+            return stream
         return self.content_fh()
 
     def content_fh(self):
@@ -1307,6 +1603,7 @@ class Representation(Base, MediaTypes):
         fh = self.content_fh()
         if not fh or self.clean_media_type == self.SVG_MEDIA_TYPE:
             return None
+        from PIL import Image
         return Image.open(fh)
 
     pil_format_for_media_type = {
@@ -1323,6 +1620,91 @@ class Representation(Base, MediaTypes):
         (eventually) be uploaded to.
         :return: A 2-tuple (Representation, is_new)
         """
+        prepared = self._prepare_scale(
+            max_height, max_width, destination_url, destination_media_type,
+            force
+        )
+        if not isinstance(prepared, ScaleJob):
+            return prepared
+        return prepared.finish(scale_image(*prepared.args))
+
+    @classmethod
+    def scale_many(cls, jobs, max_height, max_width, destination_media_type,
+                   force=False, executor=None):
+        """Scale down a batch of images, doing the decoding and
+        resizing in a pool of worker processes.
+
+        :param jobs: A list of 2-tuples (Representation, destination_url).
+        :param executor: A concurrent.futures Executor to do the work.
+            Callers that scale many batches should create one with
+            `scaling_executor` and pass it in for every batch. By
+            default, one is created just for this batch.
+
+        :return: A list of 2-tuples (Representation, is_new), in the
+            same order as `jobs`, as would be returned by `scale`.
+        """
+        results = []
+        to_scale = []
+        for representation, destination_url in jobs:
+            prepared = representation._prepare_scale(
+                max_height, max_width, destination_url,
+                destination_media_type, force
+            )
+            if isinstance(prepared, ScaleJob):
+                to_scale.append((len(results), prepared))
+            results.append(prepared)
+
+        if to_scale:
+            own_executor = executor is None
+            if own_executor:
+                executor = cls.scaling_executor()
+            try:
+                futures = [
+                    (i, job, executor.submit(scale_image, *job.args))
+                    for i, job in to_scale
+                ]
+                for i, job, future in futures:
+                    results[i] = job.finish(future.result())
+            finally:
+                if own_executor:
+                    executor.shutdown()
+        return results
+
+    @classmethod
+    def scaling_executor(cls):
+        """Create a pool of worker processes for `scale_many`.
+
+        The workers are forked right away, so create the pool before
+        starting any threads; a process forked while other threads are
+        running can inherit locks that will never be released. (The
+        'spawn' start method would avoid that, but it re-runs the main
+        script in every worker, and the scripts in bin/ do their work
+        at import time.)
+        """
+        executor = ProcessPoolExecutor(
+            mp_context=multiprocessing.get_context("fork")
+        )
+        # The first job submitted to the pool starts all of its workers.
+        executor.submit(int).result()
+        return executor
+
+    @classmethod
+    def scale_hash(cls, content, max_height, max_width, media_type):
+        """Identify the result of scaling `content` down to the
+        given size and media type, without actually doing it.
+        """
+        m = md5(content)
+        m.update(("%s:%s:%s" % (max_height, max_width, media_type)).encode("utf8"))
+        return m.hexdigest()
+
+    def _prepare_scale(self, max_height, max_width, destination_url,
+                       destination_media_type, force):
+        """Do everything that `scale` needs the database for, up to
+        the point of actually scaling the image.
+
+        :return: Either a 2-tuple (Representation, is_new) if no
+            scaling is necessary, or a ScaleJob.
+        """
         _db = Session.object_session(self)
 
         if not destination_media_type in self.pil_format_for_media_type:
@@ -1370,52 +1752,24 @@ class Representation(Base, MediaTypes):
             # use it.
             return thumbnail, is_new
 
-        # At this point we have a parent Representation (self), we
-        # have a Representation that will contain a thumbnail
-        # (thumbnail), and we know we need to actually thumbnail the
-        # parent into the thumbnail.
-        #
-        # Because the representation of this image is being
-        # changed, it will need to be mirrored later on.
-        now = utc_now()
-        thumbnail.mirrored_at = None
-        thumbnail.mirror_exception = None
-
-        args = [(max_width, max_height), Image.LANCZOS]
-
-        try:
-            image.thumbnail(*args)
-        except IOError as e:
-            # I'm not sure why, but sometimes just trying
-            # it again works.
-            original_exception = traceback.format_exc()
-            try:
-                image.thumbnail(*args)
-            except IOError as e:
-                self.scale_exception = original_exception
-                self.scaled_at = None
-                return self, False
-
-        # Save the thumbnail image to the database under
-        # thumbnail.content.
-        output = BytesIO()
-        if image.mode != 'RGB':
-            image = image.convert('RGB')
-        try:
-            image.save(output, pil_format)
-        except Exception as e:
-            self.scale_exception = traceback.format_exc()
-            self.scaled_at = None
-            # This most likely indicates a problem during the fetch phase,
-            # Set fetch_exception so we'll retry the fetch.
-            self.fetch_exception = "Error found while scaling: %s" % (self.scale_exception)
-            return self, False
-        thumbnail.content = output.getvalue()
-        thumbnail.image_width, thumbnail.image_height = image.size
-        output.close()
-        thumbnail.scale_exception = None
-        thumbnail.scaled_at = now
-        return thumbnail, True
+        fh = self.content_fh()
+        content = fh.read()
+        fh.close()
+        source_hash = self.scale_hash(
+            content, max_height, max_width, destination_media_type
+        )
+        if (not is_new and thumbnail.content
+            and thumbnail.scaled_from_hash == source_hash):
+            # This thumbnail was made from this exact image, at this
+            # exact size, so even a forced rescale would produce the
+            # same thing. It only needs to be treated as new if it
+            # was never mirrored.
+            return thumbnail, not thumbnail.mirrored_at
+
+        return ScaleJob(
+            self, thumbnail, source_hash,
+            (content, max_width, max_height, pil_format)
+        )
 
     @property
     def thumbnail_size_quality_penalty(self):
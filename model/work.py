@@ -1,8 +1,12 @@
 # encoding: utf-8
 # WorkGenre, Work
 
+import copy
 import logging
-from collections import Counter
+from collections import (
+    Counter,
+    defaultdict,
+)
 from sqlalchemy import (
     Boolean,
     Column,
@@ -885,7 +889,8 @@ class Work(Base):
 
     def calculate_presentation(
         self, policy=None, search_index_client=None, exclude_search=False,
-        default_fiction=None, default_audience=None
+        default_fiction=None, default_audience=None,
+        all_identifier_ids=None, quality_changed=False
     ):
         """Make a Work ready to show to patrons.
         Call calculate_presentation_edition() to find the best-quality presentation edition
@@ -896,6 +901,11 @@ class Work(Base):
         * The intended audience for the work.
         * The best available summary for the work.
         * The overall popularity of the work.
+
+        :param all_identifier_ids: The IDs of all Identifiers associated
+            with this Work, if they've already been found.
+        :param quality_changed: Whether this Work's quality was changed
+            by a calculation done before this method was called.
         """
         if not default_audience:
             default_audience = self._get_default_audience()
@@ -926,13 +936,7 @@ class Work(Base):
         # If we find a cover or description that comes direct from a
         # license source, it may short-circuit the process of finding
         # a good cover or description.
-        licensed_data_sources = set()
-        for pool in self.license_pools:
-            # Descriptions from Gutenberg are useless, so we
-            # specifically exclude it from being a privileged data
-            # source.
-            if pool.data_source.name != DataSourceConstants.GUTENBERG:
-                licensed_data_sources.add(pool.data_source)
+        licensed_data_sources = self._licensed_data_sources
 
         if policy.classify or policy.choose_summary or policy.calculate_quality:
             # Find all related IDs that might have associated descriptions,
@@ -940,7 +944,8 @@ class Work(Base):
             _db = Session.object_session(self)
 
             direct_identifier_ids = self._direct_identifier_ids
-            all_identifier_ids = self.all_identifier_ids(policy=policy)
+            if all_identifier_ids is None:
+                all_identifier_ids = self.all_identifier_ids(policy=policy)
         else:
             # Don't bother.
             direct_identifier_ids = all_identifier_ids = []
@@ -962,27 +967,9 @@ class Work(Base):
             )
 
         if policy.calculate_quality:
-            # In the absense of other data, we will make a rough
-            # judgement as to the quality of a book based on the
-            # license source. Commercial data sources have higher
-            # default quality, because it's presumed that a librarian
-            # put some work into deciding which books to buy.
-            default_quality = None
-            for source in licensed_data_sources:
-                q = self.default_quality_by_data_source.get(
-                    source.name, None
-                )
-                if q is None:
-                    continue
-                if default_quality is None or q > default_quality:
-                    default_quality = q
-
-            if not default_quality:
-                # if we still haven't found anything of a quality measurement,
-                # then at least make it an integer zero, not none.
-                default_quality = 0
             self.calculate_quality(
-                all_identifier_ids, default_quality
+                all_identifier_ids,
+                self._default_quality(licensed_data_sources)
             )
 
         if self.summary_text:
@@ -998,6 +985,7 @@ class Work(Base):
             classification_changed or
             summary != self.summary or
             summary_text != new_summary_text or
+            quality_changed or
             float(quality) != float(self.quality)
         )
 
@@ -1032,6 +1020,95 @@ class Work(Base):
         # title.
         self.set_presentation_ready_based_on_content()
 
+    @classmethod
+    def calculate_presentation_many(cls, _db, works, policy=None, **kwargs):
+        """Make a batch of Works ready to show to patrons.
+
+        This does the same thing as calling calculate_presentation() on
+        each Work, but the equivalent Identifiers and the Measurements
+        that determine quality are found for the whole batch at once.
+
+        :param kwargs: Passed through to calculate_presentation().
+        """
+        policy = policy or PresentationCalculationPolicy()
+        if not policy.calculate_quality:
+            for work in works:
+                work.calculate_presentation(policy=policy, **kwargs)
+            return
+
+        direct_identifier_ids = dict(
+            (work, work._direct_identifier_ids) for work in works
+        )
+        equivalents = Identifier.recursively_equivalent_identifier_ids(
+            _db, list(set().union(*list(direct_identifier_ids.values()))),
+            policy=policy
+        )
+        all_identifier_ids = {}
+        for work, ids in list(direct_identifier_ids.items()):
+            all_identifier_ids[work] = set()
+            for identifier_id in ids:
+                all_identifier_ids[work].update(equivalents[identifier_id])
+
+        previous_quality = dict((work, work.quality) for work in works)
+        cls.calculate_quality_many(
+            _db, [
+                (work, all_identifier_ids[work],
+                 work._default_quality(work._licensed_data_sources))
+                for work in works
+            ]
+        )
+
+        # Everything else is calculated one Work at a time.
+        policy = copy.copy(policy)
+        policy.calculate_quality = False
+        for work in works:
+            quality_changed = (
+                previous_quality[work] is None
+                or float(previous_quality[work]) != float(work.quality)
+            )
+            work.calculate_presentation(
+                policy=policy, all_identifier_ids=all_identifier_ids[work],
+                quality_changed=quality_changed, **kwargs
+            )
+
+    @property
+    def _licensed_data_sources(self):
+        """The DataSources that provided this Work's LicensePools."""
+        licensed_data_sources = set()
+        for pool in self.license_pools:
+            # Descriptions from Gutenberg are useless, so we
+            # specifically exclude it from being a privileged data
+            # source.
+            if pool.data_source.name != DataSourceConstants.GUTENBERG:
+                licensed_data_sources.add(pool.data_source)
+        return licensed_data_sources
+
+    def _default_quality(self, licensed_data_sources):
+        """The quality to give this Work if there are no Measurements
+        of it.
+
+        In the absense of other data, we will make a rough judgement
+        as to the quality of a book based on the license source.
+        Commercial data sources have higher default quality, because
+        it's presumed that a librarian put some work into deciding
+        which books to buy.
+        """
+        default_quality = None
+        for source in licensed_data_sources:
+            q = self.default_quality_by_data_source.get(
+                source.name, None
+            )
+            if q is None:
+                continue
+            if default_quality is None or q > default_quality:
+                default_quality = q
+
+        if not default_quality:
+            # if we still haven't found anything of a quality measurement,
+            # then at least make it an integer zero, not none.
+            default_quality = 0
+        return default_quality
+
     def _choose_summary(
         self, direct_identifier_ids, all_identifier_ids,
         licensed_data_sources
@@ -1295,6 +1372,47 @@ class Work(Base):
 
     def calculate_quality(self, identifier_ids, default_quality=0):
         _db = Session.object_session(self)
+        qualities = self._calculate_qualities(
+            _db, [(self, identifier_ids, default_quality)]
+        )
+        self.quality = qualities[self]
+        WorkCoverageRecord.add_for(
+            self, operation=WorkCoverageRecord.QUALITY_OPERATION
+        )
+
+    @classmethod
+    def calculate_quality_many(cls, _db, works):
+        """Calculate the quality of many Works at once, with a single
+        database query for all of their Measurements.
+
+        :param works: A list of 3-tuples (Work, identifier_ids,
+            default_quality), with the same meaning as the arguments to
+            calculate_quality().
+        """
+        qualities = cls._calculate_qualities(_db, works)
+        for work, quality in list(qualities.items()):
+            work.quality = quality
+        WorkCoverageRecord.bulk_add(
+            list(qualities.keys()),
+            operation=WorkCoverageRecord.QUALITY_OPERATION
+        )
+
+    @classmethod
+    def _calculate_qualities(cls, _db, works):
+        """Find the Measurements relevant to a number of Works and
+        turn them into an overall measure of quality for each.
+
+        :param works: A list of 3-tuples (Work, identifier_ids,
+            default_quality).
+        :return: A dictionary mapping each Work to its quality.
+        """
+        default_values = {}
+        works_for_identifier = defaultdict(list)
+        for work, identifier_ids, default_quality in works:
+            default_values[work] = default_quality
+            for identifier_id in identifier_ids:
+                works_for_identifier[identifier_id].append(work)
+
         # Relevant Measurements are direct measurements of popularity
         # and quality, plus any quantity that might be mapppable to the 0..1
         # range -- ratings, and measurements with an associated percentile
@@ -1303,16 +1421,32 @@ class Work(Base):
             Measurement.POPULARITY, Measurement.QUALITY, Measurement.RATING
         ])
         quantities = quantities.union(list(Measurement.PERCENTILE_SCALES.keys()))
-        measurements = _db.query(Measurement).filter(
-            Measurement.identifier_id.in_(identifier_ids)).filter(
-                Measurement.is_most_recent==True).filter(
-                    Measurement.quantity_measured.in_(quantities)).all()
 
-        self.quality = Measurement.overall_quality(
-            measurements, default_value=default_quality)
-        WorkCoverageRecord.add_for(
-            self, operation=WorkCoverageRecord.QUALITY_OPERATION
-        )
+        measurements = []
+        if works_for_identifier:
+            qu = _db.query(
+                Measurement.identifier_id, Measurement.quantity_measured,
+                DataSource.name, Measurement.value, Measurement.weight,
+                Measurement._normalized_value,
+            ).join(
+                DataSource, Measurement.data_source_id==DataSource.id
+            ).filter(
+                Measurement.identifier_id.in_(list(works_for_identifier.keys()))
+            ).filter(
+                Measurement.is_most_recent==True
+            ).filter(
+                Measurement.quantity_measured.in_(quantities)
+            )
+            # A Measurement of one Identifier counts toward every Work
+            # that Identifier is associated with.
+            for identifier_id, quantity, data_source_name, value, weight, normalized_value in qu:
+                for work in works_for_identifier[identifier_id]:
+                    measurements.append(
+                        (work, quantity, data_source_name, value, weight,
+                         normalized_value)
+                    )
+
+        return Measurement.overall_quality_many(measurements, default_values)
 
     def assign_genres(self, identifier_ids, default_fiction=False, default_audience=Classifier.AUDIENCE_ADULT):
         """Set classification information for this work based on the
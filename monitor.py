@@ -1,7 +1,10 @@
 import datetime
 import logging
 import traceback
-from sqlalchemy.orm import defer
+from sqlalchemy.orm import (
+    defer,
+    joinedload,
+)
 from sqlalchemy.sql.expression import (
     and_,
     or_,
@@ -13,8 +16,10 @@ from .metadata_layer import TimestampData
 from .model import (
     CachedFeed,
     CirculationEvent,
+    CirculationEventBuffer,
     Collection,
     CollectionMissing,
+    Contribution,
     CoverageRecord,
     Credential,
     CustomListEntry,
@@ -177,7 +182,19 @@ class Monitor(object):
 
         ignorable = (None, TimestampData.CLEAR_VALUE)
         try:
-            new_timestamp = self.run_once(progress)
+            # A Monitor may change the availability of a lot of
+            # LicensePools; log the resulting CirculationEvents in
+            # batches.
+            with CirculationEventBuffer.buffering(self._db) as buffer:
+                try:
+                    new_timestamp = self.run_once(progress)
+                except Exception:
+                    # Whatever run_once() changed before it failed
+                    # will still be committed, below, so the events
+                    # that go along with those changes must be
+                    # written too.
+                    buffer.flush()
+                    raise
             this_run_finish = utc_now()
             if new_timestamp is None:
                 # Assume this Monitor has no special needs surrounding
@@ -676,9 +693,31 @@ class PermanentWorkIDRefreshMonitor(EditionSweepMonitor):
     """
     SERVICE_NAME = "Permanent work ID refresh"
 
+    # Permanent work IDs are calculated for a whole batch at once,
+    # so there's no reason to keep the batches small.
+    DEFAULT_BATCH_SIZE = 1000
+
+    def item_query(self):
+        # Every Edition's authors are needed to calculate its
+        # permanent work ID; load them all up front.
+        qu = super(PermanentWorkIDRefreshMonitor, self).item_query()
+        return qu.options(
+            joinedload(Edition.contributions).joinedload(
+                Contribution.contributor
+            )
+        )
+
     def process_item(self, edition):
         edition.calculate_permanent_work_id()
 
+    def process_items(self, editions):
+        changed = Edition.calculate_permanent_work_ids(self._db, editions)
+        self.log.log(
+            self.COMPLETION_LOG_LEVEL,
+            "Completed %d editions, %d permanent work IDs changed.",
+            len(editions), changed
+        )
+
 
 class MakePresentationReadyMonitor(NotPresentationReadyWorkSweepMonitor):
     """A monitor that makes works presentation ready.
@@ -40,6 +40,7 @@ from .util.flask_util import (
 )
 from .util.opds_writer import (
     AtomFeed,
+    OPDSEntryFragments,
     OPDSFeed,
     OPDSMessage,
 )
@@ -581,6 +582,11 @@ class AcquisitionFeed(OPDSFeed):
 
     FACET_REL = "http://opds-spec.org/facet"
 
+    # If this is set, _create_entry may return an OPDSEntryFragments
+    # instead of an lxml Element. This is only safe when the entries
+    # are being streamed rather than added to self.feed.
+    splice_cached_entries = False
+
     @classmethod
     def groups(cls, _db, title, url, worklist, annotator,
                pagination=None, facets=None, max_age=None,
@@ -1141,6 +1147,31 @@ class AcquisitionFeed(OPDSFeed):
                 entry = entry.tag
             self.feed.append(entry)
 
+    def stream(self, works, precomposed_entries=[]):
+        """Serialize this feed incrementally, along with entries for
+        some additional works.
+
+        Unlike works passed into the constructor, these works don't
+        get entries until the entries are about to be sent, so a feed
+        with many entries can be sent without holding them all in
+        memory.
+
+        :return: A generator of strings, suitable for use as the body
+            of a streaming Response.
+        """
+        def entries():
+            # Cached entries can be spliced into the output rather
+            # than parsed, since they won't be part of self.feed.
+            self.splice_cached_entries = True
+            try:
+                for work in works:
+                    yield self.create_entry(work)
+            finally:
+                self.splice_cached_entries = False
+            for entry in precomposed_entries:
+                yield entry
+        return self.serialize_incrementally(entries())
+
     def add_entry(self, work):
         """Attempt to create an OPDS <entry>. If successful, append it to
         the feed.
@@ -1241,7 +1272,8 @@ class AcquisitionFeed(OPDSFeed):
             in the appropriate storage field of Work -- either
             simple_opds_entry or verbose_opds_entry. (NOTE: this has some
             overlap with force_create which is difficult to explain.)
-        :return: An lxml Element object
+        :return: An lxml Element object, or (if
+            splice_cached_entries is set) possibly an OPDSEntryFragments.
         """
         xml = None
         field = self.annotator.opds_cache_field
@@ -1249,6 +1281,18 @@ class AcquisitionFeed(OPDSFeed):
         if field and work and not force_create and use_cache:
             xml = getattr(work, field)
 
+        if (xml and self.splice_cached_entries
+            and OPDSEntryFragments.can_splice(xml)):
+            # Rather than parsing the cached entry just so it can be
+            # serialized again, annotate an empty entry and splice
+            # the annotations into the cached entry as it's sent.
+            annotations = AtomFeed.entry()
+            self.annotator.annotate_work_entry(
+                work, active_license_pool, edition, identifier, self,
+                annotations
+            )
+            return OPDSEntryFragments(xml, annotations)
+
         if xml:
             xml = etree.fromstring(xml)
         else:
@@ -4,7 +4,6 @@ import traceback
 from io import BytesIO
 
 import dateutil
-import feedparser
 from flask_babel import lazy_gettext as _
 from lxml import etree
 from urllib.parse import urljoin, urlparse, quote
@@ -274,6 +273,7 @@ class MetadataWranglerOPDSLookup(SimplifiedOPDSLookup, HasSelfTests):
         lines.append("Status code: %d" % response.status_code)
         result.success = response.status_code == 200
         if result.success:
+            import feedparser
             feed = feedparser.parse(response.content)
             total_results = feed['feed'].get('opensearch_totalresults')
             if total_results is not None:
@@ -882,6 +882,7 @@ class OPDSImporter(object):
     @classmethod
     def extract_next_links(self, feed):
         if isinstance(feed, (bytes, str)):
+            import feedparser
             parsed = feedparser.parse(feed)
         else:
             parsed = feed
@@ -896,6 +897,7 @@ class OPDSImporter(object):
 
     def extract_last_update_dates(self, feed):
         if isinstance(feed, (bytes, str)):
+            import feedparser
             parsed_feed = feedparser.parse(feed)
         else:
             parsed_feed = feed
@@ -1128,6 +1130,7 @@ class OPDSImporter(object):
         return new_dict
 
     def extract_data_from_feedparser(self, feed, data_source):
+        import feedparser
         feedparser_parsed = feedparser.parse(feed)
         values = {}
         failures = {}
@@ -3,6 +3,7 @@ import isbnlib
 import os
 import json
 import logging
+import re
 from urllib.parse import urlsplit, quote, urlunsplit
 import sys
 from sqlalchemy.orm.exc import (
@@ -51,10 +52,12 @@ from .metadata_layer import (
 
 from .coverage import (
     BibliographicCoverageProvider,
+    CoverageFailure,
 )
 
 from .testing import DatabaseTest
 
+from .util.async_fetch import AsyncFetcher
 from .util.http import (
     HTTP,
     BadResponseException,
@@ -107,6 +110,7 @@ class OverdriveAPI(object):
     ADVANTAGE_LIBRARY_ENDPOINT = "%(host)s/v1/libraries/%(parent_library_id)s/advantageAccounts/%(library_id)s"
     ALL_PRODUCTS_ENDPOINT = "%(host)s/v1/collections/%(collection_token)s/products?sort=%(sort)s"
     METADATA_ENDPOINT = "%(host)s/v1/collections/%(collection_token)s/products/%(item_id)s/metadata"
+    BULK_METADATA_ENDPOINT = "%(host)s/v1/collections/%(collection_token)s/bulkmetadata?reserveIds=%(item_ids)s"
     EVENTS_ENDPOINT = "%(host)s/v1/collections/%(collection_token)s/products?lastUpdateTime=%(lastupdatetime)s&sort=%(sort)s&limit=%(limit)s"
     AVAILABILITY_ENDPOINT = "%(host)s/v2/collections/%(collection_token)s/products/%(product_id)s/availability"
 
@@ -121,6 +125,16 @@ class OverdriveAPI(object):
     MAX_CREDENTIAL_AGE = 50 * 60
 
     PAGE_SIZE_LIMIT = 300
+
+    # Overdrive won't give metadata for more than this many titles in
+    # a single bulk metadata request.
+    BULK_METADATA_BATCH_SIZE = 25
+
+    # How many requests to have in flight at once when retrieving
+    # many pages of inventory, or many batches of metadata. This is
+    # configurable on the collection level.
+    MAX_CONCURRENT_REQUESTS = "max_concurrent_requests"
+    DEFAULT_MAX_CONCURRENT_REQUESTS = 4
     EVENT_SOURCE = "Overdrive"
 
     EVENT_DELAY = datetime.timedelta(minutes=120)
@@ -176,6 +190,10 @@ class OverdriveAPI(object):
         self.client_key = integration.username
         self.client_secret = integration.password
         self.website_id = integration.setting(self.WEBSITE_ID).value
+        self.max_concurrent_requests = (
+            integration.setting(self.MAX_CONCURRENT_REQUESTS).int_value
+            or self.DEFAULT_MAX_CONCURRENT_REQUESTS
+        )
         if (not self.client_key or not self.client_secret or not self.website_id
             or not self.library_id):
             raise CannotLoadConfiguration(
@@ -343,6 +361,27 @@ class OverdriveAPI(object):
         else:
             return status_code, headers, content
 
+    def get_many(self, urls):
+        """Make a number of HTTP GET requests concurrently, using the
+        active Bearer Token.
+
+        :yield: A 2-tuple (url, (status_code, headers, content)) for
+            each URL, in the order the requests complete.
+        """
+        headers = dict(Authorization="Bearer %s" % self.token)
+        fetcher = AsyncFetcher(
+            max_concurrency=self.max_concurrent_requests,
+            max_per_host=self.max_concurrent_requests
+        )
+        jobs = ((url, headers) for url in urls)
+        for url, response in fetcher.run(jobs, self._do_get):
+            if response[0] == 401:
+                # The Bearer Token expired partway through. Getting
+                # a new one involves the database, so it can't happen
+                # in a worker thread. Try this request again here.
+                response = self.get(url, {})
+            yield url, response
+
     @property
     def token_authorization_header(self):
         s = b"%s:%s" % (self.client_key, self.client_secret)
@@ -420,12 +459,9 @@ class OverdriveAPI(object):
         """Get IDs for every book in the system, with the most recently added
         ones at the front.
         """
-        next_link = self._all_products_link
-        while next_link:
-            page_inventory, next_link = self._get_book_list_page(
-                next_link, 'next'
-            )
-
+        for page_inventory in self._get_book_list_pages(
+            self._all_products_link
+        ):
             for i in page_inventory:
                 yield i
 
@@ -462,6 +498,79 @@ class OverdriveAPI(object):
         availability_queue = (extractor_class.availability_link_list(content))
         return availability_queue, next_link
 
+    def _get_book_list_pages(self, link, extractor_class=None):
+        """Process every page of a list of books, starting with `link`.
+
+        The first page says how far the list goes, so the rest of
+        the pages are retrieved concurrently. If it doesn't, the pages
+        are retrieved one at a time by following 'next' links.
+
+        :yield: A list of availability information for each page, in
+            order. (See `_get_book_list_page`.)
+        """
+        extractor_class = extractor_class or OverdriveRepresentationExtractor
+        status_code, headers, content = self.get(link, {})
+        if isinstance(content, (bytes, str)):
+            content = json.loads(content)
+        yield extractor_class.availability_link_list(content)
+
+        next_link = extractor_class.link(content, 'next')
+        if not next_link:
+            return
+        links = self._remaining_page_links(content, next_link)
+        if links is None:
+            while next_link:
+                page_inventory, next_link = self._get_book_list_page(
+                    next_link, 'next', extractor_class
+                )
+                yield page_inventory
+            return
+
+        # The pages will come in out of order, but we want to yield
+        # them in order.
+        pages = {}
+        position = 0
+        for url, (status_code, headers, content) in self.get_many(links):
+            if isinstance(content, (bytes, str)):
+                content = json.loads(content)
+            pages[url] = content
+            while position < len(links) and links[position] in pages:
+                content = pages.pop(links[position])
+                yield extractor_class.availability_link_list(content)
+                position += 1
+
+    @classmethod
+    def _remaining_page_links(cls, page, next_link):
+        """Find links to every page of a list of books after the
+        current page, so they can all be requested at once.
+
+        :param page: A page of the list, as a Python data structure.
+        :param next_link: The link to the next page.
+        :return: A list of links, or None if `page` doesn't say
+            where the list ends.
+        """
+        last_link = OverdriveRepresentationExtractor.link(page, 'last')
+        offset = re.compile(r"([?&]offset=)(\d+)")
+        limit = re.compile(r"[?&]limit=(\d+)")
+        if not last_link:
+            return None
+        next_offset = offset.search(next_link)
+        last_offset = offset.search(last_link)
+        page_size = limit.search(next_link)
+        if not (next_offset and last_offset and page_size):
+            return None
+        page_size = int(page_size.group(1))
+        if not page_size:
+            return None
+        return [
+            offset.sub(r"\g<1>%d" % i, next_link)
+            for i in range(
+                int(next_offset.group(2)),
+                int(last_offset.group(2)) + 1,
+                page_size
+            )
+        ]
+
     def recently_changed_ids(self, start, cutoff):
         """Get IDs of books whose status has changed between the start time
         and now.
@@ -484,8 +593,7 @@ class OverdriveAPI(object):
             collection_token=self.collection_token
         )
         next_link = self.make_link_safe(next_link)
-        while next_link:
-            page_inventory, next_link = self._get_book_list_page(next_link)
+        for page_inventory in self._get_book_list_pages(next_link):
             # We won't be sending out any events for these books yet,
             # because we don't know if anything changed, but we will
             # be putting them on the list of inventory items to
@@ -506,6 +614,57 @@ class OverdriveAPI(object):
             content = json.loads(content)
         return content
 
+    def bulk_metadata_lookup(self, identifiers):
+        """Look up metadata for a number of Overdrive identifiers,
+        using Overdrive's bulk metadata endpoint.
+
+        Requests for different batches of identifiers are made
+        concurrently.
+
+        :param identifiers: A list of Identifiers.
+        :return: A dictionary mapping Identifiers to the information
+            Overdrive has about them, in the same form as would be
+            returned by `metadata_lookup`. If a request failed, the
+            corresponding Identifiers are left out.
+        """
+        by_id = {}
+        for identifier in identifiers:
+            by_id[identifier.identifier.lower()] = identifier
+
+        ids = list(by_id.keys())
+        ids_for_url = {}
+        for i in range(0, len(ids), self.BULK_METADATA_BATCH_SIZE):
+            batch = ids[i:i+self.BULK_METADATA_BATCH_SIZE]
+            url = self.endpoint(
+                self.BULK_METADATA_ENDPOINT,
+                collection_token=self.collection_token,
+                item_ids=quote(",".join(batch), safe=",")
+            )
+            ids_for_url[url] = batch
+
+        results = {}
+        for url, (status_code, headers, content) in self.get_many(
+            list(ids_for_url.keys())
+        ):
+            if status_code // 100 != 2:
+                self.log.error(
+                    "Got status code %s from bulk metadata lookup %s",
+                    status_code, url
+                )
+                continue
+            if isinstance(content, (bytes, str)):
+                content = json.loads(content)
+            found = {}
+            for info in content.get('metadata', []):
+                found[(info.get('id') or '').lower()] = info
+            for id in ids_for_url[url]:
+                # If Overdrive doesn't mention a title, it doesn't
+                # know about it.
+                results[by_id[id]] = found.get(
+                    id, dict(errorCode='NotFound')
+                )
+        return results
+
     def metadata_lookup_obj(self, identifier):
         url = self.endpoint(
             self.METADATA_ENDPOINT,
@@ -1336,6 +1495,45 @@ class OverdriveBibliographicCoverageProvider(BibliographicCoverageProvider):
 
     def process_item(self, identifier):
         info = self.api.metadata_lookup(identifier)
+        metadata = self.extract_metadata(identifier, info)
+        if isinstance(metadata, CoverageFailure):
+            return metadata
+        return self.set_metadata(identifier, metadata)
+
+    def process_batch(self, batch):
+        """Look up metadata for an entire batch of Identifiers with
+        Overdrive's bulk metadata endpoint, extract it all, and only
+        then apply it to the database.
+        """
+        infos = self.api.bulk_metadata_lookup(batch)
+
+        extracted = []
+        for identifier in batch:
+            info = infos.get(identifier)
+            if info is None:
+                e = "Could not look up metadata for %s" % identifier.identifier
+                metadata = self.failure(identifier, e)
+            else:
+                metadata = self.extract_metadata(identifier, info)
+            extracted.append((identifier, metadata))
+
+        results = []
+        for identifier, metadata in extracted:
+            if isinstance(metadata, CoverageFailure):
+                result = metadata
+            else:
+                result = self.set_metadata(identifier, metadata)
+            if not isinstance(result, CoverageFailure):
+                self.handle_success(identifier)
+            results.append(result)
+        return results
+
+    def extract_metadata(self, identifier, info):
+        """Turn the information Overdrive has about an Identifier
+        into a Metadata object.
+
+        :return: A Metadata object, or a CoverageFailure.
+        """
         error = None
         if info.get('errorCode') == 'NotFound':
             error = "ID not recognized by Overdrive: %s" % identifier.identifier
@@ -1354,7 +1552,7 @@ class OverdriveBibliographicCoverageProvider(BibliographicCoverageProvider):
             return self.failure(identifier, e)
 
         self.metadata_pre_hook(metadata)
-        return self.set_metadata(identifier, metadata)
+        return metadata
 
     def metadata_pre_hook(self, metadata):
         """A hook method that allows subclasses to modify a Metadata
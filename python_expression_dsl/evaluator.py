@@ -1,5 +1,6 @@
 import operator
 from copy import copy, deepcopy
+from functools import lru_cache
 
 from multipledispatch import dispatch
 
@@ -117,6 +118,25 @@ class DSLEvaluationVisitor(Visitor):
 
             return getattr(obj, attribute)
 
+    @staticmethod
+    def _check_function_is_safe(function, safe_classes):
+        """Make sure the function is allowed to be called.
+
+        :param function: Function or method
+        :type function: Callable
+
+        :param safe_classes: List of classes which methods can be called
+        :type safe_classes: List[type]
+        """
+        function_class = getattr(function.__self__, "__class__", None)
+
+        if function_class and function_class not in safe_classes:
+            raise DSLEvaluationError(
+                "Function {0} defined in a not-safe class {1} and cannot be called".format(
+                    function, function_class
+                )
+            )
+
     def _evaluate_unary_expression(self, unary_expression, available_operators):
         """Evaluate the unary expression.
 
@@ -363,24 +383,269 @@ class DSLEvaluationVisitor(Visitor):
 
                 arguments.append(argument)
 
-        function_class = getattr(function.__self__, "__class__", None)
+        self._check_function_is_safe(function, self.safe_classes)
+
+        result = function(*arguments)
+
+        return result
+
+
+class DSLCompilationVisitor(Visitor):
+    """Visitor traversing expression's AST and turning it into a Python closure.
+
+    The closure takes a DSLEvaluationVisitor, which supplies the evaluation context
+    and the list of safe classes, and returns the same result as evaluating the AST
+    with that visitor would. All the work of dispatching on node types and looking up
+    operators is done once, when the closure is built.
+    """
 
-        if function_class and function_class not in self.safe_classes:
+    def compile(self, node):
+        """Compile the AST into a closure.
+
+        :param node: AST node
+        :type node: core.python_expression_dsl.ast.Node
+
+        :return: Function taking a DSLEvaluationVisitor and returning the evaluation result
+        :rtype: Callable[[DSLEvaluationVisitor], Any]
+        """
+        function = node.accept(self)
+
+        def compiled(visitor):
+            return function(visitor, None)
+
+        return compiled
+
+    @staticmethod
+    def _find_operator(expression, available_operators):
+        """Return the function implementing the expression's operator.
+
+        :param expression: Unary or binary expression
+        :type expression: Union[core.dsl.ast.UnaryExpression, core.dsl.ast.BinaryExpression]
+
+        :param available_operators: Dictionary containing available operators
+        :type available_operators: Dict[core.dsl.ast.Operator, operator]
+
+        :return: Operator function
+        :rtype: Callable
+        """
+        if expression.operator not in available_operators:
             raise DSLEvaluationError(
-                "Function {0} defined in a not-safe class {1} and cannot be called".format(
-                    function, function_class
+                "Wrong operator {0}. Was expecting one of {1}".format(
+                    expression.operator, list(available_operators.keys())
                 )
             )
 
-        result = function(*arguments)
+        return available_operators[expression.operator]
 
-        return result
+    def _compile_unary_expression(self, unary_expression, available_operators):
+        """Compile the unary expression.
+
+        :param unary_expression: Unary expression
+        :type unary_expression: core.dsl.ast.UnaryExpression
+
+        :param available_operators: Dictionary containing available operators
+        :type available_operators: Dict[core.dsl.ast.Operator, operator]
+
+        :return: Compiled expression
+        :rtype: Callable
+        """
+        argument = unary_expression.argument.accept(self)
+        expression_operator = self._find_operator(unary_expression, available_operators)
+
+        def unary(visitor, scope):
+            return expression_operator(argument(visitor, scope))
+
+        return unary
+
+    def _compile_binary_expression(self, binary_expression, available_operators):
+        """Compile the binary expression.
+
+        :param binary_expression: Binary expression
+        :type binary_expression: core.dsl.ast.BinaryExpression
+
+        :param available_operators: Dictionary containing available operators
+        :type available_operators: Dict[core.dsl.ast.Operator, operator]
+
+        :return: Compiled expression
+        :rtype: Callable
+        """
+        left_argument = binary_expression.left_argument.accept(self)
+        right_argument = binary_expression.right_argument.accept(self)
+        expression_operator = self._find_operator(binary_expression, available_operators)
+
+        def binary(visitor, scope):
+            return expression_operator(
+                left_argument(visitor, scope), right_argument(visitor, scope)
+            )
+
+        return binary
+
+    @dispatch(Identifier)
+    def visit(self, node):
+        """Compile the Identifier node.
+
+        :param node: Identifier node
+        :type node: Identifier
+        """
+        name = node.value
+        builtin_function = DSLEvaluationVisitor.BUILTIN_FUNCTIONS.get(name)
+        get_attribute_value = DSLEvaluationVisitor._get_attribute_value
+
+        def identifier(visitor, scope):
+            if scope is None:
+                if builtin_function is not None:
+                    return builtin_function
+
+                return get_attribute_value(visitor.context, name)
+
+            return get_attribute_value(scope, name)
+
+        return identifier
+
+    @dispatch(String)
+    def visit(self, node):
+        """Compile the String node.
+
+        :param node: String node
+        :type node: String
+        """
+        value = str(node.value)
+
+        return lambda visitor, scope: value
+
+    @dispatch(Number)
+    def visit(self, node):
+        """Compile the Number node.
+
+        :param node: Number node
+        :type node: Number
+        """
+        try:
+            value = int(node.value)
+        except:
+            value = float(node.value)
+
+        return lambda visitor, scope: value
+
+    @dispatch(DotExpression)
+    def visit(self, node):
+        """Compile the DotExpression node.
+
+        :param node: DotExpression node
+        :type node: DotExpression
+        """
+        expressions = [expression.accept(self) for expression in node.expressions]
+
+        def dot(visitor, scope):
+            value = None
+
+            for expression in expressions:
+                value = expression(visitor, scope)
+                scope = value
+
+            return value
+
+        return dot
+
+    @dispatch(UnaryArithmeticExpression)
+    def visit(self, node):
+        """Compile the UnaryArithmeticExpression node.
+
+        :param node: UnaryArithmeticExpression node
+        :type node: UnaryArithmeticExpression
+        """
+        return self._compile_unary_expression(
+            node, DSLEvaluationVisitor.ARITHMETIC_OPERATORS
+        )
+
+    @dispatch(BinaryArithmeticExpression)
+    def visit(self, node):
+        """Compile the BinaryArithmeticExpression node.
+
+        :param node: BinaryArithmeticExpression node
+        :type node: BinaryArithmeticExpression
+        """
+        return self._compile_binary_expression(
+            node, DSLEvaluationVisitor.ARITHMETIC_OPERATORS
+        )
+
+    @dispatch(UnaryBooleanExpression)
+    def visit(self, node):
+        """Compile the UnaryBooleanExpression node.
+
+        :param node: UnaryBooleanExpression node
+        :type node: UnaryBooleanExpression
+        """
+        return self._compile_unary_expression(
+            node, DSLEvaluationVisitor.BOOLEAN_OPERATORS
+        )
+
+    @dispatch(BinaryBooleanExpression)
+    def visit(self, node):
+        """Compile the BinaryBooleanExpression node.
+
+        :param node: BinaryBooleanExpression node
+        :type node: BinaryBooleanExpression
+        """
+        return self._compile_binary_expression(
+            node, DSLEvaluationVisitor.BOOLEAN_OPERATORS
+        )
+
+    @dispatch(ComparisonExpression)
+    def visit(self, node):
+        """Compile the ComparisonExpression node.
+
+        :param node: ComparisonExpression node
+        :type node: ComparisonExpression
+        """
+        return self._compile_binary_expression(
+            node, DSLEvaluationVisitor.COMPARISON_OPERATORS
+        )
+
+    @dispatch(SliceExpression)
+    def visit(self, node):
+        """Compile the SliceExpression node.
+
+        :param node: SliceExpression node
+        :type node: SliceExpression
+        """
+        array = node.array.accept(self)
+        index = node.slice.accept(self)
+
+        def slice_expression(visitor, scope):
+            return operator.getitem(array(visitor, scope), index(visitor, scope))
+
+        return slice_expression
+
+    @dispatch(FunctionCallExpression)
+    def visit(self, node):
+        """Compile the FunctionCallExpression node.
+
+        :param node: FunctionCallExpression node
+        :type node: FunctionCallExpression
+        """
+        function_expression = node.function.accept(self)
+        arguments = [argument.accept(self) for argument in node.arguments or []]
+        check_function_is_safe = DSLEvaluationVisitor._check_function_is_safe
+
+        def function_call(visitor, scope):
+            function = function_expression(visitor, scope)
+            values = [argument(visitor, scope) for argument in arguments]
+
+            check_function_is_safe(function, visitor.safe_classes)
+
+            return function(*values)
+
+        return function_call
 
 
 class DSLEvaluator(object):
     """Evaluates the expression."""
 
-    def __init__(self, parser, visitor):
+    # Number of distinct expressions whose parsed (or compiled) form is kept around.
+    CACHE_SIZE = 256
+
+    def __init__(self, parser, visitor, compiler=None):
         """Initialize a new instance of DSLEvaluator class.
 
         :param parser: DSL parser transforming the expression string into an AST object
@@ -388,6 +653,11 @@ class DSLEvaluator(object):
 
         :param visitor: Visitor used for evaluating the expression's AST
         :type visitor: DSLEvaluationVisitor
+
+        :param compiler: Optional visitor used for compiling the expression's AST
+            into a Python closure. If it's set, expressions are compiled once and
+            the closures are used instead of walking the AST on every evaluation
+        :type compiler: Optional[DSLCompilationVisitor]
         """
         if not isinstance(parser, DSLParser):
             raise ValueError(
@@ -399,9 +669,32 @@ class DSLEvaluator(object):
                     DSLEvaluationVisitor
                 )
             )
+        if compiler is not None and not isinstance(compiler, DSLCompilationVisitor):
+            raise ValueError(
+                "Argument 'compiler' must be an instance of {0} class".format(
+                    DSLCompilationVisitor
+                )
+            )
 
         self._parser = parser
         self._visitor = visitor
+        self._compiler = compiler
+
+        # The same expressions tend to be evaluated over and over again,
+        # so there's no need to parse (and compile) them every time.
+        self._parse = lru_cache(maxsize=self.CACHE_SIZE)(parser.parse)
+        self._compile = lru_cache(maxsize=self.CACHE_SIZE)(self._compile_expression)
+
+    def _compile_expression(self, expression):
+        """Parse and compile the expression.
+
+        :param expression: String containing the expression
+        :type expression: str
+
+        :return: Compiled expression
+        :rtype: Callable[[DSLEvaluationVisitor], Any]
+        """
+        return self._compiler.compile(self._parse(expression))
 
     @property
     def parser(self):
@@ -427,7 +720,10 @@ class DSLEvaluator(object):
         :return: Evaluation result
         :rtype: Any
         """
-        node = self._parser.parse(expression)
+        if self._compiler is not None:
+            compiled = self._compile(expression)
+        else:
+            node = self._parse(expression)
 
         old_context = self._visitor.context
         old_safe_classes = self._visitor.safe_classes
@@ -436,7 +732,10 @@ class DSLEvaluator(object):
         self._visitor.safe_classes = safe_classes
 
         try:
-            result = self._visitor.visit(node)
+            if self._compiler is not None:
+                result = compiled(self._visitor)
+            else:
+                result = self._visitor.visit(node)
 
             return result
         finally:
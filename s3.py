@@ -5,6 +5,7 @@ from urllib.parse import quote, urlsplit, unquote_plus
 
 import boto3
 import botocore
+from boto3.s3.transfer import TransferConfig
 from botocore.config import Config
 from botocore.exceptions import (
     BotoCoreError,
@@ -273,6 +274,16 @@ class S3Uploader(MirrorUploader):
 
     SITEWIDE = True
 
+    # Content is read and uploaded in parts of this size, a few at a
+    # time, so the memory needed to mirror a file doesn't depend on
+    # how big the file is.
+    STREAMING_UPLOADS = True
+    PART_SIZE = 8 * 1024 * 1024
+    TRANSFER_CONFIG = TransferConfig(
+        multipart_threshold=PART_SIZE, multipart_chunksize=PART_SIZE,
+        max_concurrency=4,
+    )
+
     def __init__(self, integration, client_class=None, host=S3_HOST):
         """Instantiate an S3Uploader from an ExternalIntegration.
 
@@ -617,23 +628,56 @@ class S3Uploader(MirrorUploader):
         :param collection: Collection
         :type collection: Optional[Collection]
         """
+        prepared = self.prepare_upload(representation, mirror_to, collection)
+        exception = None
+        try:
+            self.upload(prepared)
+        except (BotoCoreError, ClientError) as e:
+            exception = e
+        self.finish_upload(representation, prepared, exception)
+
+    def prepare_upload(self, representation, mirror_to, collection=None):
+        """Open a representation's content and work out where in S3 it
+        should go.
+
+        :return: A dictionary to pass into upload() and finish_upload().
+        """
         # Turn the original URL into an s3.amazonaws.com URL.
-        media_type = representation.external_media_type
         bucket, remote_filename = self.split_url(mirror_to)
-        fh = representation.external_content()
+        return dict(
+            fh=representation.external_content(),
+            media_type=representation.external_media_type,
+            bucket=bucket, key=remote_filename, mirror_to=mirror_to,
+        )
+
+    def upload(self, prepared):
+        """Upload a representation's content to S3.
+
+        This doesn't touch the Representation itself, so it's safe to
+        call from a worker thread.
+        """
+        fh = prepared['fh']
         try:
-            result = self.client.upload_fileobj(
+            self.client.upload_fileobj(
                 Fileobj=fh,
-                Bucket=bucket,
-                Key=remote_filename,
-                ExtraArgs=dict(ContentType=media_type)
+                Bucket=prepared['bucket'],
+                Key=prepared['key'],
+                ExtraArgs=dict(ContentType=prepared['media_type']),
+                Config=self.TRANSFER_CONFIG,
             )
+        finally:
+            fh.close()
 
+    def finish_upload(self, representation, prepared, exception=None):
+        """Mark a representation as mirrored, if its upload succeeded."""
+        if exception is None:
             # Since upload_fileobj completed without a problem, we
             # know the file is available at
             # https://s3.amazonaws.com/{bucket}/{remote_filename}. But
             # that may not be the URL we want to store.
-            mirror_url = self.final_mirror_url(bucket, remote_filename)
+            mirror_url = self.final_mirror_url(
+                prepared['bucket'], prepared['key']
+            )
             representation.set_as_mirrored(mirror_url)
 
             source = representation.local_content_path
@@ -644,18 +688,21 @@ class S3Uploader(MirrorUploader):
                              source, representation.mirror_url)
             else:
                 logging.info("MIRRORED %s", representation.mirror_url)
-        except (BotoCoreError, ClientError) as e:
+        else:
+            logging.error(
+                "Error uploading %s: %r", prepared['mirror_to'], exception,
+                exc_info=exception
+            )
             # BotoCoreError happens when there's a problem with
             # the network transport. ClientError happens when
             # there's a problem with the credentials. Either way,
             # the best thing to do is treat this as a transient
             # error and try again later. There's no scenario where
-            # giving up is the right move.
-            logging.error(
-                "Error uploading %s: %r", mirror_to, e, exc_info=e
-            )
-        finally:
-            fh.close()
+            # giving up is the right move. Anything else is a bug,
+            # which is recorded on the representation.
+            if not isinstance(exception, (BotoCoreError, ClientError)):
+                representation.mirror_exception = str(exception)
+                representation.mirrored_at = None
 
     @contextmanager
     def multipart_upload(self, representation, mirror_to, upload_class=MultipartS3Upload):
@@ -757,6 +804,10 @@ class MockS3Uploader(S3Uploader):
             aws_secret_access_key=None,
         )
 
+    def prepare_upload(self, representation, mirror_to, collection=None):
+        # Mirror everything through mirror_one(), so it can be recorded.
+        return None
+
     def mirror_one(self, representation, **kwargs):
         mirror_to = kwargs['mirror_to']
         self.uploaded.append(representation)
@@ -17,7 +17,10 @@ from sqlalchemy import (
     text,
 )
 from sqlalchemy.exc import ProgrammingError
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import (
+    Session,
+    joinedload,
+)
 from sqlalchemy.orm.exc import (
     NoResultFound,
     MultipleResultsFound,
@@ -64,6 +67,7 @@ from .model import (
     Patron,
     PresentationCalculationPolicy,
     Representation,
+    Resource,
     SessionManager,
     Subject,
     Timestamp,
@@ -86,6 +90,7 @@ from .util.personal_names import (
     display_name_to_sort_name
 )
 from .util.worker_pools import (
+    DatabaseJob,
     DatabasePool,
 )
 from .util.datetime_helpers import strptime_utc, to_utc, utc_now
@@ -1888,6 +1893,25 @@ class MirrorResourcesScript(CollectionInputScript):
     # This object contains the actual logic of mirroring.
     MIRROR_UTILITY = MetaToModelUtility()
 
+    # Unmirrored links are handed out to worker threads in batches of
+    # this size. Each worker has its own database session and commits
+    # once per batch.
+    BATCH_SIZE = 100
+    DEFAULT_WORKER_SIZE = 5
+
+    # The ID of the last Hyperlink handled is kept in this Timestamp's
+    # counter, so an interrupted run can pick up where it left off.
+    CURSOR_SERVICE_NAME = "Mirror Resources"
+
+    def __init__(self, _db=None, worker_size=None):
+        super(MirrorResourcesScript, self).__init__(_db)
+        self.worker_size = worker_size or self.DEFAULT_WORKER_SIZE
+
+    @property
+    def session_factory(self):
+        """Create database sessions for the worker threads."""
+        return SessionManager.sessionmaker(session=self._db)
+
     def do_run(self, cmd_args=None):
         parsed = self.parse_command_line(self._db, cmd_args=cmd_args)
         collections = parsed.collections
@@ -1942,18 +1966,111 @@ class MirrorResourcesScript(CollectionInputScript):
             http_get=Representation.cautious_http_get,
         )
 
-    def process_collection(self, collection, policy, unmirrored=None):
+    def process_collection(self, collection, policy, unmirrored=None,
+                           pool=None):
         """Make sure every mirrorable resource in this collection has
         been mirrored.
 
+        Batches of unmirrored links are mirrored concurrently by a
+        pool of worker threads, which share one pool of worker
+        processes for scaling down cover images. Progress is recorded
+        after every round of batches, and the next run resumes from
+        there until the whole collection has been covered.
+
         :param unmirrored: A replacement for Hyperlink.unmirrored,
             for use in tests.
-
+        :param pool: A DatabasePool (or other) object for use in tests.
         """
         unmirrored = unmirrored or Hyperlink.unmirrored
-        for link in unmirrored(collection):
-            self.process_item(collection, link, policy)
-            self._db.commit()
+        qu = unmirrored(collection).order_by(None).order_by(
+            Hyperlink.id
+        ).with_entities(Hyperlink.id)
+
+        timestamp = Timestamp.lookup(
+            self._db, self.CURSOR_SERVICE_NAME, Timestamp.SCRIPT_TYPE,
+            collection
+        )
+        cursor = (timestamp and timestamp.counter) or 0
+
+        # Without a commit, the workers' queries can end up waiting
+        # on this session's transaction.
+        self._db.commit()
+
+        with Representation.scaling_executor() as executor, (
+            pool or DatabasePool(self.worker_size, self.session_factory)
+        ) as job_queue:
+            while True:
+                queued = 0
+                for i in range(self.worker_size):
+                    link_ids = [
+                        link_id for [link_id] in
+                        qu.filter(Hyperlink.id > cursor).limit(self.BATCH_SIZE)
+                    ]
+                    if not link_ids:
+                        break
+                    job_queue.put(
+                        MirrorResourcesJob(
+                            self, collection, link_ids, policy,
+                            executor=executor
+                        )
+                    )
+                    queued += len(link_ids)
+                    cursor = link_ids[-1]
+                if not queued:
+                    break
+
+                # Let this round of batches finish before moving the
+                # cursor past them.
+                job_queue.join()
+                self._set_cursor(collection, cursor)
+
+        # The collection has been covered. Start from the beginning
+        # next time, to retry anything that couldn't be mirrored.
+        self._set_cursor(collection, 0)
+
+    def _set_cursor(self, collection, cursor):
+        Timestamp.stamp(
+            self._db, self.CURSOR_SERVICE_NAME, Timestamp.SCRIPT_TYPE,
+            collection=collection, counter=cursor
+        )
+        self._db.commit()
+
+    def process_batch(self, _db, collection, links, policy, executor=None):
+        """Mirror a batch of links, looking up all of their LicensePools
+        at once.
+
+        :param _db: The database session that `collection` and `links`
+            belong to. When called from a MirrorResourcesJob, this is
+            the worker thread's own session.
+        :param executor: Passed into `make_thumbnails`.
+        """
+        links = list(links)
+        identifier_ids = set(link.identifier_id for link in links)
+        license_pools = dict()
+        if identifier_ids:
+            qu = _db.query(LicensePool).filter(
+                LicensePool.collection_id==collection.id
+            ).filter(
+                LicensePool.identifier_id.in_(identifier_ids)
+            ).options(
+                joinedload(LicensePool.identifier),
+                joinedload(LicensePool.delivery_mechanisms).joinedload(
+                    LicensePoolDeliveryMechanism.rights_status
+                ),
+            )
+            for license_pool in qu:
+                license_pools[license_pool.identifier_id] = license_pool
+
+        # Full-size images are thumbnailed all at once at the end of
+        # the batch, rather than one at a time as they're mirrored.
+        thumbnails = []
+        for link in links:
+            self.mirror_item(
+                collection, link, policy,
+                license_pools.get(link.identifier_id),
+                thumbnails=thumbnails
+            )
+        self.MIRROR_UTILITY.make_thumbnails(thumbnails, executor=executor)
 
     @classmethod
     def derive_rights_status(cls, license_pool, resource):
@@ -1997,6 +2114,14 @@ class MirrorResourcesScript(CollectionInputScript):
             identifier.type, identifier.identifier,
             collection=collection, autocreate=False
         )
+        return self.mirror_item(collection, link_obj, policy, license_pool)
+
+    def mirror_item(self, collection, link_obj, policy, license_pool,
+                    thumbnails=None):
+        """Mirror a link once its LicensePool has been found.
+
+        :param thumbnails: Passed into `MetaToModelUtility.mirror_link`.
+        """
         if not license_pool:
             # This shouldn't happen.
             self.log.warn(
@@ -2028,7 +2153,33 @@ class MirrorResourcesScript(CollectionInputScript):
         # Mirror the link (or not).
         self.MIRROR_UTILITY.mirror_link(
             model_object=license_pool, data_source=collection.data_source,
-            link=linkdata, link_obj=link_obj, policy=policy
+            link=linkdata, link_obj=link_obj, policy=policy,
+            thumbnails=thumbnails
+        )
+
+
+class MirrorResourcesJob(DatabaseJob):
+    """Mirror one batch of links for a MirrorResourcesScript, using a
+    worker thread's database session.
+    """
+
+    def __init__(self, script, collection, link_ids, policy, executor=None):
+        self.script = script
+        self.collection_id = collection.id
+        self.link_ids = link_ids
+        self.policy = policy
+        self.executor = executor
+
+    def do_run(self, _db):
+        collection = _db.query(Collection).get(self.collection_id)
+        links = _db.query(Hyperlink).filter(
+            Hyperlink.id.in_(self.link_ids)
+        ).options(
+            joinedload(Hyperlink.identifier),
+            joinedload(Hyperlink.resource).joinedload(Resource.representation),
+        ).order_by(Hyperlink.id)
+        self.script.process_batch(
+            _db, collection, links, self.policy, executor=self.executor
         )
 
 
@@ -8,7 +8,10 @@ from ...model import (
     create,
     get_one_or_create
 )
-from ...model.circulationevent import CirculationEvent
+from ...model.circulationevent import (
+    CirculationEvent,
+    CirculationEventBuffer,
+)
 from ...model.datasource import DataSource
 from ...model.identifier import Identifier
 from ...model.licensing import LicensePool
@@ -183,6 +186,53 @@ class TestCirculationEvent:
         assert end == event.end
         assert location == event.location
 
+    def test_log_many(self, db_session, create_edition, create_library, create_licensepool):
+        """
+        GIVEN: Data to populate several CirculationEvents
+        WHEN:  Logging the CirculationEvents with a single INSERT
+        THEN:  New CirculationEvents are created and duplicates are ignored
+        """
+        edition = create_edition(db_session)
+        pool = create_licensepool(db_session, edition=edition)
+        library = create_library(db_session)
+        start = datetime_utc(2019, 1, 1)
+        event_name = CirculationEvent.DISTRIBUTOR_CHECKOUT
+
+        existing, ignore = CirculationEvent.log(
+            db_session, pool, event_name, 10, 8, start=start, library=library
+        )
+
+        def data(**kwargs):
+            kwargs.setdefault("license_pool_id", pool.id)
+            kwargs.setdefault("library_id", library.id)
+            kwargs.setdefault("type", event_name)
+            kwargs.setdefault("start", start)
+            for key in ("old_value", "new_value", "delta", "end", "location"):
+                kwargs.setdefault(key, None)
+            return kwargs
+
+        events = [
+            # This event was already logged.
+            data(),
+            # This one is new.
+            data(library_id=None),
+            # So is this one.
+            data(start=datetime_utc(2019, 1, 2), old_value=1, new_value=2,
+                 delta=1),
+            # This one is a duplicate of the previous one.
+            data(start=datetime_utc(2019, 1, 2)),
+        ]
+        assert 2 == CirculationEvent.log_many(db_session, events)
+        assert 0 == CirculationEvent.log_many(db_session, [])
+
+        events = db_session.query(CirculationEvent).order_by(
+            CirculationEvent.id).all()
+        assert 3 == len(events)
+        assert existing == events[0]
+        assert None == events[1].library
+        assert -2 == existing.delta
+        assert 1 == events[2].delta
+
     def test_uniqueness_constraints_no_library(self, db_session, create_edition, create_licensepool):
         """
         GIVEN: An Edition and LicensePool
@@ -241,3 +291,111 @@ class TestCirculationEvent:
             IntegrityError, create, db_session, CirculationEvent, start=now,
             **kwargs
         )
+
+
+class TestCirculationEventBuffer:
+
+    def test_buffering(self, db_session, create_edition, create_library, create_licensepool):
+        """
+        GIVEN: A CirculationEventBuffer installed on a database session
+        WHEN:  Buffering CirculationEvents
+        THEN:  The events are written to the database in batches
+        """
+        edition = create_edition(db_session)
+        pool = create_licensepool(db_session, edition=edition)
+        library = create_library(db_session)
+        event_name = CirculationEvent.DISTRIBUTOR_CHECKOUT
+        start = datetime_utc(2019, 1, 1)
+        qu = db_session.query(CirculationEvent)
+
+        assert None == CirculationEventBuffer.for_session(db_session)
+        with CirculationEventBuffer.buffering(
+            db_session, batch_size=3
+        ) as buffer:
+            assert buffer == CirculationEventBuffer.for_session(db_session)
+
+            assert True == buffer.add(
+                pool, event_name, 10, 8, start=start, library=library,
+                location="Westgate Branch"
+            )
+            # An event with the same license pool, event name, start
+            # date and library is ignored.
+            assert False == buffer.add(
+                pool, event_name, 500, 200, start=start, library=library
+            )
+            assert True == buffer.add(pool, event_name, 8, 7, start=start)
+            assert 2 == len(buffer)
+            assert 0 == qu.count()
+
+            # Once the buffer is full, it's flushed.
+            assert True == buffer.add(
+                pool, event_name, 7, 6, start=datetime_utc(2019, 1, 2)
+            )
+            assert 0 == len(buffer)
+            assert 3 == qu.count()
+
+            event = qu.filter(CirculationEvent.library==library).one()
+            assert -2 == event.delta
+            assert start == event.end
+            assert "Westgate Branch" == event.location
+
+            buffer.add(pool, event_name, 6, 5)
+            assert 1 == len(buffer)
+
+        # When the block ends, the buffer is flushed and uninstalled.
+        assert 4 == qu.count()
+        assert None == CirculationEventBuffer.for_session(db_session)
+
+    def test_buffer_discarded_on_exception(self, db_session, create_edition, create_licensepool):
+        """
+        GIVEN: A CirculationEventBuffer installed on a database session
+        WHEN:  The `with` block raises an exception
+        THEN:  The exception propagates, and the buffer is uninstalled
+               without being flushed
+        """
+        edition = create_edition(db_session)
+        pool = create_licensepool(db_session, edition=edition)
+        flushed = []
+
+        with pytest.raises(ValueError) as excinfo:
+            with CirculationEventBuffer.buffering(db_session) as buffer:
+                buffer.flush = lambda: flushed.append(True)
+                buffer.add(pool, CirculationEvent.DISTRIBUTOR_CHECKOUT, 1, 0)
+                raise ValueError("the real problem")
+        assert "the real problem" in str(excinfo.value)
+        assert [] == flushed
+        assert 0 == db_session.query(CirculationEvent).count()
+        assert None == CirculationEventBuffer.for_session(db_session)
+
+    def test_old_buffer_is_flushed(self, db_session, create_edition, create_licensepool):
+        """
+        GIVEN: A CirculationEventBuffer with a max_age of zero
+        WHEN:  Buffering a CirculationEvent
+        THEN:  The event is written to the database immediately
+        """
+        edition = create_edition(db_session)
+        pool = create_licensepool(db_session, edition=edition)
+        buffer = CirculationEventBuffer(db_session, max_age=0)
+        buffer.add(pool, CirculationEvent.DISTRIBUTOR_CHECKOUT, 1, 0)
+        assert 0 == len(buffer)
+        assert 1 == db_session.query(CirculationEvent).count()
+
+    def test_flush_assigns_ids(self, db_session, create_collection, create_edition):
+        """
+        GIVEN: A buffered event for a LicensePool that hasn't been flushed
+        WHEN:  Flushing the CirculationEventBuffer
+        THEN:  The session is flushed so the LicensePool gets an ID
+        """
+        edition = create_edition(db_session)
+        pool = LicensePool(
+            data_source=edition.data_source,
+            identifier=edition.primary_identifier,
+            collection=create_collection(db_session)
+        )
+        db_session.add(pool)
+        buffer = CirculationEventBuffer(db_session)
+        buffer.add(pool, CirculationEvent.DISTRIBUTOR_TITLE_ADD, 0, 1)
+        assert None == pool.id
+        assert 1 == buffer.flush()
+        [event] = db_session.query(CirculationEvent).all()
+        assert pool == event.license_pool
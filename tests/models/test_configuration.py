@@ -1,4 +1,5 @@
 # encoding: utf-8
+import datetime
 from enum import Enum
 
 import pytest
@@ -174,6 +175,90 @@ class TestConfigurationSetting:
         library_patron_prefix_conf.value = "Library-specific value"
         assert library_patron_prefix_conf.value == "Library-specific value"
 
+    def test_snapshot(self, db_session, create_library):
+        """
+        GIVEN: ConfigurationSettings for the site, an ExternalIntegration,
+               a Library, and the ExternalIntegration and Library together
+        WHEN:  Getting a snapshot of the settings
+        THEN:  The snapshot contains the same values as ConfigurationSetting.value,
+               and reflects changes to those values
+        """
+        m = ConfigurationSetting.snapshot
+        library = create_library(db_session)
+        sip, _ = create(
+            db_session, ExternalIntegration,
+            goal=ExternalIntegration.PATRON_AUTH_GOAL, protocol="SIP2"
+        )
+        for library_, integration, key, value in (
+            (None, None, "sitewide_key", "Sitewide value"),
+            (None, None, "overridden_key", "Sitewide value"),
+            (library, None, "overridden_key", "Per-library value"),
+            (library, None, "empty_key", ""),
+            (None, sip, "integration_key", "Integration value"),
+            (library, sip, "library_integration_key", "Library value"),
+        ):
+            ConfigurationSetting.for_library_and_externalintegration(
+                db_session, key, library_, integration
+            ).value = value
+
+        sitewide = m(db_session)
+        assert "Sitewide value" == sitewide["overridden_key"]
+        assert "Sitewide value" == sitewide["sitewide_key"]
+
+        # A library inherits sitewide values.
+        library_snapshot = m(db_session, library=library)
+        assert "Per-library value" == library_snapshot["overridden_key"]
+        assert "Sitewide value" == library_snapshot["sitewide_key"]
+        assert None == library_snapshot["empty_key"]
+
+        # An integration doesn't.
+        integration_snapshot = m(db_session, external_integration=sip)
+        assert "Integration value" == integration_snapshot["integration_key"]
+        assert "sitewide_key" not in integration_snapshot
+
+        # A library's settings for an integration inherit from the
+        # integration.
+        both = m(db_session, library=library, external_integration=sip)
+        assert "Library value" == both["library_integration_key"]
+        assert "Integration value" == both["integration_key"]
+
+        # Snapshots are cached and can't be modified.
+        assert library_snapshot is m(db_session, library=library)
+        with pytest.raises(TypeError):
+            library_snapshot["sitewide_key"] = "new value"
+
+        # Every value in the snapshot is the same as the value of
+        # the corresponding ConfigurationSetting.
+        for snapshot, library_, integration in (
+            (sitewide, None, None),
+            (library_snapshot, library, None),
+            (integration_snapshot, None, sip),
+            (both, library, sip),
+        ):
+            for key, value in list(snapshot.items()):
+                setting = ConfigurationSetting.for_library_and_externalintegration(
+                    db_session, key, library_, integration
+                )
+                assert setting.value == value
+
+        # But changing a setting, even without flushing the change to
+        # the database, creates a new snapshot.
+        ConfigurationSetting.sitewide(db_session, "sitewide_key").value = "New value"
+        new_snapshot = m(db_session, library=library)
+        assert new_snapshot is not library_snapshot
+        assert "New value" == new_snapshot["sitewide_key"]
+
+        # So does a change to the site configuration.
+        Configuration.site_configuration_last_update(
+            db_session, known_value=datetime.datetime.now(datetime.timezone.utc)
+        )
+        assert new_snapshot is not m(db_session, library=library)
+
+        # Library and ExternalIntegration have convenience properties
+        # for getting their snapshots.
+        assert m(db_session, library=library) == library.settings_snapshot
+        assert integration_snapshot == sip.settings_snapshot
+
     def test_duplicate(self, db_session, create_library):
         """
         GIVEN: Two ConfigurationSettings for the same key,
@@ -570,6 +570,49 @@ class TestEdition:
         edition.calculate_permanent_work_id()
         assert edition.permanent_work_id is None
 
+    def test_calculate_permanent_work_ids(self, db_session, create_edition):
+        """
+        GIVEN: Several Editions, some of which already have up-to-date
+               permanent work IDs
+        WHEN:  Calculating their permanent work IDs as a batch
+        THEN:  Each Edition gets the same permanent work ID it would get
+               on its own, and only the ones that changed are counted
+        """
+        up_to_date = create_edition(db_session, title="Up To Date")
+        up_to_date.calculate_permanent_work_id()
+        expect_up_to_date = up_to_date.permanent_work_id
+
+        same_book_1 = create_edition(
+            db_session, title="Same Book", authors="Same Author"
+        )
+        same_book_2 = create_edition(
+            db_session, title="Same Book", authors="Same Author"
+        )
+        no_medium = create_edition(db_session)
+        no_medium.medium = None
+        no_medium.permanent_work_id = "out of date"
+        editions = [up_to_date, same_book_1, same_book_2, no_medium]
+
+        changed = Edition.calculate_permanent_work_ids(db_session, editions)
+        assert 3 == changed
+        assert expect_up_to_date == up_to_date.permanent_work_id
+        assert same_book_1.permanent_work_id is not None
+        assert same_book_1.permanent_work_id == same_book_2.permanent_work_id
+        assert no_medium.permanent_work_id is None
+
+        # The values were written to the database.
+        db_session.expire_all()
+        assert same_book_1.permanent_work_id == same_book_2.permanent_work_id
+        assert no_medium.permanent_work_id is None
+
+        # The batch calculation matches the one-at-a-time calculation.
+        batch_id = same_book_1.permanent_work_id
+        same_book_1.calculate_permanent_work_id()
+        assert batch_id == same_book_1.permanent_work_id
+
+        # Running the calculation again changes nothing.
+        assert 0 == Edition.calculate_permanent_work_ids(db_session, editions)
+
     def test_choose_cover_can_choose_full_image_and_thumbnail_separately(self, db_session, create_edition):
         """
         GIVEN: An Edition
@@ -219,6 +219,44 @@ class TestIdentifier:
         assert new_urn in failure
         assert isbn_urn in failure
 
+    def test_parse_urns_caches_identifier_ids(self, db_session, create_identifier):
+        """
+        GIVEN: URNs for Identifiers that were recently looked up
+        WHEN:  Parsing the URNs again
+        THEN:  The Identifiers are found through a cache of their IDs
+        """
+        identifier = create_identifier(db_session)
+        details = (identifier.type, identifier.identifier)
+        Identifier._id_cache.clear()
+
+        identifiers_by_urn, failures = Identifier.parse_urns(
+            db_session, [identifier.urn], autocreate=False
+        )
+        assert {identifier.urn: identifier} == identifiers_by_urn
+        assert identifier.id == Identifier._id_cache[details]
+
+        # A newly created Identifier is cached as soon as it's created.
+        new_urn = Identifier.URN_SCHEME_PREFIX + "Overdrive%20ID/brandnew"
+        identifiers_by_urn, failures = Identifier.parse_urns(
+            db_session, [new_urn]
+        )
+        new_identifier = identifiers_by_urn[new_urn]
+        assert (
+            new_identifier.id ==
+            Identifier._id_cache[(Identifier.OVERDRIVE_ID, "brandnew")]
+        )
+
+        # If the cache is wrong (e.g. because the Identifier was
+        # created in a transaction that was rolled back), the
+        # Identifier is looked up the normal way.
+        Identifier._id_cache[details] = -1
+        identifiers_by_urn, failures = Identifier.parse_urns(
+            db_session, [identifier.urn], autocreate=False
+        )
+        assert {identifier.urn: identifier} == identifiers_by_urn
+        assert [] == failures
+        assert identifier.id == Identifier._id_cache[details]
+
     def test_parse_urn(self, db_session, create_identifier):
         """
         GIVEN: An URN
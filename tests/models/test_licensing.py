@@ -11,6 +11,7 @@ from ...model.collection import CollectionMissing
 from ...model.complaint import Complaint
 from ...model.constants import MediaTypes
 from ...model.contributor import Contributor
+from ...model.coverage import WorkCoverageRecord
 from ...model.datasource import DataSource
 from ...model.edition import Edition
 from ...model.identifier import Identifier
@@ -18,11 +19,13 @@ from ...model.licensing import (
     DeliveryMechanism,
     Hold,
     LicensePool,
+    LicensePoolDeliverability,
     LicensePoolDeliveryMechanism,
     Loan,
     RightsStatus,
 )
 from ...model.resource import Hyperlink, Representation
+from ...model.work import Work
 from ...util.datetime_helpers import utc_now
 
 
@@ -667,6 +670,108 @@ class TestLicensePool:
         assert pool.licenses_reserved == 30
         assert pool.patrons_in_hold_queue == 40
 
+    def test_update_availability_bulk(self, db_session, create_work, default_library):
+        """
+        GIVEN: Several LicensePools associated with Works
+        WHEN:  Updating the LicensePools with new availability information all at once
+        THEN:  Each LicensePool is updated, and only Works whose availability changed are touched
+        """
+        [collection] = default_library.collections
+        works = [
+            create_work(db_session, with_license_pool=True,
+                        collection=collection)
+            for i in range(3)
+        ]
+        pools = []
+        for work in works:
+            [pool] = work.license_pools
+            pool.licenses_owned = 10
+            pool.licenses_available = 5
+            pool.licenses_reserved = 0
+            pool.patrons_in_hold_queue = 0
+            pool.last_checked = None
+            work.last_update_time = None
+            pools.append(pool)
+        changed_pool, unchanged_pool, no_date_pool = pools
+        provider = MockAnalyticsProvider()
+
+        as_of = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+        m = LicensePool.update_availability_bulk
+        result = m(db_session, [
+            (changed_pool.id, 11, 4, None, 1, as_of),
+            (unchanged_pool.id, 10, 5, 0, 0, as_of),
+            (no_date_pool.id, 10, 6, 0, 0, CirculationEvent.NO_DATE),
+            # LicensePools that don't exist are ignored.
+            (-1, 1, 1, 1, 1, as_of),
+        ], analytics=provider)
+        assert [changed_pool.id, no_date_pool.id] == result
+
+        # The LicensePools have been updated.
+        assert 11 == changed_pool.licenses_owned
+        assert 4 == changed_pool.licenses_available
+        assert 0 == changed_pool.licenses_reserved
+        assert 1 == changed_pool.patrons_in_hold_queue
+        assert as_of == changed_pool.last_checked
+        assert 6 == no_date_pool.licenses_available
+
+        # A LicensePool is considered checked even if its
+        # availability didn't change, unless the caller said
+        # otherwise.
+        assert as_of == unchanged_pool.last_checked
+        assert None == no_date_pool.last_checked
+
+        # Work.last_update_time is only changed if availability
+        # changed and we know when it happened.
+        changed_work, unchanged_work, no_date_work = works
+        assert as_of == changed_work.last_update_time
+        assert None == unchanged_work.last_update_time
+        assert None == no_date_work.last_update_time
+
+        # The Work whose availability changed needs to be reindexed.
+        record = db_session.query(WorkCoverageRecord).filter(
+            WorkCoverageRecord.work_id==changed_work.id
+        ).filter(
+            WorkCoverageRecord.operation==WorkCoverageRecord.UPDATE_SEARCH_INDEX_OPERATION
+        ).one()
+        assert WorkCoverageRecord.REGISTERED == record.status
+
+        # One event was collected for each availability change.
+        # (MockAnalyticsProvider keeps track of the last one.)
+        assert 4 == provider.count
+        assert CirculationEvent.DISTRIBUTOR_CHECKIN == provider.event_type
+
+        # Calling update_availability_bulk with no data does nothing.
+        assert [] == m(db_session, [])
+
+    def test_update_availability_bulk_matches_update_availability(self, db_session, create_work):
+        """
+        GIVEN: Two identical LicensePools
+        WHEN:  Updating one with update_availability and the other with update_availability_bulk
+        THEN:  The LicensePools end up with the same availability information
+        """
+        pools = []
+        for i in range(2):
+            work = create_work(db_session, with_license_pool=True)
+            [pool] = work.license_pools
+            pool.update_availability(10, 5, 2, 3)
+            pools.append(pool)
+        one_at_a_time, bulk = pools
+
+        for data in [
+            (5, None, None, None),
+            (5, 0, 0, 8),
+            (None, None, None, None),
+            (20, 12, 1, 0),
+        ]:
+            one_at_a_time.update_availability(*data)
+            LicensePool.update_availability_bulk(
+                db_session, [(bulk.id,) + data + (None,)]
+            )
+            for field in ('licenses_owned', 'licenses_available',
+                          'licenses_reserved', 'patrons_in_hold_queue'):
+                assert (getattr(one_at_a_time, field) ==
+                        getattr(bulk, field))
+
     def test_open_access_links(self, db_session, create_edition):
         """
         GIVEN: A LicensePool with an open access hyperlink Identifier
@@ -1325,6 +1430,143 @@ class TestLicensePool:
         assert patron.last_loan_activity_sync == now
 
 
+class TestLicensePoolDeliverability:
+
+    def _deliverability(self, db_session, pool):
+        db_session.flush()
+        deliverability = db_session.query(LicensePoolDeliverability).filter(
+            LicensePoolDeliverability.licensepool_id==pool.id
+        ).one()
+        db_session.expire(deliverability)
+        return (deliverability.deliverable, deliverability.licensed,
+                deliverability.available, deliverability.suppressed)
+
+    def test_kept_up_to_date(self, db_session, create_edition, create_work):
+        """
+        GIVEN: A LicensePool
+        WHEN:  The LicensePool or its delivery mechanisms change
+        THEN:  Its LicensePoolDeliverability changes to match
+        """
+        work = create_work(db_session, with_license_pool=True)
+        [pool] = work.license_pools
+        row = db_session.query(LicensePoolDeliverability).filter(
+            LicensePoolDeliverability.licensepool_id==pool.id
+        ).one()
+        assert pool.collection_id == row.collection_id
+        assert work.id == row.work_id
+        assert (True, True, True, False) == self._deliverability(db_session, pool)
+
+        pool.licenses_available = 0
+        assert (True, True, False, False) == self._deliverability(db_session, pool)
+
+        pool.licenses_owned = 0
+        assert (True, False, False, False) == self._deliverability(db_session, pool)
+
+        pool.unlimited_access = True
+        assert (True, True, True, False) == self._deliverability(db_session, pool)
+
+        pool.suppressed = True
+        assert (True, True, True, True) == self._deliverability(db_session, pool)
+
+        # Taking away the last delivery mechanism makes the pool
+        # undeliverable.
+        for lpdm in pool.delivery_mechanisms:
+            db_session.delete(lpdm)
+        assert (False, True, True, True) == self._deliverability(db_session, pool)
+
+        # Adding one makes it deliverable again.
+        pool.set_delivery_mechanism(
+            MediaTypes.EPUB_MEDIA_TYPE, DeliveryMechanism.NO_DRM,
+            RightsStatus.IN_COPYRIGHT, None
+        )
+        assert (True, True, True, True) == self._deliverability(db_session, pool)
+
+        # When a pool is deleted, so is its deliverability.
+        pool_id = pool.id
+        db_session.delete(pool)
+        db_session.flush()
+        assert 0 == db_session.query(LicensePoolDeliverability).filter(
+            LicensePoolDeliverability.licensepool_id==pool_id
+        ).count()
+
+    def test_refresh(self, db_session, create_work):
+        """
+        GIVEN: LicensePools changed without going through the ORM
+        WHEN:  Refreshing their LicensePoolDeliverability
+        THEN:  The LicensePoolDeliverability reflects the changes
+        """
+        pools = []
+        for i in range(2):
+            [pool] = create_work(db_session, with_license_pool=True).license_pools
+            pools.append(pool)
+        pool1, pool2 = pools
+        db_session.flush()
+        db_session.execute(
+            LicensePool.__table__.update().values(licenses_available=0)
+        )
+
+        # The change isn't noticed yet.
+        assert (True, True, True, False) == self._deliverability(db_session, pool1)
+
+        # Refresh just one LicensePool.
+        LicensePoolDeliverability.refresh(db_session, licensepool_ids=[pool1.id])
+        assert (True, True, False, False) == self._deliverability(db_session, pool1)
+        assert (True, True, True, False) == self._deliverability(db_session, pool2)
+
+        # An empty list refreshes nothing.
+        LicensePoolDeliverability.refresh(db_session, licensepool_ids=[])
+        assert (True, True, True, False) == self._deliverability(db_session, pool2)
+
+        # Refresh every LicensePool for a given book.
+        LicensePoolDeliverability.refresh(
+            db_session,
+            delivery_mechanisms=[(pool2.data_source_id, pool2.identifier_id)]
+        )
+        assert (True, True, False, False) == self._deliverability(db_session, pool2)
+
+        # A LicensePool with no LicensePoolDeliverability gets one.
+        db_session.query(LicensePoolDeliverability).delete()
+        LicensePoolDeliverability.refresh(db_session)
+        assert (True, True, False, False) == self._deliverability(db_session, pool1)
+        assert (True, True, False, False) == self._deliverability(db_session, pool2)
+
+    def test_restrict(self, db_session, create_collection, create_work):
+        """
+        GIVEN: Works whose LicensePools have different deliverability
+        WHEN:  Restricting a query to deliverable LicensePools
+        THEN:  Only the appropriate Works are found
+        """
+        def make_work(**kwargs):
+            work = create_work(db_session, with_license_pool=True, **kwargs)
+            return work, work.license_pools[0]
+
+        available, ignore = make_work()
+        on_hold, pool = make_work()
+        pool.licenses_available = 0
+        unlicensed, pool = make_work()
+        pool.licenses_owned = 0
+        pool.licenses_available = 0
+        suppressed, pool = make_work()
+        pool.suppressed = True
+        undeliverable, pool = make_work()
+        for lpdm in pool.delivery_mechanisms:
+            db_session.delete(lpdm)
+        other_collection = create_collection(db_session)
+        elsewhere, ignore = make_work(collection=other_collection)
+
+        qu = db_session.query(Work).join(Work.license_pools)
+
+        def expect(works, **kwargs):
+            restricted = LicensePoolDeliverability.restrict(qu, **kwargs)
+            assert set(works) == set(restricted)
+
+        expect([available, on_hold, elsewhere])
+        expect([available, elsewhere], allow_holds=False)
+        expect([available, on_hold, suppressed, elsewhere], show_suppressed=True)
+        expect([elsewhere], collection_ids=[other_collection.id])
+        expect([], collection_ids=[])
+
+
 class TestLicensePoolDeliveryMechanism:
 
     def test_lpdm_change_may_change_open_access_status(self, db_session, create_edition):
@@ -1,6 +1,8 @@
 # encoding: utf-8
+import datetime
 import functools
 import pytest
+import select
 
 from ... import lane
 from ... import model
@@ -10,6 +12,7 @@ from ...model import (
     ConfigurationSetting,
     create,
     site_configuration_has_changed,
+    SiteConfigurationChangeListener,
     Timestamp,
     WorkCoverageRecord,
 )
@@ -140,7 +143,7 @@ class TestSiteConfigurationHasChanged:
         ConfigurationSetting.sitewide(db_session, "setting").value = "value2"
         self.mock.assert_was_called()
 
-    def test_lane_change_updates_configuration(self, db_session, create_lane):
+    def test_lane_change_updates_configuration(self, db_session, create_lane, create_customlist):
         """
         GIVEN: A Lane
         WHEN:  Configuration-relevant changes are made
@@ -152,6 +155,16 @@ class TestSiteConfigurationHasChanged:
         lane.add_genre("Science Fiction")
         self.mock.assert_was_called()
 
+        # Changing the CustomLists associated with the Lane doesn't
+        # directly modify the Lane, but other processes need to know
+        # about it.
+        customlist, ignore = create_customlist(db_session, num_entries=0)
+        db_session.commit()
+        self.mock.was_called = False
+        lane.customlists.append(customlist)
+        db_session.commit()
+        self.mock.assert_was_called()
+
     def test_configuration_relevant_collection_change_updates_configuration(
             self, db_session, create_collection,  create_library):
         """
@@ -186,6 +199,143 @@ class TestSiteConfigurationHasChanged:
         # recreated.
 
 
+class TestSiteConfigurationChangeListener:
+
+    @pytest.fixture
+    def listener(self, db_engine):
+        connection = db_engine.raw_connection()
+        connection.detach()
+        listener = SiteConfigurationChangeListener(connection.connection)
+        yield listener
+        listener.stop()
+        Configuration.site_configuration_change_listener = None
+
+    @pytest.fixture
+    def notifier(self, db_engine, listener):
+        # Notifications are only delivered once a transaction is
+        # committed, so send them from outside the test transaction.
+        with db_engine.connect() as connection:
+            connection = connection.execution_options(
+                isolation_level="AUTOCOMMIT"
+            )
+
+            def notify(when):
+                SiteConfigurationChangeListener.notify(connection, when)
+                # Wait for the notification to arrive.
+                select.select([listener.connection], [], [], 5)
+            yield notify
+
+    def test_poll(self, db_session, listener, notifier):
+        # Nothing has happened yet.
+        assert None == listener.poll()
+
+        # Another process changes the site configuration.
+        then = utc_now() + datetime.timedelta(seconds=10)
+        later = then + datetime.timedelta(seconds=1)
+        notifier(then)
+        notifier(later)
+        ConfigurationSetting._cache = {}
+
+        # The listener finds out about the most recent change, and
+        # the configuration caches are reset.
+        assert later == listener.poll()
+        assert ConfigurationSetting.RESET == ConfigurationSetting._cache
+
+        # The notifications have been used up.
+        assert None == listener.poll()
+
+        # If the change is one this process already knows about (because
+        # this process made it), the caches are left alone.
+        Configuration.site_configuration_last_update(None, known_value=later)
+        notifier(later)
+        ConfigurationSetting._cache = {}
+        assert None == listener.poll()
+        assert {} == ConfigurationSetting._cache
+
+    def test_site_configuration_last_update_uses_listener(
+            self, db_session, listener, notifier
+    ):
+        Configuration.site_configuration_change_listener = listener
+        original = Configuration.site_configuration_last_update(db_session)
+        version = Configuration.site_configuration_version()
+
+        # The database is not consulted; the only way to learn about
+        # a change is through a notification.
+        later = utc_now() + datetime.timedelta(seconds=10)
+        Timestamp.stamp(
+            db_session, Configuration.SITE_CONFIGURATION_CHANGED,
+            service_type=None, collection=None, finish=later
+        )
+        assert original == Configuration.site_configuration_last_update(
+            db_session, timeout=0
+        )
+        assert version == Configuration.site_configuration_version()
+
+        notifier(later)
+        assert later == Configuration.site_configuration_last_update(
+            db_session, timeout=0
+        )
+        assert version + 1 == Configuration.site_configuration_version()
+
+        # If the listener breaks, we go back to polling the database.
+        class Broken(object):
+            def poll(self):
+                raise Exception("connection lost")
+        Configuration.site_configuration_change_listener = Broken()
+        assert later == Configuration.site_configuration_last_update(
+            db_session, timeout=0
+        )
+        assert None == Configuration.site_configuration_change_listener
+
+    def test_poll_notices_dead_connection(self, db_engine, listener):
+        # The connection is killed from the server side. Nothing
+        # about that is visible to the listener right away.
+        with db_engine.connect() as connection:
+            connection.execute(
+                "SELECT pg_terminate_backend(%d)"
+                % listener.connection.get_backend_pid()
+            )
+
+        # But the next heartbeat finds out, and poll() raises an
+        # exception so the caller will poll the database instead.
+        listener.last_heartbeat -= datetime.timedelta(
+            seconds=listener.HEARTBEAT_INTERVAL
+        )
+        with pytest.raises(Exception):
+            listener.poll()
+        assert listener.connection.closed
+
+        # From then on, poll() fails right away.
+        with pytest.raises(Exception):
+            listener.poll()
+
+    def test_start(self, db_session):
+        listener = SiteConfigurationChangeListener.start(db_session)
+        try:
+            assert listener == Configuration.site_configuration_change_listener
+
+            # A process only needs one listener.
+            assert listener == SiteConfigurationChangeListener.start(
+                db_session
+            )
+        finally:
+            listener.stop()
+        assert None == Configuration.site_configuration_change_listener
+
+    def test_site_configuration_has_changed_sends_notification(
+            self, db_session, listener
+    ):
+        # site_configuration_has_changed() sends a notification, which
+        # is delivered once the transaction is committed. Our test
+        # transaction is never committed, so just verify that the
+        # notification doesn't break anything and that the local
+        # record is updated.
+        version = Configuration.site_configuration_version()
+        site_configuration_has_changed(db_session, cooldown=0)
+        assert version + 1 == Configuration.site_configuration_version()
+        assert None == listener.poll()
+
+
 def _set_property(object, value, property_name):
     setattr(object, property_name, value)
 
@@ -194,6 +194,54 @@ class TestMeasurement:
         new_quality = Measurement.overall_quality(l + [popularityish])
         assert quality != new_quality
 
+    def test_overall_quality_many(self):
+        """
+        GIVEN: Measurements of a number of things, as raw values
+        WHEN:  Measuring the overall quality of all of them at once
+        THEN:  Each gets the same quality overall_quality would give it
+        """
+        wrangler = DataSource.lookup(self._db, DataSource.METADATA_WRANGLER)
+        oclc = DataSource.lookup(self._db, DataSource.OCLC)
+        popularity = self._popularity(59)
+        rating = self._rating(4, weight=2)
+        other_rating = self._rating(7)
+        irrelevant = self._measurement("Some other quantity", 42, self.source, 1)
+        popularityish = self._measurement(Measurement.HOLDINGS, 400, oclc, 10)
+        quality = self._quality(0.3)
+        unknown = self._popularity(100, oclc)
+
+        groups = dict(
+            a=[popularity, rating, other_rating, irrelevant],
+            b=[popularity, popularityish, quality],
+            c=[irrelevant, unknown],
+            d=[],
+        )
+        rows = []
+        for key, measurements in list(groups.items()):
+            for m in measurements:
+                rows.append((key, m.quantity_measured, m.data_source.name,
+                             m.value, m.weight, None))
+        defaults = dict(a=0, b=0, c=0.1, d=0.2)
+
+        results = Measurement.overall_quality_many(rows, defaults, 0.4, 0.6)
+        for key, measurements in list(groups.items()):
+            assert Measurement.overall_quality(
+                measurements, 0.4, 0.6, defaults[key]
+            ) == pytest.approx(results[key])
+        assert 0.1 == results['c']
+        assert 0.2 == results['d']
+
+        # A previously stored normalized value is used instead of
+        # normalizing the raw value again.
+        rows = [('a', Measurement.POPULARITY, self.SOURCE_NAME, 59, 1, 0.9)]
+        assert dict(a=0.9) == Measurement.overall_quality_many(rows, dict(a=0))
+
+        # Measurements of things not in the defaults are ignored.
+        assert {} == Measurement.overall_quality_many(rows, {})
+
+        with pytest.raises(ValueError):
+            Measurement.overall_quality_many([], {}, 0.5, 0.6)
+
     def test_overall_quality_based_solely_on_popularity_if_no_rating(self):
         """
         GIVEN: Only a popularity number
@@ -1,5 +1,7 @@
 # encoding: utf-8
+from concurrent.futures import ThreadPoolExecutor
 import os
+from io import BytesIO
 import pytest
 
 from ...config import Configuration
@@ -744,6 +746,144 @@ class TestRepresentation:
         assert representation2 == representation
         assert normalized_url == representation.url
 
+    def test_get_many(self, db_session):
+        """
+        GIVEN: A batch of URLs, one of which is already cached
+        WHEN:  Retrieving them all with get_many
+        THEN:  Only the uncached URLs are fetched, and every URL gets a Representation
+        """
+        cached_url = "http://a.example.com/cached"
+        h = DummyHTTPClient()
+        h.queue_response(200, content="cached")
+        cached, ignore = Representation.get(db_session, cached_url, do_get=h.do_get)
+
+        requested = []
+        def do_get(url, headers):
+            requested.append(url)
+            if url.endswith("error"):
+                raise Exception("Connection refused")
+            if url.endswith("missing"):
+                return 404, {}, b"Not found"
+            return 200, {"content-type": "text/plain"}, url.encode("utf8")
+
+        urls = [
+            cached_url,
+            "http://a.example.com/1",
+            "http://b.example.com/2",
+            "http://b.example.com/2",
+            "http://b.example.com/missing",
+            "http://c.example.com/error",
+        ]
+        results = list(Representation.get_many(
+            db_session, urls, do_get=do_get, max_per_host=1
+        ))
+
+        # The cached representation was yielded first, without a request
+        # going out. Each other URL was requested once.
+        assert (cached_url, cached, True) == results[0]
+        assert sorted(set(urls[1:])) == sorted(requested)
+
+        by_url = dict((url, (rep, from_cache)) for url, rep, from_cache in results)
+        assert 5 == len(by_url)
+
+        rep, from_cache = by_url["http://a.example.com/1"]
+        assert from_cache is False
+        assert 200 == rep.status_code
+        assert b"http://a.example.com/1" == rep.content
+        assert "text/plain" == rep.media_type
+
+        rep, from_cache = by_url["http://b.example.com/missing"]
+        assert 404 == rep.status_code
+
+        rep, from_cache = by_url["http://c.example.com/error"]
+        assert "Connection refused" in rep.fetch_exception
+
+        # A second pass finds everything that's worth caching in the
+        # database.
+        requested[:] = []
+        results = list(Representation.get_many(
+            db_session, urls, do_get=do_get
+        ))
+        assert ["http://c.example.com/error"] == requested
+        assert 5 == len(results)
+
+    def test_get_many_normalizes_urls(self, db_session):
+        """
+        GIVEN: Several URLs that normalize to the same URL
+        WHEN:  Retrieving them all with get_many
+        THEN:  One request is made, and every URL gets the same Representation
+        """
+        requested = []
+        def do_get(url, headers):
+            requested.append(url)
+            return 200, {"content-type": "text/plain"}, b"content"
+
+        urls = [
+            "http://example.com/book?session=1",
+            "http://example.com/book?session=2",
+            "http://example.com/other",
+        ]
+        normalizer = lambda url: url.split("?")[0]
+        results = list(Representation.get_many(
+            db_session, urls, do_get=do_get, url_normalizer=normalizer
+        ))
+        db_session.flush()
+
+        assert sorted(
+            ["http://example.com/book?session=1", "http://example.com/other"]
+        ) == sorted(requested)
+        by_url = dict((url, rep) for url, rep, from_cache in results)
+        assert sorted(urls) == sorted(by_url)
+        book = by_url["http://example.com/book?session=1"]
+        assert book == by_url["http://example.com/book?session=2"]
+        assert "http://example.com/book" == book.url
+
+    def test_get_with_streamed_content(self, db_session):
+        """
+        GIVEN: An HTTP client that returns the body of a response as a stream
+        WHEN:  Retrieving a Representation
+        THEN:  The stream is kept for mirroring rather than being stored, except for images
+        """
+        def do_get(url, headers):
+            return 200, {
+                "content-type": "application/epub+zip", "etag": "an etag",
+                "last-modified": "a date",
+            }, BytesIO(b"epub")
+
+        representation, cached = Representation.get(
+            db_session, "http://example.com/book.epub", do_get=do_get
+        )
+        assert None == representation.content
+        assert 200 == representation.status_code
+
+        # Until the content has been mirrored, the cache headers aren't
+        # stored, so the next request won't be a conditional one that
+        # could get a 304 for a Representation with no content.
+        assert None == representation.etag
+        assert None == representation.last_modified
+
+        # The stream can be read once, when the content is mirrored.
+        assert b"epub" == representation.external_content().read()
+        assert None == representation.external_content()
+
+        representation.set_as_mirrored("http://mirror/book.epub")
+        assert "an etag" == representation.etag
+        assert "a date" == representation.last_modified
+
+        # Images are read into memory, so that they can be scaled.
+        path = os.path.join(
+            os.path.split(__file__)[0], "..", "files", "covers",
+            "test-book-cover.png"
+        )
+        image = open(path, "rb").read()
+        def do_get(url, headers):
+            return 200, {"content-type": "image/png"}, BytesIO(image)
+        representation, cached = Representation.get(
+            db_session, "http://example.com/cover.png", do_get=do_get
+        )
+        assert image == representation.content
+        assert 600 == representation.image_height
+
     def test_best_thumbnail(self, db_session, create_representation):
         """
         GIVEN: Representations with thumbnails
@@ -879,7 +1019,7 @@ class TestCoverResource:
             rep.scale(300, 600, "http://example.com", "text/plain")
         assert "Unsupported destination media type: text/plain" in str(excinfo.value)
 
-    def test_success(self, get_sample_cover_representation):
+    def test_success(self, get_sample_cover_representation, get_sample_cover_path):
         """
         GIVEN: A Representation for a cover image
         WHEN:  Forcefully scaling a cover image
@@ -926,6 +1066,62 @@ class TestCoverResource:
         # The thumbnail has been regenerated, so it needs to be mirrored again.
         assert thumbnail.mirrored_at is None
 
+        # If the thumbnail is forcibly re-scaled from the same image
+        # to the same size, there's no need to actually do the work.
+        assert thumbnail.scaled_from_hash is not None
+        thumbnail.set_as_mirrored("http://mirrored")
+        scaled_at = thumbnail.scaled_at
+        thumbnail3, is_new = cover.scale(400, 700, url, "image/png", force=True)
+        assert thumbnail3 == thumbnail
+        assert is_new is False
+        assert thumbnail.scaled_at == scaled_at
+
+        # But if the original image changes, the thumbnail is
+        # regenerated.
+        cover.content = open(
+            get_sample_cover_path("childrens-book-cover.png"), 'rb'
+        ).read()
+        thumbnail4, is_new = cover.scale(400, 700, url, "image/png", force=True)
+        assert thumbnail4 == thumbnail
+        assert is_new is True
+        assert thumbnail.image_width == 700
+        assert thumbnail.mirrored_at is None
+
+    def test_scale_many(self, get_sample_cover_representation):
+        """
+        GIVEN: A batch of Representations for cover images
+        WHEN:  Scaling them all at once
+        THEN:  Each image is scaled as it would have been by scale()
+        """
+        cover = get_sample_cover_representation("test-book-cover.png")
+        wide = get_sample_cover_representation("childrens-book-cover.png")
+        tiny = get_sample_cover_representation("tiny-image-cover.png")
+        jobs = [
+            (cover, "http://example.com/1"),
+            (wide, "http://example.com/2"),
+            (tiny, "http://example.com/3"),
+        ]
+
+        # The work is normally done in a process pool, but any
+        # Executor will do.
+        with ThreadPoolExecutor(2) as executor:
+            results = Representation.scale_many(
+                jobs, 300, 400, "image/png", executor=executor
+            )
+        [(thumbnail1, new1), (thumbnail2, new2), (thumbnail3, new3)] = results
+
+        assert new1 is True
+        assert thumbnail1.thumbnail_of == cover
+        assert (200, 300) == (thumbnail1.image_width, thumbnail1.image_height)
+
+        assert new2 is True
+        assert thumbnail2.thumbnail_of == wide
+        assert (400, 200) == (thumbnail2.image_width, thumbnail2.image_height)
+
+        # The tiny image didn't need to be scaled at all.
+        assert new3 is False
+        assert thumbnail3 == tiny
+
     def test_book_with_odd_aspect_ratio(self, get_sample_cover_representation):
         """
         GIVEN: A Representation for a cover iamge
@@ -15,6 +15,7 @@ from ...classifier import (
 )
 from ...model import (
     get_one_or_create,
+    PresentationCalculationPolicy,
     tuple_to_numericrange,
 )
 from ...model.coverage import WorkCoverageRecord
@@ -28,6 +29,7 @@ from ...model.datasource import DataSource
 from ...model.edition import Edition
 from ...model.identifier import Identifier
 from ...model.licensing import LicensePool
+from ...model.measurement import Measurement
 from ...model.resource import (
     Hyperlink,
     Representation,
@@ -522,6 +524,96 @@ class TestWork:
         m([i1.id, i2.id], [], [])
         assert l1.resource.representation.content.decode("utf-8") == w.summary_text
 
+    def test_calculate_quality_many(self, db_session, create_identifier, create_work):
+        """
+        GIVEN: Works whose Identifiers have Measurements
+        WHEN:  Calculating the quality of all the Works at once
+        THEN:  Each Work gets the quality calculate_quality would give it
+        """
+        wrangler = DataSource.lookup(db_session, DataSource.METADATA_WRANGLER)
+        overdrive = DataSource.lookup(db_session, DataSource.OVERDRIVE)
+        shared = create_identifier(db_session)
+        shared.add_measurement(wrangler, Measurement.QUALITY, 0.8)
+        other = create_identifier(db_session)
+        other.add_measurement(wrangler, Measurement.QUALITY, 0.4)
+        other.add_measurement(overdrive, Measurement.RATING, 4)
+
+        # An Identifier can count toward more than one Work.
+        work1 = create_work(db_session)
+        work2 = create_work(db_session)
+        work3 = create_work(db_session)
+        works = [
+            (work1, [shared.id], 0),
+            (work2, set([shared.id, other.id]), 0),
+            (work3, [], 0.25),
+        ]
+        Work.calculate_quality_many(db_session, works)
+
+        # Rating, 4 out of 5 stars, and quality are given equal weight.
+        expect_work2 = (0.75 / 2) + (0.6 / 2)
+        assert 0.8 == float(work1.quality)
+        assert round(expect_work2, 3) == float(work2.quality)
+        assert 0.25 == float(work3.quality)
+
+        # The answers are the same as when each Work is done on its own.
+        for work, identifier_ids, default_quality in works:
+            many_quality = work.quality
+            work.calculate_quality(identifier_ids, default_quality)
+            assert many_quality == work.quality
+
+        for work in (work1, work2, work3):
+            [record] = db_session.query(WorkCoverageRecord).filter(
+                WorkCoverageRecord.work == work
+            ).filter(
+                WorkCoverageRecord.operation == WorkCoverageRecord.QUALITY_OPERATION
+            ).all()
+
+    def test_calculate_presentation_many(self, db_session, create_identifier, create_work):
+        """
+        GIVEN: Works whose Identifiers (or their equivalents) have Measurements
+        WHEN:  Calculating the presentation of all the Works at once
+        THEN:  Each Work's quality is calculated, and a changed quality
+               counts as a change to the Work's presentation
+        """
+        wrangler = DataSource.lookup(db_session, DataSource.METADATA_WRANGLER)
+        work1 = create_work(db_session, with_license_pool=True)
+        work2 = create_work(
+            db_session, with_license_pool=True,
+            data_source_name=DataSource.OVERDRIVE
+        )
+        [pool] = work1.license_pools
+        related = create_identifier(db_session)
+        pool.identifier.equivalent_to(pool.data_source, related, strength=1)
+        related.add_measurement(wrangler, Measurement.QUALITY, 0.8)
+
+        policy = PresentationCalculationPolicy(
+            choose_edition=False, set_edition_metadata=False,
+            classify=False, choose_summary=False, choose_cover=False,
+            calculate_quality=True
+        )
+        for work in (work1, work2):
+            work.last_update_time = None
+        Work.calculate_presentation_many(db_session, [work1, work2], policy)
+
+        # Measurements of equivalent Identifiers are taken into account,
+        # and a Work with no Measurements gets the default quality for
+        # its DataSource.
+        assert 0.8 == float(work1.quality)
+        assert 0.4 == float(work2.quality)
+        for work in (work1, work2):
+            assert work.last_update_time is not None
+            [record] = [
+                x for x in work.coverage_records
+                if x.operation == WorkCoverageRecord.QUALITY_OPERATION
+            ]
+
+        # When the quality doesn't change, nothing has changed.
+        for work in (work1, work2):
+            work.last_update_time = None
+        Work.calculate_presentation_many(db_session, [work1, work2], policy)
+        assert 0.8 == float(work1.quality)
+        assert all(work.last_update_time is None for work in (work1, work2))
+
     def test_set_presentation_ready_based_on_content(self, db_session, create_work):
         """
         GIVEN: A Work
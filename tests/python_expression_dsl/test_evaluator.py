@@ -2,6 +2,7 @@ import pytest
 from parameterized import parameterized
 
 from ...python_expression_dsl.evaluator import (
+    DSLCompilationVisitor,
     DSLEvaluationError,
     DSLEvaluationVisitor,
     DSLEvaluator,
@@ -41,6 +42,9 @@ class Subject(object):
 
 
 class TestDSLEvaluator(object):
+    def _create_evaluator(self, parser):
+        return DSLEvaluator(parser, DSLEvaluationVisitor())
+
     @parameterized.expand(
         [
             ("incorrect_expression", "?", None, None, None, DSLParseError),
@@ -176,9 +180,7 @@ class TestDSLEvaluator(object):
         expected_exception=None,
     ):
         # Arrange
-        parser = DSLParser()
-        visitor = DSLEvaluationVisitor()
-        evaluator = DSLEvaluator(parser, visitor)
+        evaluator = self._create_evaluator(DSLParser())
 
         if safe_classes is None:
             safe_classes = []
@@ -192,3 +194,39 @@ class TestDSLEvaluator(object):
 
             # Assert
             assert expected_result == result
+
+    def test_expressions_are_parsed_once(self):
+        # Arrange
+        class CountingParser(DSLParser):
+            def __init__(self):
+                self.parsed = []
+
+            def parse(self, expression):
+                self.parsed.append(expression)
+
+                return super(CountingParser, self).parse(expression)
+
+        parser = CountingParser()
+        evaluator = self._create_evaluator(parser)
+        subjects = [Subject(["eresources"]), Subject(["books"])]
+
+        # Act
+        results = [
+            evaluator.evaluate(
+                "'eresources' in subject.attributes", {"subject": subject}, []
+            )
+            for subject in subjects
+        ]
+        results.append(evaluator.evaluate("1 + 1", None, []))
+
+        # Assert
+        # Each expression was parsed once, but each evaluation used its own context.
+        assert ["'eresources' in subject.attributes", "1 + 1"] == parser.parsed
+        assert [True, False, 2] == results
+
+
+class TestCompiledDSLEvaluator(TestDSLEvaluator):
+    """Run the same tests against expressions compiled into Python closures."""
+
+    def _create_evaluator(self, parser):
+        return DSLEvaluator(parser, DSLEvaluationVisitor(), DSLCompilationVisitor())
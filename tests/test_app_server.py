@@ -9,6 +9,7 @@ from flask_babel import (
     Babel,
     lazy_gettext as _
 )
+from sqlalchemy import inspect
 
 from ..testing import (
     DatabaseTest,
@@ -52,6 +53,7 @@ from ..entrypoint import (
 from ..problem_details import (
     INVALID_INPUT,
     INVALID_URN,
+    PAYLOAD_TOO_LARGE,
 )
 
 from ..util.opds_writer import (
@@ -125,6 +127,42 @@ class TestURNLookupHandler(DatabaseTest):
         handler.process_urns([])
         assert True == handler.called
 
+    def test_process_urns_preloads_works(self):
+        work = self._work(with_license_pool=True)
+        identifier = work.license_pools[0].identifier
+        self._db.commit()
+        self._db.expire_all()
+
+        class Mock(URNLookupHandler):
+            def preload_works(self, identifiers):
+                self.preloaded = super(Mock, self).preload_works(identifiers)
+                return self.preloaded
+        handler = Mock(self._db)
+        handler.process_urns([identifier.urn])
+        assert [work] == handler.preloaded
+        assert [(identifier, work)] == handler.works
+
+        # Everything process_identifier() and LookupAcquisitionFeed
+        # look at is loaded along with the Works.
+        self._db.expire_all()
+        assert [work] == handler.preload_works([identifier])
+        assert "licensed_through" not in inspect(identifier).unloaded
+        [pool] = identifier.licensed_through
+        assert "work" not in inspect(pool).unloaded
+        assert "presentation_edition" not in inspect(work).unloaded
+
+    def test_process_urns_time_budget(self):
+        work = self._work(with_license_pool=True)
+        identifier = work.license_pools[0].identifier
+
+        # If the time budget runs out, identifiers that haven't been
+        # looked up yet get a message asking the client to try again.
+        self.handler.TIME_BUDGET = -1
+        self.handler.process_urns([identifier.urn])
+        self.assert_one_message(
+            identifier.urn, 503, self.handler.TIME_BUDGET_EXCEEDED
+        )
+
     def test_process_urns_invalid_urn(self):
         urn = "not even a URN"
         self.handler.process_urns([urn])
@@ -224,6 +262,15 @@ class TestURNLookupController(DatabaseTest):
             response = controller.work_lookup(annotator=object())
             assert INVALID_INPUT == response
 
+    def test_work_lookup_too_many_urns(self):
+        self.controller.MAX_URNS = 1
+        app = Flask(__name__)
+        Babel(app)
+        with app.test_request_context("/?urn=foo&urn=bar"):
+            response = self.controller.work_lookup(annotator=object())
+            assert PAYLOAD_TOO_LARGE.uri == response.uri
+            assert 413 == response.status_code
+
     def test_permalink(self):
         work = self._work(with_license_pool=True)
         work.license_pools[0].open_access = False
@@ -581,3 +628,21 @@ class TestCompressibleAnnotator(object):
         response = ask_for_compression("gzip", "Accept-Transfer-Encoding")
         assert value == response.data
         assert 'Content-Encoding' not in response.headers
+
+    def test_compressible_streaming_response(self):
+        # A streaming response is compressed as it's sent.
+        chunks = [b"Compress ", b"me ", b"a bit at a time."]
+
+        @compressible
+        def function():
+            return flask.Response(iter(chunks))
+
+        with self.app.test_request_context(
+            headers={"Accept-Encoding": "gzip"}
+        ):
+            response = function()
+            self.app.process_response(response)
+            assert response.is_streamed
+            assert "gzip" == response.headers['Content-Encoding']
+            assert 'Content-Length' not in response.headers
+            assert b"".join(chunks) == gzip.decompress(response.data)
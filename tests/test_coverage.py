@@ -27,6 +27,7 @@ from ..model import (
     ExternalIntegration,
     Hyperlink,
     Identifier,
+    Measurement,
     PresentationCalculationPolicy,
     Representation,
     RightsStatus,
@@ -2206,6 +2207,24 @@ class TestWorkClassificationCoverageProvider(DatabaseTest):
              policy.choose_summary, policy.calculate_quality]
         )
 
+    def test_process_batch(self):
+        wrangler = DataSource.lookup(self._db, DataSource.METADATA_WRANGLER)
+        work1 = self._work(with_license_pool=True)
+        work2 = self._work(with_license_pool=True)
+        work1.license_pools[0].identifier.add_measurement(
+            wrangler, Measurement.QUALITY, 0.8
+        )
+        work2.license_pools[0].identifier.add_measurement(
+            wrangler, Measurement.QUALITY, 0.2
+        )
+
+        # The whole batch is processed at once, and every Work in it
+        # has its quality recalculated.
+        provider = WorkClassificationCoverageProvider(self._db)
+        assert [work1, work2] == provider.process_batch([work1, work2])
+        assert 0.8 == float(work1.quality)
+        assert 0.2 == float(work2.quality)
+
 
 class TestOPDSEntryWorkCoverageProvider(DatabaseTest):
 
@@ -246,6 +246,10 @@ class TestMembershipManager(DatabaseTest):
         assert update_time == entry1.first_appearance
         assert update_time == entry1.most_recent_appearance
 
+        # The list's original entry wasn't part of a series, so it was
+        # removed, and the list's size reflects that.
+        assert 2 == custom_list.size
+
         # In a shocking twist, one of the entries turns out not to
         # have a series, while the entry previously thought not to
         # have a series actually does.
@@ -264,6 +268,7 @@ class TestMembershipManager(DatabaseTest):
         assert new_update_time == old_entry.most_recent_appearance
         assert new_update_time == new_entry.first_appearance
         assert new_update_time == new_entry.most_recent_appearance
+        assert 2 == custom_list.size
 
     def test_classification_based_membership_manager(self):
         e1 = self._edition()
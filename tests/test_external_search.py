@@ -2574,6 +2574,35 @@ class TestQuery(DatabaseTest):
                 ('multi match title+subtitle', 5),
             ])
 
+    def test_elasticsearch_query_is_cached(self):
+        # Building the hypotheses for a query string is expensive,
+        # so the result is reused by other Query objects with the same
+        # query string.
+        class Mock(Query):
+            calls = 0
+            def _build_elasticsearch_query(self):
+                self.__class__.calls += 1
+                return "query for %s" % self.query_string
+
+        q1 = Mock("asteroids")
+        assert "query for asteroids" == q1.elasticsearch_query
+        assert "query for asteroids" == Mock("asteroids").elasticsearch_query
+        assert 1 == Mock.calls
+
+        # A different query string means a different query.
+        assert "query for comets" == Mock("comets").elasticsearch_query
+        assert 2 == Mock.calls
+
+        # So does a Query that doesn't use the query parser.
+        Mock("asteroids", use_query_parser=False).elasticsearch_query
+        assert 3 == Mock.calls
+
+        # A real Query gets the same result whether or not the
+        # result was cached.
+        expect = Query("asteroids")._build_elasticsearch_query()
+        assert expect == Query("asteroids").elasticsearch_query
+        assert expect == Query("asteroids").elasticsearch_query
+
     def test_match_one_field_hypotheses(self):
         # Test our ability to generate hypotheses that a search string
         # is trying to match a single field of data.
@@ -3665,6 +3694,45 @@ class TestFilter(DatabaseTest):
         built_filters, subfilters = self.assert_filter_builds_to([{'term': {'fiction': 'nonfiction'}}], filter)
         assert {} == subfilters
 
+    def test_build_is_cached(self):
+        # Filters that impose the same restrictions share the output
+        # of build().
+        f1 = Filter(media=Edition.BOOK_MEDIUM, languages="eng",
+                    genre_restriction_sets=[[1, 2]],
+                    excluded_audiobook_data_sources=[3])
+        f2 = Filter(media=Edition.BOOK_MEDIUM, languages="eng",
+                    genre_restriction_sets=[[1, 2]],
+                    excluded_audiobook_data_sources=[3])
+        assert f1._build_cache_key() == f2._build_cache_key()
+        main1, nested1 = f1.build()
+        main2, nested2 = f2.build()
+        assert main1 is main2
+        assert nested1 == nested2
+        assert (main1, nested1) == f1._build()
+
+        # The nested filters are a brand new dictionary every time, so
+        # modifying them doesn't affect anyone else.
+        assert nested1 is not nested2
+        nested1['genres'].append("junk")
+        nested1['new path'].append("junk")
+        main3, nested3 = f2.build()
+        assert nested2 == nested3
+
+        # Changing a Filter after it's created changes its cache key.
+        f2.fiction = True
+        assert f1._build_cache_key() != f2._build_cache_key()
+        main4, nested4 = f2.build()
+        assert main4 != main1
+        assert {'term': {'fiction': 'fiction'}} in main4.to_dict()['bool']['must']
+
+        # Restrictions that are specific to one request aren't cached.
+        for f in (
+            Filter(author=ContributorData(sort_name="Butler, Octavia")),
+            Filter(identifiers=[self._identifier()]),
+        ):
+            assert None == f._build_cache_key()
+            assert f._build() == f.build()
+
     def test_build_series(self):
         # Test what happens when a series restriction is placed on a Filter.
         f = Filter(series="Talking Hedgehog Mysteries")
@@ -4109,6 +4177,20 @@ class TestFilter(DatabaseTest):
         base = Filter.universal_base_filter(self._mock_chain)
         assert [Term(presentation_ready=True)] == base
 
+    def test_universal_filters_are_cached(self):
+        # The universal filters never change, so they're only built
+        # once.
+        assert (Filter.universal_base_filter() is
+                Filter.universal_base_filter())
+
+        # But universal_nested_filters() returns a brand new dictionary
+        # every time, since the caller may modify it.
+        nested = Filter.universal_nested_filters()
+        nested['licensepools'].append("junk")
+        assert Filter.universal_nested_filters() == (
+            Filter._build_universal_nested_filters()
+        )
+
     def test_universal_nested_filters(self):
         # Test the nested filters that are always applied.
 
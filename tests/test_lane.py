@@ -45,12 +45,14 @@ from ..lane import (
     TopLevelWorkList,
     WorkList,
     Lane,
+    LaneIndex,
 )
 from ..model import (
     dump_query,
     get_one_or_create,
     tuple_to_numericrange,
     CachedFeed,
+    CustomList,
     CustomListEntry,
     DataSource,
     Edition,
@@ -3856,6 +3858,162 @@ class TestLane(DatabaseTest):
         Lane._groups_for_lanes = old_value
 
 
+class TestLaneIndex(DatabaseTest):
+
+    def setup_method(self):
+        super(TestLaneIndex, self).setup_method()
+        LaneIndex.reset()
+
+        # Set up a small lane hierarchy.
+        self.fiction = self._lane(fiction=True, languages=["eng"])
+        self.fiction.media = [Edition.BOOK_MEDIUM]
+        self.fantasy = self._lane(parent=self.fiction, genres=["Fantasy"])
+        self.fantasy.add_genre("Urban Fantasy", inclusive=False)
+        self.best_sellers = self._lane(parent=self.fantasy)
+        self.best_sellers.list_datasource = DataSource.lookup(
+            self._db, DataSource.NYT
+        )
+        self.nyt_list, ignore = self._customlist(
+            num_entries=0, data_source_name=DataSource.NYT
+        )
+        self.staff_picks = self._lane(parent=self.best_sellers)
+        self.staff_picks_list, ignore = self._customlist(
+            num_entries=0, data_source_name=DataSource.LIBRARY_STAFF
+        )
+        self.staff_picks.customlists.append(self.staff_picks_list)
+        self.nonfiction = self._lane(
+            parent=self.staff_picks, fiction=False,
+            inherit_parent_restrictions=False
+        )
+        self.lanes = [
+            self.fiction, self.fantasy, self.best_sellers,
+            self.staff_picks, self.nonfiction
+        ]
+        self._db.flush()
+
+    def test_index_matches_lane_hierarchy(self):
+        index = LaneIndex.for_library(self._db, self._default_library.id)
+        for lane in self.lanes:
+            assert (
+                [x.id for x in lane.parentage] == index.parentages[lane.id]
+            )
+            for k in LaneIndex.INHERITED_KEYS:
+                assert (
+                    WorkList.inherited_value(lane, k) ==
+                    index.inherited_value(lane.id, k)
+                )
+            assert lane._gather_genre_ids() == index.own_value(
+                lane.id, 'genre_ids'
+            )
+            if not index.from_database(lane.id, 'customlist_ids'):
+                assert lane._gather_customlist_ids() == index.own_value(
+                    lane.id, 'customlist_ids'
+                )
+            for k in LaneIndex.INHERITED_VALUES_KEYS:
+                assert (
+                    WorkList.inherited_values(lane, k) ==
+                    index.inherited_values(lane.id, k, lane._lane_value)
+                )
+
+        # Spot-check some of the values.
+        assert True == index.inherited_value(self.staff_picks.id, 'fiction')
+        assert False == index.inherited_value(self.nonfiction.id, 'fiction')
+        assert None == index.inherited_value(self.nonfiction.id, 'media')
+        lookup = self.staff_picks._lane_value
+        assert ([self.fantasy.genre_ids, [self.nyt_list.id],
+                 [self.staff_picks_list.id]] ==
+                index.inherited_values(self.staff_picks.id, 'genre_ids',
+                                       lookup) +
+                index.inherited_values(self.staff_picks.id, 'customlist_ids',
+                                       lookup))
+
+    def test_lane_uses_index(self):
+        # Once the index has been built, a Lane consults it instead of
+        # walking its parentage.
+        LaneIndex.for_library(self._db, self._default_library.id)
+        self.fiction.fiction = False
+        self.fiction.languages = ["spa"]
+        index = LaneIndex.for_library(self._db, self._default_library.id)
+        index.values[self.fiction.id]['fiction'] = "from index"
+
+        # The change to self.fiction hasn't been written to the database,
+        # so the index can't be trusted.
+        assert None == LaneIndex.for_lane(self.staff_picks)
+        assert False == self.staff_picks.inherited_value('fiction')
+
+        # Writing the change to the database resets the index, and the
+        # next index that's built will reflect the change.
+        self._db.flush()
+        assert [] == list(LaneIndex._cache.keys())
+        assert False == self.staff_picks.inherited_value('fiction')
+        assert ["spa"] == self.staff_picks.inherited_value('languages')
+        assert self._default_library.id in LaneIndex._cache
+
+        index = LaneIndex.for_lane(self.staff_picks)
+        index.values[self.fiction.id]['fiction'] = "from index"
+        assert "from index" == self.staff_picks.inherited_value('fiction')
+
+        # Keys the index doesn't know about are handled normally.
+        assert (self.staff_picks.collection_ids ==
+                self.staff_picks.inherited_value('collection_ids'))
+
+    def test_index_rebuilt_when_site_configuration_changes(self):
+        index = LaneIndex.for_library(self._db, self._default_library.id)
+        assert index == LaneIndex.for_library(
+            self._db, self._default_library.id
+        )
+
+        Configuration.site_configuration_last_update(
+            self._db, known_value=utc_now()
+        )
+        assert index != LaneIndex.for_library(
+            self._db, self._default_library.id
+        )
+
+    def test_lists_from_datasource_not_indexed(self):
+        # The lists a Lane draws from a DataSource can change in
+        # another process, without the site configuration changing,
+        # so the index doesn't keep them.
+        index = LaneIndex.for_library(self._db, self._default_library.id)
+        assert True == index.from_database(
+            self.best_sellers.id, 'customlist_ids'
+        )
+        assert False == index.from_database(
+            self.staff_picks.id, 'customlist_ids'
+        )
+        assert False == index.from_database(self.best_sellers.id, 'genre_ids')
+
+        # Here, another process creates an NYT list and moves the
+        # staff picks list over to NYT.
+        table = CustomList.__table__
+        nyt = DataSource.lookup(self._db, DataSource.NYT)
+        [another_nyt_list_id] = self._db.execute(
+            table.insert().values(
+                name="Another NYT list", data_source_id=nyt.id,
+                foreign_identifier="another"
+            ).returning(table.c.id)
+        ).first()
+        self._db.execute(
+            table.update().where(
+                table.c.id==self.staff_picks_list.id
+            ).values(data_source_id=nyt.id)
+        )
+
+        # The cached index is still used, but it gets the Lanes' lists
+        # from the database.
+        assert index == LaneIndex.for_library(
+            self._db, self._default_library.id
+        )
+        expect = sorted(
+            [self.nyt_list.id, another_nyt_list_id, self.staff_picks_list.id]
+        )
+        assert expect == sorted(self.best_sellers.customlist_ids)
+        assert [expect, [self.staff_picks_list.id]] == [
+            sorted(x) for x in
+            self.staff_picks.inherited_values('customlist_ids')
+        ]
+
+
 class TestWorkListGroupsEndToEnd(EndToEndSearchTest):
     # A comprehensive end-to-end test of WorkList.groups()
     # using a real Elasticsearch index.
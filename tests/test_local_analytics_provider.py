@@ -4,6 +4,7 @@ from ..testing import DatabaseTest
 from ..local_analytics_provider import LocalAnalyticsProvider
 from ..model import (
     CirculationEvent,
+    CirculationEventBuffer,
     ExternalIntegration,
     create,
 )
@@ -67,6 +68,32 @@ class TestLocalAnalyticsProvider(DatabaseTest):
             )
         assert 3 == qu.count()
 
+    def test_collect_event_buffered(self):
+        # If a CirculationEventBuffer is installed on the database
+        # session, events go into the buffer and are written to the
+        # database later.
+        lp = self._licensepool(None)
+        now = utc_now()
+        qu = self._db.query(CirculationEvent).filter(
+            CirculationEvent.type == CirculationEvent.DISTRIBUTOR_CHECKIN
+        )
+        with CirculationEventBuffer.buffering(self._db) as buffer:
+            assert True == self.la.collect_event(
+                self._default_library, lp,
+                CirculationEvent.DISTRIBUTOR_CHECKIN, now,
+                old_value=None, new_value=None
+            )
+            assert 1 == len(buffer)
+            assert 0 == qu.count()
+
+            # Committing the session flushes the buffer.
+            self._db.commit()
+            assert 0 == len(buffer)
+            [event] = qu.all()
+            assert lp == event.license_pool
+            assert self._default_library == event.library
+            assert now == event.start
+
     def test_collect_with_missing_information(self):
         """A circulation event may be collected with either the
         library or the license pool missing, but not both.
@@ -2,16 +2,20 @@
 import json
 import logging
 import sys
+from io import StringIO
+from queue import Queue
 
 import pytest
+from watchtower import CloudWatchLogHandler
 
 from ..testing import DatabaseTest
 from ..log import (
     StringFormatter,
     JSONFormatter,
     LogglyHandler,
-    CloudWatchLogHandler,
     LogConfiguration,
+    DroppingQueueHandler,
+    BatchingQueueListener,
     SysLogger,
     Loggly,
     CloudwatchLogs,
@@ -23,6 +27,7 @@ from ..model import (
     ConfigurationSetting
 )
 from ..config import Configuration
+from ..util.datetime_helpers import datetime_utc
 
 class TestJSONFormatter(object):
 
@@ -76,6 +81,137 @@ class TestJSONFormatter(object):
             # The resulting data is always a Unicode string.
             assert "An important snowman: ☃" == data['message']
 
+    def test_format_queued_record(self):
+        # A record that went through a DroppingQueueHandler has already
+        # had its message interpolated and its traceback rendered.
+        formatter = JSONFormatter("some app")
+        try:
+            raise ValueError("fake exception")
+        except ValueError as e:
+            exc_info = sys.exc_info()
+        record = logging.LogRecord(
+            "some logger", logging.ERROR, "pathname",
+            104, "A %s message", ("queued",), exc_info, None
+        )
+        record.created = datetime_utc(2021, 1, 2, 3, 4, 5).timestamp()
+        queued = DroppingQueueHandler(Queue()).prepare(record)
+        assert None == queued.exc_info
+        assert None == queued.args
+
+        data = json.loads(formatter.format(queued))
+        assert "A queued message" == data['message']
+        assert 'ValueError: fake exception' in data['traceback']
+
+        # The timestamp is the time the record was created, not the
+        # time it was formatted.
+        assert "2021-01-02T03:04:05+00:00" == data['timestamp']
+
+
+class TestDroppingQueueHandler(object):
+
+    def record(self, message, level=logging.INFO):
+        return logging.LogRecord(
+            "some logger", level, "pathname", 104, message, None, None
+        )
+
+    def test_prepare(self):
+        handler = DroppingQueueHandler(Queue())
+        original = self.record("%s and %s")
+        original.args = ("this", b"that")
+        record = handler.prepare(original)
+
+        # The message is interpolated in the calling thread, using
+        # the same rules as JSONFormatter.
+        assert "this and that" == record.msg
+        assert None == record.args
+        assert "this and that" == record.getMessage()
+
+        # The original record is left alone.
+        assert "%s and %s" == original.msg
+
+    def test_full_queue(self):
+        queue = Queue(2)
+        handler = DroppingQueueHandler(queue, block_timeout=0.01)
+        handler.handle(self.record("one"))
+        handler.handle(self.record("two"))
+
+        # The queue is full, so an INFO message is dropped right away.
+        handler.handle(self.record("three"))
+        assert 1 == handler.dropped
+        assert 0 == handler.blocked
+
+        # A WARNING message waits a little while for room in the
+        # queue before being dropped.
+        handler.handle(self.record("four", logging.WARNING))
+        assert 2 == handler.dropped
+        assert 1 == handler.blocked
+
+        # Once there's room, the next record is followed by a report of
+        # the dropped records.
+        queue.get()
+        queue.get()
+        handler.handle(self.record("five"))
+        assert ["five", "Log queue was full; dropped 2 log message(s)."] == [
+            queue.get().msg, queue.get().msg
+        ]
+        assert queue.empty()
+
+        # The drops are only reported once.
+        handler.handle(self.record("six"))
+        assert "six" == queue.get().msg
+        assert queue.empty()
+
+
+class TestBatchingQueueListener(object):
+
+    def test_handle_batch(self):
+        class Recorder(logging.Handler):
+            def __init__(self):
+                super(Recorder, self).__init__()
+                self.handled = []
+            def emit(self, record):
+                self.handled.append(record.msg)
+
+        class CountingStream(StringIO):
+            writes = 0
+            def write(self, s):
+                self.writes += 1
+                return super(CountingStream, self).write(s)
+
+        stream = CountingStream()
+        stream_handler = logging.StreamHandler(stream)
+        stream_handler.setFormatter(logging.Formatter("%(message)s"))
+        other = Recorder()
+        other.setLevel(logging.WARNING)
+
+        queue = Queue()
+        handler = DroppingQueueHandler(queue)
+        listener = BatchingQueueListener(
+            queue, stream_handler, other, batch_size=3
+        )
+        for i in range(5):
+            handler.handle(logging.LogRecord(
+                "some logger", logging.INFO if i % 2 else logging.WARNING,
+                "pathname", 104, "message %d" % i, None, None
+            ))
+
+        # Nothing happens until the listener is running.
+        assert "" == stream.getvalue()
+
+        listener.start()
+        listener.stop()
+
+        # The records went to the stream in two batches, each of which
+        # was written all at once.
+        assert 2 == stream.writes
+        assert (
+            ["message %d" % i for i in range(5)] ==
+            stream.getvalue().splitlines()
+        )
+
+        # The other handler's log level was respected.
+        assert ["message 0", "message 2", "message 4"] == other.handled
+
 
 class TestLogConfiguration(DatabaseTest):
 
@@ -286,3 +422,66 @@ class TestLogConfiguration(DatabaseTest):
         )
         assert isinstance(handler, logging.StreamHandler)
         assert 'Error creating logger AWS Cloudwatch Logs Unable to locate credentials' == error
+
+    def test_initialize(self):
+        root = logging.getLogger()
+        try:
+            # Outside of unit tests, the root logger gets a single
+            # handler, which puts records on a queue to be handled by a
+            # background thread.
+            LogConfiguration.initialize(None, testing=False)
+            [handler] = root.handlers
+            assert isinstance(handler, DroppingQueueHandler)
+            listener = LogConfiguration._listener
+            assert handler.queue == listener.queue
+            [stream_handler] = listener.handlers
+            assert isinstance(stream_handler.formatter, JSONFormatter)
+            assert LogConfiguration.INFO == logging.getLevelName(
+                stream_handler.level
+            )
+
+            # Reinitializing stops the old background thread and
+            # starts a new one.
+            LogConfiguration.initialize(None, testing=False)
+            assert None == listener._thread
+            assert LogConfiguration._listener._thread.is_alive()
+            new_listener = LogConfiguration._listener
+        finally:
+            # During unit tests, the handlers are attached directly.
+            LogConfiguration.initialize(None, testing=True)
+        assert None == LogConfiguration._listener
+        assert None == new_listener._thread
+        [handler] = root.handlers
+        assert isinstance(handler, logging.StreamHandler)
+        assert isinstance(handler.formatter, StringFormatter)
+
+    def test_restart_listener_after_fork(self):
+        root = logging.getLogger()
+        try:
+            LogConfiguration.initialize(None, testing=False)
+            [old_handler] = root.handlers
+            old_listener = LogConfiguration._listener
+            old_listener.queue.put_nowait("a record from the parent")
+
+            # This is what a child process does right after a fork.
+            LogConfiguration._restart_listener_after_fork()
+
+            # The child has a new queue and a new background thread,
+            # feeding the same handlers as before.
+            [new_handler] = root.handlers
+            assert isinstance(new_handler, DroppingQueueHandler)
+            assert new_handler is not old_handler
+            new_listener = LogConfiguration._listener
+            assert new_listener is not old_listener
+            assert new_handler.queue is new_listener.queue
+            assert new_listener.queue is not old_listener.queue
+            assert old_listener.handlers == new_listener.handlers
+            assert new_listener._thread.is_alive()
+
+            # The parent's queued records weren't carried over, so
+            # they won't be written twice.
+            assert new_listener.queue.empty()
+        finally:
+            # In a real child process the old thread wouldn't exist.
+            old_listener.stop()
+            LogConfiguration.initialize(None, testing=True)
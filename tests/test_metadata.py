@@ -1,7 +1,9 @@
+from concurrent.futures import ThreadPoolExecutor
 import csv
 import datetime
 import os
 from copy import deepcopy
+from io import BytesIO
 import pytest
 from parameterized import parameterized
 
@@ -21,6 +23,7 @@ from ..metadata_layer import (
     LinkData,
     MARCExtractor,
     MeasurementData,
+    MetaToModelUtility,
     Metadata,
     ReplacementPolicy,
     SubjectData,
@@ -749,6 +752,145 @@ class TestMetadataImporter(DatabaseTest):
         assert [representation] == mirrors[mirror_type].uploaded
         assert ["Replaced Content"] == mirrors[mirror_type].content
 
+    def test_mirror_streams_book_content(self):
+        edition, pool = self._edition(with_license_pool=True)
+        data_source = DataSource.lookup(self._db, DataSource.GUTENBERG)
+        m = Metadata(data_source=data_source)
+
+        class StreamingMirror(MockS3Uploader):
+            def mirror_one(self, representation, **kwargs):
+                self.streamed = representation.external_content().read()
+                super(StreamingMirror, self).mirror_one(representation, **kwargs)
+
+        mirror_type = ExternalIntegrationLink.OPEN_ACCESS_BOOKS
+        mirror = StreamingMirror()
+        assert True == mirror.STREAMING_UPLOADS
+
+        requests = []
+        streams = []
+        def http_get(url, headers, **kwargs):
+            requests.append(kwargs)
+            streams.append(BytesIO(b"I'm a very large epub"))
+            return (
+                200, {"content-type": Representation.EPUB_MEDIA_TYPE},
+                streams[-1]
+            )
+        policy = ReplacementPolicy(
+            mirrors={mirror_type: mirror}, http_get=http_get
+        )
+
+        link = LinkData(
+            rel=Hyperlink.OPEN_ACCESS_DOWNLOAD,
+            media_type=Representation.EPUB_MEDIA_TYPE,
+            href="http://example.com/test.epub",
+        )
+        link_obj, ignore = edition.primary_identifier.add_link(
+            rel=link.rel, href=link.href, data_source=data_source,
+        )
+        m.mirror_link(pool, data_source, link, link_obj, policy)
+
+        # The book was requested as a stream, and the stream was
+        # handed to the mirror without being stored.
+        assert [dict(stream=True)] == requests
+        representation = link_obj.resource.representation
+        assert b"I'm a very large epub" == mirror.streamed
+        assert None == representation.content
+        assert representation.mirror_url is not None
+
+        # The stream was closed afterwards.
+        assert True == streams[-1].closed
+
+        # Streaming isn't possible if the content is going to be
+        # modified, or if the mirror can't take a stream, or for
+        # covers.
+        m = MetaToModelUtility.can_stream
+        assert True == m(link, mirror, policy)
+        assert False == m(
+            link, mirror, ReplacementPolicy(content_modifier=object())
+        )
+        assert False == m(link, object(), policy)
+        cover = LinkData(
+            rel=Hyperlink.IMAGE, media_type=Representation.PNG_MEDIA_TYPE,
+            href="http://example.com/cover.png"
+        )
+        assert False == m(cover, mirror, policy)
+
+        # The stream is also closed if mirror_link gives up before
+        # mirroring anything -- here, because the media type turns out
+        # to be one we don't mirror.
+        def http_get_html(url, headers, **kwargs):
+            streams.append(BytesIO(b"Not a book"))
+            return 200, {"content-type": "text/html"}, streams[-1]
+        html_policy = ReplacementPolicy(
+            mirrors={mirror_type: mirror}, http_get=http_get_html
+        )
+        html_link = LinkData(
+            rel=Hyperlink.OPEN_ACCESS_DOWNLOAD,
+            href="http://example.com/not-a-book",
+        )
+        html_link_obj, ignore = edition.primary_identifier.add_link(
+            rel=html_link.rel, href=html_link.href, data_source=data_source,
+        )
+        mirror.streamed = None
+        Metadata(data_source=data_source).mirror_link(
+            pool, data_source, html_link, html_link_obj, html_policy
+        )
+        assert None == mirror.streamed
+        assert True == streams[-1].closed
+
+    def test_mirror_link_defers_thumbnails(self):
+        edition, pool = self._edition(with_license_pool=True)
+        data_source = DataSource.lookup(self._db, DataSource.GUTENBERG)
+        m = Metadata(data_source=data_source)
+
+        mirror = MockS3Uploader()
+        content = open(self.sample_cover_path("test-book-cover.png"), "rb").read()
+        def http_get(url, headers, **kwargs):
+            return 200, {"content-type": Representation.PNG_MEDIA_TYPE}, content
+        policy = ReplacementPolicy(
+            mirrors={ExternalIntegrationLink.COVERS: mirror},
+            http_get=http_get
+        )
+
+        link = LinkData(
+            rel=Hyperlink.IMAGE, media_type=Representation.PNG_MEDIA_TYPE,
+            href="http://example.com/cover.png"
+        )
+        link_obj, ignore = edition.primary_identifier.add_link(
+            rel=link.rel, href=link.href, data_source=data_source,
+        )
+
+        # When a list is passed in, the full-size image is mirrored
+        # but the thumbnail is put off until later.
+        thumbnails = []
+        m.mirror_link(pool, data_source, link, link_obj, policy,
+                      thumbnails=thumbnails)
+        image = link_obj.resource.representation
+        assert [image] == mirror.uploaded
+        assert [] == image.thumbnails
+        [(representation, thumbnail_url, thumbnail_mirror, collection)] = thumbnails
+        assert image == representation
+        assert mirror == thumbnail_mirror
+        assert pool.collection == collection
+
+        # make_thumbnails() scales the whole list and mirrors the
+        # results.
+        with ThreadPoolExecutor(1) as executor:
+            MetaToModelUtility.make_thumbnails(thumbnails, executor=executor)
+        [thumbnail] = image.thumbnails
+        assert [image, thumbnail] == mirror.uploaded
+        assert thumbnail_url == thumbnail.url
+        assert Edition.MAX_THUMBNAIL_HEIGHT == thumbnail.image_height
+        assert thumbnail.mirror_url is not None
+
+        # Doing it again doesn't scale or mirror anything, since the
+        # full-size image hasn't changed.
+        MetaToModelUtility.make_thumbnails(thumbnails, executor=executor)
+        assert [image, thumbnail] == mirror.uploaded
+
+        # An empty list is a no-op.
+        MetaToModelUtility.make_thumbnails([])
+
     def test_measurements(self):
         edition = self._edition()
         measurement = MeasurementData(quantity_measured=Measurement.POPULARITY,
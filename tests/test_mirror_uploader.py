@@ -176,6 +176,20 @@ class TestMirrorUploader(DatabaseTest):
         assert r1.mirrored_at != None
         assert r2.mirrored_at != None
 
+        # Each Representation can be given its own destination.
+        class Recorder(DummySuccessUploader):
+            def __init__(self):
+                self.mirrored = []
+            def mirror_one(self, representation, mirror_to, collection=None):
+                self.mirrored.append((representation, mirror_to))
+
+        uploader = Recorder()
+        uploader.mirror_batch([(r1, "http://a/"), (r2, "http://b/")])
+        assert (
+            sorted([(r1, "http://a/"), (r2, "http://b/")], key=lambda x: x[1])
+            == sorted(uploader.mirrored, key=lambda x: x[1])
+        )
+
     def test_success_and_then_failure(self):
         r, ignore = self._representation()
         now = utc_now()
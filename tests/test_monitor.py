@@ -3,6 +3,7 @@ import pytest
 
 from ..testing import DatabaseTest
 from ..config import Configuration
+from ..local_analytics_provider import LocalAnalyticsProvider
 from ..metadata_layer import TimestampData
 from ..model import (
     CachedFeed,
@@ -221,6 +222,38 @@ class TestMonitor(DatabaseTest):
         m = AlsoDoomed(self._db, self._default_collection)
         assert_run_sets_exception(m, "I'm also doomed")
 
+    def test_run_once_with_exception_keeps_circulation_events(self):
+        # If run_once changes a LicensePool's availability and then
+        # fails, the change is committed along with the exception, so
+        # the CirculationEvent it implies is written too.
+        integration, ignore = create(
+            self._db, ExternalIntegration,
+            goal=ExternalIntegration.ANALYTICS_GOAL,
+            protocol="core.local_analytics_provider"
+        )
+        analytics = LocalAnalyticsProvider(integration)
+        edition, pool = self._edition(with_license_pool=True)
+        pool.update_availability(1, 1, 0, 0)
+
+        class HalfDoneMonitor(MockMonitor):
+            SERVICE_NAME = "Half done"
+            def run_once(self, progress):
+                pool.update_availability(2, 2, 0, 0, analytics=analytics)
+                raise Exception("I'm half done")
+        m = HalfDoneMonitor(self._db, self._default_collection)
+        m.run()
+
+        assert "Exception: I'm half done" in m.timestamp().exception
+        assert 2 == pool.licenses_owned
+        events = self._db.query(CirculationEvent).filter(
+            CirculationEvent.license_pool==pool
+        ).all()
+        assert (
+            set([CirculationEvent.DISTRIBUTOR_CHECKIN,
+                 CirculationEvent.DISTRIBUTOR_LICENSE_ADD]) ==
+            set(x.type for x in events)
+        )
+
     def test_same_monitor_different_collections(self):
         """A single Monitor has different Timestamps when run against
         different Collections.
@@ -824,6 +857,26 @@ class TestPermanentWorkIDRefresh(DatabaseTest):
         Mock(self._db).process_item(edition)
         assert edition.permanent_work_id != None
 
+    def test_process_items(self):
+        """This Monitor calculates permanent work IDs for a whole batch
+        of Editions at once."""
+        class Mock(PermanentWorkIDRefreshMonitor):
+            SERVICE_NAME = "Mock"
+        edition1 = self._edition()
+        edition2 = self._edition()
+        Mock(self._db).process_items([edition1, edition2])
+        assert edition1.permanent_work_id != None
+        assert edition2.permanent_work_id != None
+
+    def test_run(self):
+        """The Monitor sweeps over every Edition."""
+        class Mock(PermanentWorkIDRefreshMonitor):
+            SERVICE_NAME = "Mock"
+        editions = [self._edition() for i in range(3)]
+        Mock(self._db, batch_size=2).run()
+        for edition in editions:
+            assert edition.permanent_work_id != None
+
 
 class TestMakePresentationReadyMonitor(DatabaseTest):
 
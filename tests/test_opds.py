@@ -74,6 +74,7 @@ from ..util.flask_util import (
 )
 from ..util.opds_writer import (
     AtomFeed,
+    OPDSEntryFragments,
     OPDSFeed,
     OPDSMessage,
 )
@@ -2350,6 +2351,82 @@ class TestLookupAcquisitionFeed(DatabaseTest):
         )
 
 
+    def test_stream_splices_cached_entries(self):
+        # When a feed is streamed, a cached OPDS entry is sent without
+        # being parsed, with this request's annotations spliced in.
+        work = self._work(with_open_access_download=True)
+        [pool] = work.license_pools
+        identifier = pool.identifier
+
+        # Create the cached entry and get a normal entry to compare to.
+        feed, normal = self.entry(identifier, work)
+        assert work.verbose_opds_entry
+
+        feed = self.feed()
+        feed.splice_cached_entries = True
+        fragments = feed.create_entry((identifier, work))
+        assert isinstance(fragments, OPDSEntryFragments)
+        assert work.verbose_opds_entry.rstrip()[:-8] in str(fragments)
+
+        # The spliced entry has the same tags as an entry created the
+        # normal way.
+        def tags(xml):
+            return sorted(
+                (x.tag, sorted(x.attrib.items()), x.text)
+                for x in etree.fromstring(xml).iter()
+            )
+        assert tags(normal) == tags(str(fragments))
+
+        # Splicing only happens while a feed is being streamed.
+        feed = self.feed()
+        assert isinstance(feed.create_entry((identifier, work)), etree._Element)
+        streamed = "".join(feed.stream([(identifier, work)]))
+        assert 1 == streamed.count(identifier.urn)
+        assert False == feed.splice_cached_entries
+        [entry] = etree.fromstring(streamed).findall(
+            "{%s}entry" % AtomFeed.ATOM_NS
+        )
+        assert tags(normal) == tags(etree.tounicode(entry))
+
+    def test_stream_keeps_entry_attributes(self):
+        # An annotator may set attributes on the <entry> tag itself,
+        # including attributes from a namespace the cached entry
+        # doesn't declare.
+        class AttributeAnnotator(VerboseAnnotator):
+            def annotate_work_entry(self, work, active_license_pool,
+                                    edition, identifier, feed, entry):
+                super(AttributeAnnotator, self).annotate_work_entry(
+                    work, active_license_pool, edition, identifier, feed,
+                    entry
+                )
+                entry.set(
+                    "{%s}additionalType" % AtomFeed.SCHEMA_NS,
+                    "http://bib.schema.org/Audiobook"
+                )
+                entry.set("{http://example.com/ns}rank", "1")
+
+        work = self._work(with_open_access_download=True)
+        [pool] = work.license_pools
+        identifier = pool.identifier
+        annotator = AttributeAnnotator()
+        feed, normal = self.entry(identifier, work, annotator=annotator)
+        assert work.verbose_opds_entry
+
+        # Those attributes survive the cached entry being spliced into
+        # a streamed feed.
+        feed = self.feed(annotator=annotator)
+        streamed = "".join(feed.stream([(identifier, work)]))
+        [entry] = etree.fromstring(streamed).findall(
+            "{%s}entry" % AtomFeed.ATOM_NS
+        )
+        normal = etree.fromstring(normal)
+        assert "http://bib.schema.org/Audiobook" == entry.get(
+            "{%s}additionalType" % AtomFeed.SCHEMA_NS
+        )
+        assert "1" == entry.get("{http://example.com/ns}rank")
+        assert dict(normal.attrib) == dict(entry.attrib)
+
+
 class TestEntrypointLinkInsertion(DatabaseTest):
     """Verify that the three main types of OPDS feeds -- grouped,
     paginated, and search results -- will all include links to the same
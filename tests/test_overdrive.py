@@ -383,6 +383,124 @@ class TestOverdriveAPI(OverdriveTestWithAPI):
             assert result == (["an availability queue"], "http://next-page/")
 
 
+    def test__get_book_list_pages(self):
+        # Test the method that retrieves every page of a list of books.
+
+        class MockAPI(MockOverdriveAPI):
+            # Requests may be made concurrently, so responses are
+            # found by URL rather than taken from a queue.
+            pages = {}
+            def _do_get(self, url, headers):
+                self.requests.append(url)
+                return 200, {}, json.dumps(self.pages[url])
+
+        def page(offset, *ids, **links):
+            url = "http://od/products?limit=2&offset=%d&sort=dateAdded%%3Adesc"
+            page_links = dict(
+                (rel, dict(href=url % link_offset))
+                for rel, link_offset in list(links.items())
+            )
+            products = [
+                dict(id=id, links=dict(availability=dict(href="http://%s/" % id)))
+                for id in ids
+            ]
+            return url % offset, dict(products=products, links=page_links)
+
+        api = MockAPI(self._db, self.collection)
+        first, first_page = page(0, "a", "b", next=2, last=6)
+        for offset, ids in ((0, "ab"), (2, "cd"), (4, "ef"), (6, "g")):
+            url, content = page(offset, *ids)
+            api.pages[url] = content
+        api.pages[first] = first_page
+
+        # The first page says where the list ends, so the other pages
+        # are requested without following 'next' links, and they're
+        # returned in order.
+        pages = list(api._get_book_list_pages(first))
+        assert ["ab", "cd", "ef", "g"] == [
+            "".join(x['id'] for x in inventory) for inventory in pages
+        ]
+        assert first == api.requests[0]
+        assert sorted(api.pages.keys()) == sorted(api.requests)
+
+        # If a page doesn't say where the list ends, the 'next' links
+        # are followed one at a time.
+        api.requests = []
+        first, first_page = page(0, "a", "b", next=2)
+        api.pages[first] = first_page
+        second, second_page = page(2, "c", next=4)
+        api.pages[second] = second_page
+        third, third_page = page(4)
+        api.pages[third] = third_page
+        pages = list(api._get_book_list_pages(first))
+        assert [["a", "b"], ["c"], []] == [
+            [x['id'] for x in inventory] for inventory in pages
+        ]
+        assert [first, second, third] == api.requests
+
+    def test__remaining_page_links(self):
+        m = OverdriveAPI._remaining_page_links
+        next_link = "http://od/products?limit=300&offset=300&sort=x"
+        last = dict(links=dict(last=dict(
+            href="http://od/products?limit=300&offset=900&sort=x"
+        )))
+        assert [
+            "http://od/products?limit=300&offset=300&sort=x",
+            "http://od/products?limit=300&offset=600&sort=x",
+            "http://od/products?limit=300&offset=900&sort=x",
+        ] == m(last, next_link)
+
+        # Without a 'last' link, or without offsets to work with, the
+        # links can't be calculated.
+        assert None == m(dict(links={}), next_link)
+        assert None == m(last, "http://od/products?sort=x")
+
+    def test_bulk_metadata_lookup(self):
+
+        class MockAPI(MockOverdriveAPI):
+            BULK_METADATA_BATCH_SIZE = 2
+            responses_by_url = {}
+            def _do_get(self, url, headers):
+                self.requests.append(url)
+                return self.responses_by_url[url]
+
+        api = MockAPI(self._db, self.collection)
+        api._collection_token = "collection-token"
+        identifiers = []
+        for id in ("ID1", "id2", "id3"):
+            identifier = self._identifier(
+                identifier_type=Identifier.OVERDRIVE_ID
+            )
+            identifier.identifier = id
+            identifiers.append(identifier)
+        i1, i2, i3 = identifiers
+
+        url1 = api.endpoint(
+            api.BULK_METADATA_ENDPOINT, collection_token="collection-token",
+            item_ids="id1,id2"
+        )
+        url2 = api.endpoint(
+            api.BULK_METADATA_ENDPOINT, collection_token="collection-token",
+            item_ids="id3"
+        )
+        info = dict(id="id1", title="A book")
+        api.responses_by_url[url1] = (
+            200, {}, json.dumps(dict(metadata=[info]))
+        )
+        api.responses_by_url[url2] = (500, {}, "Oops")
+
+        results = api.bulk_metadata_lookup(identifiers)
+
+        # One request was made for each batch of identifiers.
+        assert sorted([url1, url2]) == sorted(api.requests)
+
+        # Overdrive's information was matched up with the identifiers
+        # without regard to case. A title Overdrive didn't mention is
+        # treated as not found, and a title whose request failed is
+        # left out.
+        assert {i1: info, i2: dict(errorCode='NotFound')} == results
+
+
 class TestOverdriveRepresentationExtractor(OverdriveTestWithAPI):
 
     def test_availability_info(self):
@@ -870,12 +988,17 @@ class TestOverdriveBibliographicCoverageProvider(OverdriveTest):
         # This book has no LicensePool.
         assert [] == identifier.licensed_through
 
-        # Run it through the OverdriveBibliographicCoverageProvider
+        # Run it through the OverdriveBibliographicCoverageProvider.
+        # The whole batch is looked up in a single bulk request.
         raw, info = self.sample_json("overdrive_metadata.json")
-        self.api.queue_response(200, content=raw)
+        self.api.queue_response(
+            200, content=json.dumps(dict(metadata=[info]))
+        )
 
         [result] = self.provider.process_batch([identifier])
         assert identifier == result
+        (url, args, kwargs) = self.api.requests.pop()
+        assert "bulkmetadata?reserveIds=%s" % identifier.identifier in url
 
         # A LicensePool was created, not because we know anything
         # about how we've licensed this book, but to have a place to
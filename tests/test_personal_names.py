@@ -25,6 +25,8 @@ from ..testing import (
 
 from ..util.personal_names import (
     display_name_to_sort_name,
+    display_names_to_sort_names,
+    name_cache_statistics,
 )
 from ..mock_analytics_provider import MockAnalyticsProvider
 
@@ -108,7 +110,27 @@ class TestNameConversions(DatabaseTest):
         sort_name = display_name_to_sort_name("Bitshifter, B.")
         assert "Bitshifter, B." == sort_name
 
-
-
-
-
+    def test_display_names_to_sort_names(self):
+        result = display_names_to_sort_names(
+            ["Bob Bitshifter", "National Geographic", "Bob Bitshifter"]
+        )
+        assert {
+            "Bob Bitshifter": "Bitshifter, Bob",
+            "National Geographic": "National Geographic",
+        } == result
+
+    def test_name_cache_statistics(self):
+        display_name_to_sort_name.cache_clear()
+        display_name_to_sort_name("Alice Cachetest")
+        display_name_to_sort_name("Alice Cachetest")
+        display_name_to_sort_name("Bob Cachetest")
+
+        stats = name_cache_statistics()['display_name_to_sort_name']
+        assert 1 == stats['hits']
+        assert 2 == stats['misses']
+        assert 2 == stats['size']
+        assert 1/3.0 == stats['hit_rate']
+
+        display_name_to_sort_name.cache_clear()
+        stats = name_cache_statistics()['display_name_to_sort_name']
+        assert 0 == stats['hit_rate']
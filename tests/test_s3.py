@@ -1,6 +1,7 @@
 # encoding: utf-8
 import functools
 import os
+import threading
 from urllib.parse import urlsplit
 import boto3
 import botocore
@@ -948,6 +949,14 @@ class TestS3Uploader(S3UploaderTest):
 
         assert b"i'm an epub" == data2
         assert "books-go" == bucket2
+
+        # Uploads are made in fixed-size parts.
+        for kwargs in ignore1, ignore2:
+            assert S3Uploader.TRANSFER_CONFIG == kwargs['Config']
+        assert (
+            S3Uploader.PART_SIZE ==
+            S3Uploader.TRANSFER_CONFIG.multipart_chunksize
+        )
         assert "here.epub" == key2
         assert Representation.EPUB_MEDIA_TYPE == args2['ContentType']
 
@@ -1003,6 +1012,68 @@ class TestS3Uploader(S3UploaderTest):
         uploader.client.fail_with = Exception("crash!")
         pytest.raises(Exception, uploader.mirror_one, epub_rep, self._url)
 
+    def test_mirror_batch(self):
+        edition, pool = self._edition(with_license_pool=True)
+        representations = []
+        for i in range(3):
+            link, ignore = pool.add_link(
+                Hyperlink.OPEN_ACCESS_DOWNLOAD, self._url,
+                edition.data_source, Representation.EPUB_MEDIA_TYPE,
+                content="epub %d" % i
+            )
+            representations.append(link.resource.representation)
+        good1, bad, good2 = representations
+
+        main_thread = threading.current_thread()
+        upload_threads = []
+        class Client(MockS3Client):
+            def upload_fileobj(self, Fileobj, Bucket, Key, **kwargs):
+                upload_threads.append(threading.current_thread())
+                if Key == "bad.epub":
+                    raise Exception("crash!")
+                return super(Client, self).upload_fileobj(
+                    Fileobj, Bucket, Key, **kwargs
+                )
+        uploader = self._create_s3_uploader(client_class=Client)
+        uploader.final_mirror_url = lambda bucket, key: (
+            "https://%s/%s" % (bucket, key)
+        )
+
+        # The Representations are only changed on the thread that
+        # called mirror_batch.
+        finish_threads = []
+        finish_upload = uploader.finish_upload
+        def record_finish(*args, **kwargs):
+            finish_threads.append(threading.current_thread())
+            return finish_upload(*args, **kwargs)
+        uploader.finish_upload = record_finish
+
+        uploader.mirror_batch([
+            (good1, "http://books-go/good1.epub"),
+            (bad, "http://books-go/bad.epub"),
+            (good2, "http://books-go/good2.epub"),
+        ])
+        assert 3 == len(upload_threads)
+        assert main_thread not in upload_threads
+        assert [main_thread] * 3 == finish_threads
+
+        assert (
+            set([(b"epub 0", "good1.epub"), (b"epub 2", "good2.epub")]) ==
+            set((data, key) for data, bucket, key, args, kwargs
+                in uploader.client.uploads)
+        )
+        assert "https://books-go/good1.epub" == good1.mirror_url
+        assert "https://books-go/good2.epub" == good2.mirror_url
+        for rep in good1, good2:
+            assert (utc_now() - rep.mirrored_at).seconds < 10
+            assert None == rep.mirror_exception
+
+        # An upload that fails with an unexpected error doesn't stop
+        # the rest of the batch; the error is recorded instead.
+        assert None == bad.mirrored_at
+        assert None == bad.mirror_url
+        assert "crash!" == bad.mirror_exception
+
     def test_svg_mirroring(self):
         edition, pool = self._edition(with_license_pool=True)
         original = self._url
@@ -3,6 +3,7 @@ import random
 import shutil
 import stat
 import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from io import StringIO
 import pytest
 from parameterized import parameterized
@@ -2663,28 +2664,93 @@ class TestMirrorResourcesScript(DatabaseTest):
 
     def test_process_collection(self):
 
+        class MockUtility(object):
+            executors = []
+            @classmethod
+            def make_thumbnails(cls, thumbnails, executor=None):
+                cls.executors.append(executor)
+
         class MockScript(MirrorResourcesScript):
-            process_item_called_with = []
-            def process_item(self, collection, link, policy):
-                self.process_item_called_with.append((collection, link, policy))
-
-        # Mock the Hyperlink.unmirrored method
-        link1 = object()
-        link2 = object()
-        def unmirrored(collection):
-            assert collection == self._default_collection
-            yield link1
-            yield link2
+            BATCH_SIZE = 2
+            MIRROR_UTILITY = MockUtility
+            mirror_item_called_with = []
+            def mirror_item(self, collection, link, policy, license_pool,
+                            thumbnails=None):
+                self.mirror_item_called_with.append(
+                    (collection.id, link.id, policy, license_pool.id)
+                )
 
-        script = MockScript(self._db)
+        collection = self._default_collection
+        collection.data_source = DataSource.GUTENBERG
+        links = []
+        pools = []
+        for i in range(5):
+            edition, pool = self._edition(
+                collection=collection, with_license_pool=True
+            )
+            link, ignore = pool.identifier.add_link(
+                Hyperlink.IMAGE, self._url, collection.data_source
+            )
+            links.append(link)
+            pools.append(pool)
+
+        # This link is already mirrored, so it will be ignored.
+        mirrored_edition, mirrored_pool = self._edition(
+            collection=collection, with_license_pool=True
+        )
+        mirrored_link, ignore = mirrored_pool.identifier.add_link(
+            Hyperlink.IMAGE, self._url, collection.data_source
+        )
+        representation, ignore = self._representation(
+            url=mirrored_link.resource.url, media_type="image/png",
+            content="a cover", mirrored=True
+        )
+        mirrored_link.resource.representation = representation
+        self._db.commit()
+
+        def cursor():
+            return Timestamp.lookup(
+                self._db, MockScript.CURSOR_SERVICE_NAME,
+                Timestamp.SCRIPT_TYPE, collection
+            ).counter
+
+        script = MockScript(self._db, worker_size=1)
         policy = object()
-        script.process_collection(self._default_collection, policy, unmirrored)
+        pool = DatabasePool(1, script.session_factory)
+        script.process_collection(collection, policy, pool=pool)
+
+        # Every unmirrored link was mirrored, in three batches. Each
+        # one was handed the LicensePool found for its Identifier.
+        assert 3 == pool.job_total
+        expect = [
+            (collection.id, link.id, policy, license_pool.id)
+            for link, license_pool in zip(links, pools)
+        ]
+        assert expect == script.mirror_item_called_with
+
+        # All three batches scaled their thumbnails in the same pool
+        # of worker processes.
+        assert 3 == len(MockUtility.executors)
+        executor = MockUtility.executors[0]
+        assert isinstance(executor, ProcessPoolExecutor)
+        assert set([executor]) == set(MockUtility.executors)
 
-        # Process_collection called unmirrored() and then called process_item
-        # on every item yielded by unmirrored()
-        call1, call2 = script.process_item_called_with
-        assert (self._default_collection, link1, policy) == call1
-        assert (self._default_collection, link2, policy) == call2
+        # Having covered the whole collection, the cursor was reset.
+        assert 0 == cursor()
+
+        # If a previous run was interrupted, the next run resumes
+        # where it left off.
+        Timestamp.stamp(
+            self._db, MockScript.CURSOR_SERVICE_NAME, Timestamp.SCRIPT_TYPE,
+            collection=collection, counter=links[2].id
+        )
+        self._db.commit()
+        script.mirror_item_called_with = []
+        script.process_collection(
+            collection, policy, pool=DatabasePool(1, script.session_factory)
+        )
+        assert expect[3:] == script.mirror_item_called_with
+        assert 0 == cursor()
 
     def test_derive_rights_status(self):
         """Test our ability to determine the rights status of a Resource,
@@ -2815,6 +2881,11 @@ class TestMirrorResourcesScript(DatabaseTest):
         assert isinstance(link, LinkData)
         assert download_link.resource.url == link.href
 
+        # process_item() mirrors a single link, so any thumbnail is
+        # made right away rather than being put off until the end of
+        # a batch.
+        assert None == attempt['thumbnails']
+
         # For other types of links, we rely on fair use, so the "rights
         # status" doesn't matter.
         script.RIGHTS_STATUS = None
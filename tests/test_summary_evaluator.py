@@ -85,3 +85,24 @@ class TestSummaryEvaluator(object):
         evaluator.add("And another", parser=AlwaysErrorBlob)
         assert evaluator._nltk_installed == False
         assert 1 == evaluator.score(summary)
+
+    def test_features_are_cached_across_evaluators(self):
+        class CountingBlob(TextBlob):
+            created = 0
+            def __init__(self, *args, **kwargs):
+                CountingBlob.created += 1
+                super(CountingBlob, self).__init__(*args, **kwargs)
+
+        summary = "The story of Alice and the White Rabbit."
+        for i in range(3):
+            evaluator = SummaryEvaluator()
+            evaluator.add(summary, parser=CountingBlob)
+            evaluator.ready()
+            evaluator.score(summary)
+
+        # The summary was only parsed once.
+        assert 1 == CountingBlob.created
+
+        features = SummaryEvaluator.features(summary, CountingBlob)
+        assert "white rabbit" in features.noun_phrases
+        assert 1 == features.sentences
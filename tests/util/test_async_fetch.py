@@ -0,0 +1,66 @@
+import threading
+import time
+
+import pytest
+
+from ...util.async_fetch import AsyncFetcher
+
+
+class TestAsyncFetcher(object):
+
+    def test_host(self):
+        assert "example.com:8080" == AsyncFetcher.host(
+            "http://Example.com:8080/path"
+        )
+
+    def test_run(self):
+        lock = threading.Lock()
+        in_flight = {}
+        max_in_flight = {}
+
+        def fetch(url, extra):
+            host = AsyncFetcher.host(url)
+            with lock:
+                in_flight[host] = in_flight.get(host, 0) + 1
+                max_in_flight[host] = max(
+                    max_in_flight.get(host, 0), in_flight[host]
+                )
+            time.sleep(0.01)
+            with lock:
+                in_flight[host] -= 1
+            return url + extra
+
+        jobs = [("http://a/%d" % i, "!") for i in range(10)]
+        jobs += [("http://b/%d" % i, "?") for i in range(10)]
+
+        fetcher = AsyncFetcher(max_concurrency=8, max_per_host=2)
+        results = dict(fetcher.run(jobs, fetch))
+
+        # Every job was run and its result yielded.
+        assert 20 == len(results)
+        assert "http://a/3!" == results["http://a/3"]
+        assert "http://b/7?" == results["http://b/7"]
+
+        # No more than two requests were ever in flight against one host.
+        assert max_in_flight["a"] <= 2
+        assert max_in_flight["b"] <= 2
+
+    def test_pause_before(self):
+        fetcher = AsyncFetcher(max_per_host=1, pause_before=0.05)
+        jobs = [("http://a/%d" % i,) for i in range(3)]
+        start = time.time()
+        results = list(fetcher.run(jobs, lambda url: url))
+        assert 3 == len(results)
+
+        # The requests to a single host were made one at a time,
+        # with a pause before each one.
+        assert time.time() - start >= 0.15
+
+    def test_exception_is_reraised(self):
+        def fetch(url):
+            raise ValueError("Bad URL: %s" % url)
+
+        fetcher = AsyncFetcher()
+        with pytest.raises(ValueError) as excinfo:
+            list(fetcher.run([("http://a/",)], fetch))
+        assert "Bad URL: http://a/" in str(excinfo.value)
@@ -95,6 +95,16 @@ class TestResponse(object):
         obj = Response("some data")
         assert "some data" == str(obj)
 
+    def test_streaming(self):
+        # A generator is passed through as the body of a streaming
+        # response, rather than being converted to a string.
+        def body():
+            yield "some "
+            yield "data"
+        obj = Response(body())
+        assert obj.is_streamed
+        assert "some data" == str(obj)
+
 
 class TestOPDSFeedResponse(object):
     """Test the OPDS feed-specific specialization of Response."""
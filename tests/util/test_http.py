@@ -1,8 +1,11 @@
 import pytest
 import requests
 import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from ...util.http import (
     HTTP,
+    HTTPConnectionPools,
     BadResponseException,
     RemoteIntegrationException,
     RequestNetworkException,
@@ -224,6 +227,131 @@ class TestHTTP(object):
         assert error == m("url", error, allowed_response_codes=["400"])
         assert error == m("url", error, allowed_response_codes=['4xx'])
 
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    # Paths that have been requested.
+    requested = []
+
+    def do_GET(self):
+        self.requested.append(self.path)
+        if self.path == "/unavailable":
+            # A server that's overloaded, and wants to be left alone
+            # for an hour.
+            body = b"Try again later"
+            self.send_response(503)
+            self.send_header("Retry-After", "3600")
+        else:
+            body = b"Success!"
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestHTTPConnectionPools(object):
+
+    @pytest.fixture
+    def server(self):
+        # Requests that do and don't retry 5xx responses use separate
+        # connections, which the server has to handle at the same time.
+        server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        HTTPConnectionPools.reset()
+        KeepAliveHandler.requested = []
+        yield "http://127.0.0.1:%d" % server.server_port
+        HTTPConnectionPools.reset()
+        server.shutdown()
+        server.server_close()
+
+    def test_key(self):
+        m = HTTPConnectionPools.key
+        assert "https://example.com" == m("https://Example.com/a/b?c=d")
+        assert "http://example.com:8080" == m("http://example.com:8080")
+
+    def test_adapter_is_shared_per_host(self):
+        m = HTTPConnectionPools.adapter
+        try:
+            HTTPConnectionPools.pool_sizes = {"big.example.com": 50}
+            a = m("https://small.example.com/a")
+            assert a is m("https://small.example.com/b")
+            assert a is not m("http://small.example.com/a")
+            assert a is not m(
+                "https://small.example.com/a", retry_on_status=False
+            )
+            assert (
+                HTTPConnectionPools.DEFAULT_POOL_SIZE == a._pool_maxsize
+            )
+            assert 50 == m("https://big.example.com/")._pool_maxsize
+        finally:
+            HTTPConnectionPools.pool_sizes = {}
+            HTTPConnectionPools.reset()
+
+    def test_retry_policy(self):
+        retry = HTTPConnectionPools.retry_policy()
+        assert HTTPConnectionPools.RETRY_TOTAL == retry.total
+        assert 0 == retry.read
+        assert 503 in retry.status_forcelist
+        assert False == retry.raise_on_status
+
+        # POST requests are never retried.
+        assert False == retry.is_retry("POST", 503)
+        assert True == retry.is_retry("GET", 503)
+
+        # A Retry-After header can't make a request wait any longer
+        # than the backoff.
+        assert False == retry.respect_retry_after_header
+
+        # Retrying 5xx responses can be turned off.
+        retry = HTTPConnectionPools.retry_policy(retry_on_status=False)
+        assert HTTPConnectionPools.RETRY_TOTAL == retry.total
+        assert False == retry.is_retry("GET", 503)
+        assert False == retry.is_retry("GET", 503, has_retry_after=True)
+
+    def test_connections_are_reused(self, server):
+        for i in range(3):
+            response = HTTP.get_with_timeout(server + "/path/%d" % i)
+            assert b"Success!" == response.content
+
+        # Three requests were made over a single connection.
+        [stats] = list(HTTPConnectionPools.stats().values())
+        assert dict(requests=3, connections=1) == stats
+
+    def test_retry_on_status(self, server, monkeypatch):
+        monkeypatch.setattr(HTTPConnectionPools, "RETRY_BACKOFF_FACTOR", 0)
+        url = server + "/unavailable"
+
+        # By default, a 503 response is retried, in spite of the
+        # Retry-After header, and the last response is returned.
+        response = HTTP.get_with_timeout(url, allowed_response_codes=[503])
+        assert 503 == response.status_code
+        assert (
+            HTTPConnectionPools.RETRY_TOTAL + 1 ==
+            len(KeepAliveHandler.requested)
+        )
+
+        # The caller can ask for the first response instead.
+        KeepAliveHandler.requested = []
+        response = HTTP.get_with_timeout(
+            url, allowed_response_codes=[503], retry_on_status=False
+        )
+        assert 503 == response.status_code
+        assert ["/unavailable"] == KeepAliveHandler.requested
+
+        # Either way, the connections are pooled under the same host.
+        assert [server] == list(HTTPConnectionPools.stats().keys())
+
+    def test_reset(self, server):
+        HTTP.get_with_timeout(server)
+        assert 1 == len(HTTPConnectionPools.stats())
+        HTTPConnectionPools.reset()
+        assert {} == HTTPConnectionPools.stats()
+
+
 class TestRemoteIntegrationException(object):
 
     def test_with_service_name(self):
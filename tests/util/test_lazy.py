@@ -0,0 +1,31 @@
+from ...util.lazy import LazyClassAttribute
+
+
+class TestLazyClassAttribute(object):
+
+    def test_value_is_built_once(self):
+        calls = []
+
+        class Parent(object):
+            @LazyClassAttribute
+            def TABLE(cls):
+                """An expensive table."""
+                calls.append(cls)
+                return dict(a=1)
+
+        class Child(Parent):
+            pass
+
+        # Nothing is built until the attribute is used.
+        assert [] == calls
+        assert "An expensive table." == Parent.__dict__['TABLE'].__doc__
+
+        # The value is available through a subclass or an instance,
+        # and it's built on the class where it was defined.
+        assert dict(a=1) == Child().TABLE
+        assert [Parent] == calls
+        assert dict(a=1) == Parent.__dict__['TABLE']
+
+        # From then on it's an ordinary class attribute.
+        assert Parent.TABLE is Child.TABLE
+        assert [Parent] == calls
@@ -5,6 +5,7 @@ import pytz
 from lxml import etree
 from ...util.opds_writer import (
     AtomFeed,
+    OPDSEntryFragments,
     OPDSMessage
 )
 
@@ -59,6 +60,54 @@ class TestAtomFeed(object):
             in etree.tostring(entry, method='c14n2')
         )
 
+    def test_serialize_incrementally(self):
+        feed = AtomFeed("A feed", "http://url/")
+        feed.feed.append(AtomFeed.entry(AtomFeed.title("Entry 1")))
+        message = OPDSMessage("urn", 404, "Not found")
+        feed.feed.append(message.tag)
+        feed.add_link_to_feed(feed.feed, rel="next", href="http://next/")
+
+        created = []
+        def lazy_entries():
+            for title in ("Entry 2", "Entry 3"):
+                created.append(title)
+                yield AtomFeed.entry(AtomFeed.title(title))
+            yield None
+            yield OPDSMessage("urn2", 202, "Try again later")
+
+        pieces = feed.serialize_incrementally(lazy_entries())
+
+        # The first piece contains everything but the entries.
+        header = next(pieces)
+        assert header.startswith("<feed")
+        assert "A feed" in header
+        assert "http://next/" in header
+        assert "Entry" not in header
+        assert "</feed>" not in header
+
+        # Entries that were already in the feed come next; the other
+        # entries haven't been created yet.
+        assert "Entry 1" in next(pieces)
+        assert "Not found" in next(pieces)
+        assert [] == created
+
+        rest = list(pieces)
+        assert ["Entry 2", "Entry 3"] == created
+        assert "</feed>\n" == rest[-1]
+
+        # Put together, the pieces make a single well-formed feed.
+        parsed = etree.fromstring(
+            "".join(feed.serialize_incrementally(lazy_entries()))
+        )
+        assert "feed" == etree.QName(parsed).localname
+        titles = [
+            x.text for x in parsed.findall("{%s}entry/{%s}title" % (
+                AtomFeed.ATOM_NS, AtomFeed.ATOM_NS
+            ))
+        ]
+        assert ["Entry 1", "Entry 2", "Entry 3"] == titles
+        assert 2 == len(parsed.findall("{%s}message" % AtomFeed.SIMPLIFIED_NS))
+
     def test_contributor(self):
         kwargs = { '{%s}role' % AtomFeed.OPF_NS : 'ctb' }
         tag = etree.tounicode(AtomFeed.author(**kwargs))
@@ -93,3 +142,49 @@ class TestAtomFeed(object):
         # Verify that dates and datetimes are formatted according to
         # the rules laid down in the Atom spec.
         assert AtomFeed._strftime(obj) == formatted
+
+
+class TestOPDSEntryFragments(object):
+
+    def test_can_splice(self):
+        m = OPDSEntryFragments.can_splice
+        assert True == m('<entry xmlns="http://www.w3.org/2005/Atom"></entry>\n')
+        assert False == m('<entry xmlns="http://www.w3.org/2005/Atom"/>')
+        assert False == m(
+            '<?xml version="1.0"?><entry xmlns="http://www.w3.org/2005/Atom"></entry>'
+        )
+        assert False == m(None)
+
+    def test_str(self):
+        static = etree.tounicode(AtomFeed.entry(AtomFeed.title("A title")))
+        annotations = AtomFeed.entry(AtomFeed.id("urn"))
+        AtomFeed.add_link_to_entry(annotations, rel="alternate", href="http://x/")
+        fragments = OPDSEntryFragments(static, annotations)
+
+        # The static part is left alone, and the annotations are
+        # added to the end of the entry.
+        value = str(fragments)
+        assert value.startswith(static[:-len("</entry>")])
+        entry = etree.fromstring(value)
+        assert (["title", "id", "link"] ==
+                [etree.QName(x).localname for x in entry])
+
+    def test_str_merges_start_tag(self):
+        static = etree.tounicode(
+            AtomFeed.entry(AtomFeed.title("A > title"), lang="en")
+        )
+        # The annotator set attributes on the entry, one of them in a
+        # namespace the cached entry doesn't declare.
+        annotations = etree.Element(
+            "entry", nsmap=dict(AtomFeed.nsmap, ex="http://example.com/ns")
+        )
+        annotations.set("lang", "fr")
+        annotations.set("{http://example.com/ns}rank", '1 < "2"')
+        annotations.append(AtomFeed.id("urn"))
+
+        entry = etree.fromstring(str(OPDSEntryFragments(static, annotations)))
+        assert "http://example.com/ns" == entry.nsmap["ex"]
+        assert AtomFeed.ATOM_NS == entry.nsmap[None]
+        assert "fr" == entry.get("lang")
+        assert '1 < "2"' == entry.get("{http://example.com/ns}rank")
+        assert ["A > title", "urn"] == [x.text for x in entry]
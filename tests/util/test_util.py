@@ -20,6 +20,7 @@ from ...util import (
     slugify
 )
 from ...util.median import median
+from ...util.permanent_work_id import WorkIDCalculator
 
 class DummyAuthor(object):
 
@@ -359,6 +360,47 @@ class TestEnglishDetector(object):
             english_bigrams.difference_from(dutch))
         assert round(diff, 7) == 0
 
+    def test_difference_from(self):
+        abab = Bigrams.from_string("abab")
+        assert 0 == abab.difference_from(abab)
+
+        # Bigrams found in only one of the sets count in full.
+        baba = Bigrams.from_string("baba")
+        assert round(abs(2/3.0 - 1/3.0) * 2, 7) == round(
+            abab.difference_from(baba), 7
+        )
+        zz = Bigrams.from_string("zz")
+        assert 2 == round(abab.difference_from(zz), 7)
+
+        # The comparison reflects the current proportions, even after
+        # they're changed in place.
+        zz.proportional["ab"] = 1
+        del zz.proportional["zz"]
+        assert round(abs(2/3.0 - 1) + 1/3.0, 7) == round(
+            abab.difference_from(zz), 7
+        )
+
+
+class TestWorkIDCalculator(object):
+
+    def test_permanent_ids(self):
+        w = WorkIDCalculator
+        book = ("The Title: A Novel", "Author, An", "book")
+        audiobook = ("The Title: A Novel", "Author, An", "audio")
+        ids = w.permanent_ids([book, audiobook, book])
+
+        # Each distinct input shows up once in the output.
+        assert set([book, audiobook]) == set(ids.keys())
+
+        # The results are the same as calculating each permanent ID
+        # on its own.
+        for (title, author, medium), permanent_id in ids.items():
+            expect = w.permanent_id(
+                w.normalize_title(title), w.normalize_author(author), medium
+            )
+            assert expect == permanent_id
+        assert ids[book] != ids[audiobook]
+
 
 class TestMedian(object):
 
@@ -7,7 +7,6 @@ from collections import Counter
 
 import flask_sqlalchemy_session
 import sqlalchemy
-from money import Money
 from sqlalchemy import distinct
 from sqlalchemy.sql.functions import func
 
@@ -274,17 +273,18 @@ class Bigrams(object):
             self.proportional[bigram] = proportion
 
     def difference_from(self, other_bigrams):
-        total_difference = 0
-        for bigram, proportion in list(self.proportional.items()):
-            other_proportion = other_bigrams.proportional[bigram]
-            difference = abs(other_proportion - proportion)
-            total_difference += difference
-            # print("%s %.4f-%.4f = %.4f => %.4f" % (bigram, other_proportion, proportion, difference, total_difference))
-        for bigram, proportion in list(other_bigrams.proportional.items()):
-            if bigram not in self.proportional:
-                total_difference += proportion
-                # print("%s MISSING %.4f => %.4f" % (bigram, proportion, total_difference))
-        return total_difference
+        """Calculate the total difference between the two sets of bigram
+        proportions (i.e. the L1 distance between them).
+
+        Only bigrams that show up in at least one of the sets are
+        compared; every other bigram contributes nothing.
+        """
+        proportional = self.proportional
+        other_proportional = other_bigrams.proportional
+        return sum(
+            abs(proportional[bigram] - other_proportional[bigram])
+            for bigram in proportional.keys() | other_proportional.keys()
+        )
 
     @classmethod
     def from_text_files(cls, paths):
@@ -524,6 +524,8 @@ class MoneyUtility(object):
     @classmethod
     def parse(cls, amount):
         """Attempt to turn a string into a Money object."""
+        # The money package is slow to import and rarely needed.
+        from money import Money
         currency = cls.DEFAULT_CURRENCY
         if not amount:
             amount = '0'
@@ -0,0 +1,111 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+
+class AsyncFetcher(object):
+    """Run a large batch of blocking HTTP requests concurrently.
+
+    The requests themselves are made by an ordinary blocking function
+    (usually something built on `HTTP`, so pooled keep-alive
+    connections are reused) running in a thread pool. An asyncio event
+    loop schedules them, so that no more than `max_per_host` requests
+    are in flight against any one host, and each request to a host can
+    be preceded by a `pause_before` delay, the way `Representation.get`
+    does for throttled services.
+
+    Results are yielded as soon as they come in, so the caller can
+    write them to the database in bulk while later requests are
+    still running.
+    """
+
+    log = logging.getLogger("Async fetcher")
+
+    DEFAULT_MAX_CONCURRENCY = 16
+    DEFAULT_MAX_PER_HOST = 4
+
+    def __init__(self, max_concurrency=None, max_per_host=None,
+                 pause_before=0):
+        """Constructor.
+
+        :param max_concurrency: The total number of requests that may
+            be in flight at once.
+        :param max_per_host: The number of requests that may be in
+            flight against a single host at once.
+        :param pause_before: A number of seconds to wait before
+            sending each request to a given host.
+        """
+        self.max_concurrency = max_concurrency or self.DEFAULT_MAX_CONCURRENCY
+        self.max_per_host = max_per_host or self.DEFAULT_MAX_PER_HOST
+        self.pause_before = pause_before
+
+        # Don't queue up tasks for an entire (possibly huge) batch at
+        # once; keep a few waiting for each worker thread.
+        self.window = self.max_concurrency * 4
+
+    @classmethod
+    def host(cls, url):
+        return urlparse(url).netloc.lower()
+
+    def run(self, jobs, fetch):
+        """Call `fetch` once for each job and yield the results in the
+        order they complete.
+
+        :param jobs: An iterable of tuples. The first item in each
+            tuple must be a URL; the whole tuple is passed into
+            `fetch` as positional arguments.
+        :param fetch: A blocking function that makes an HTTP request.
+            It will be called from a worker thread, so it must not
+            touch the database.
+
+        :yield: A 2-tuple (url, result) for each job. If `fetch`
+            raises an exception, it is re-raised here.
+        """
+        loop = asyncio.new_event_loop()
+        executor = ThreadPoolExecutor(self.max_concurrency)
+        semaphores = {}
+
+        async def one(job):
+            url = job[0]
+            host = self.host(url)
+            semaphore = semaphores.get(host)
+            if semaphore is None:
+                semaphore = semaphores[host] = asyncio.Semaphore(
+                    self.max_per_host
+                )
+            async with semaphore:
+                if self.pause_before:
+                    await asyncio.sleep(self.pause_before)
+                result = await loop.run_in_executor(executor, fetch, *job)
+            return url, result
+
+        jobs = iter(jobs)
+        pending = set()
+
+        def fill():
+            while len(pending) < self.window:
+                try:
+                    job = next(jobs)
+                except StopIteration:
+                    return
+                pending.add(loop.create_task(one(job)))
+
+        try:
+            fill()
+            while pending:
+                done, pending = loop.run_until_complete(
+                    asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                )
+                fill()
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                loop.run_until_complete(
+                    asyncio.wait(pending)
+                )
+            executor.shutdown(wait=True)
+            loop.close()
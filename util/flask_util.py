@@ -1,4 +1,5 @@
 """Utilities for Flask applications."""
+from collections.abc import Iterator
 import datetime
 import flask
 from lxml import etree
@@ -33,6 +34,7 @@ class Response(FlaskResponse):
        * It's easy to calculate header values such as Cache-Control.
        * A response can be easily converted into a string for use in
          tests.
+       * A response can be streamed by passing in a generator.
     """
 
     def __init__(self, response=None, status=None, headers=None, mimetype=None,
@@ -68,6 +70,10 @@ class Response(FlaskResponse):
         body = response
         if isinstance(body, etree._Element):
             body = etree.tostring(body)
+        elif isinstance(body, Iterator):
+            # A streaming response; its pieces will be sent as they're
+            # generated.
+            pass
         elif not isinstance(body, (bytes, str)):
             body = str(body)
 
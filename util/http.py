@@ -1,7 +1,10 @@
 import logging
+from threading import Lock
 
 import requests
+from requests.adapters import HTTPAdapter
 from urllib.parse import urlparse
+from urllib3.util.retry import Retry
 from flask_babel import lazy_gettext as _
 from .problem_detail import (
     ProblemDetail as pd,
@@ -170,6 +173,129 @@ class RequestTimedOut(RequestNetworkException, requests.exceptions.Timeout):
     internal_message = "Timeout accessing %s: %s"
 
 
+class HTTPConnectionPools(object):
+    """A registry of keep-alive connection pools, one per remote host.
+
+    `requests.request` builds a new Session, and with it a new
+    connection pool, for every call, so every request to Overdrive or
+    the metadata wrangler pays for a fresh TCP connection and TLS
+    handshake. This class hands out one long-lived `HTTPAdapter` per
+    scheme and host, so connections are reused across requests.
+
+    Each request still gets its own Session, so cookies and other
+    per-Session state are never shared between unrelated callers.
+    """
+
+    # How many connections to keep open to a single host. Hosts that
+    # are hit from many threads at once can be given a bigger pool
+    # through `pool_sizes`.
+    DEFAULT_POOL_SIZE = 10
+    pool_sizes = {}
+
+    # Retry connection failures and the 5xx responses that usually
+    # mean a load balancer hiccup, backing off between attempts.
+    # Only idempotent methods are retried, and read timeouts are
+    # never retried, since they already took a long time to happen.
+    # Retry-After headers are ignored, so a server can't make a request
+    # wait longer than the backoff. A caller can turn off the retrying
+    # of 5xx responses by passing retry_on_status=False into `request`.
+    RETRY_TOTAL = 3
+    RETRY_BACKOFF_FACTOR = 0.5
+    RETRY_STATUS_CODES = (502, 503, 504)
+
+    _adapters = {}
+    _lock = Lock()
+
+    @classmethod
+    def key(cls, url):
+        """The part of a URL that determines which pool it uses."""
+        parsed = urlparse(url)
+        return ("%s://%s" % (parsed.scheme, parsed.netloc)).lower()
+
+    @classmethod
+    def retry_policy(cls, retry_on_status=True):
+        """Decide which failed requests are retried.
+
+        :param retry_on_status: If this is False, only connection
+            failures are retried. 502, 503 and 504 responses are
+            returned to the caller right away.
+        """
+        if retry_on_status:
+            status_forcelist = cls.RETRY_STATUS_CODES
+        else:
+            status_forcelist = None
+        return Retry(
+            total=cls.RETRY_TOTAL, read=0,
+            status_forcelist=status_forcelist,
+            backoff_factor=cls.RETRY_BACKOFF_FACTOR,
+            raise_on_status=False,
+            respect_retry_after_header=False,
+        )
+
+    @classmethod
+    def adapter(cls, url, retry_on_status=True):
+        """Find or create the HTTPAdapter for the host serving `url`.
+
+        :param retry_on_status: Passed into `retry_policy`. Requests
+            that do and don't retry 5xx responses use separate pools.
+        """
+        key = (cls.key(url), retry_on_status)
+        adapter = cls._adapters.get(key)
+        if adapter is None:
+            with cls._lock:
+                adapter = cls._adapters.get(key)
+                if adapter is None:
+                    host = urlparse(url).netloc.lower()
+                    size = cls.pool_sizes.get(host, cls.DEFAULT_POOL_SIZE)
+                    adapter = HTTPAdapter(
+                        pool_connections=1, pool_maxsize=size,
+                        max_retries=cls.retry_policy(retry_on_status),
+                    )
+                    cls._adapters[key] = adapter
+        return adapter
+
+    @classmethod
+    def request(cls, method, url, retry_on_status=True, **kwargs):
+        """A drop-in replacement for `requests.request` that reuses
+        pooled connections.
+
+        :param retry_on_status: Pass in False to get a 502, 503 or 504
+            response back right away instead of having the request
+            retried.
+        """
+        session = requests.Session()
+        session.mount(cls.key(url), cls.adapter(url, retry_on_status))
+        return session.request(method=method, url=url, **kwargs)
+
+    @classmethod
+    def stats(cls):
+        """Report how well connections are being reused.
+
+        :return: A dictionary mapping each pool key to a dictionary
+            with the number of `requests` sent and the number of
+            `connections` opened to get them there.
+        """
+        stats = {}
+        for (key, retry_on_status), adapter in list(cls._adapters.items()):
+            host_stats = stats.setdefault(key, dict(requests=0, connections=0))
+            pools = adapter.poolmanager.pools
+            for pool_key in list(pools.keys()):
+                pool = pools.get(pool_key)
+                if pool is None:
+                    continue
+                host_stats['requests'] += pool.num_requests
+                host_stats['connections'] += pool.num_connections
+        return stats
+
+    @classmethod
+    def reset(cls):
+        """Close every pooled connection and forget about all the pools."""
+        with cls._lock:
+            for adapter in cls._adapters.values():
+                adapter.close()
+            cls._adapters = {}
+
+
 class HTTP(object):
     """A helper for the `requests` module."""
 
@@ -192,11 +318,16 @@ class HTTP(object):
 
     @classmethod
     def request_with_timeout(cls, http_method, url, *args, **kwargs):
-        """Call requests.request and turn a timeout into a RequestTimedOut
-        exception.
+        """Make a request over a pooled connection and turn a timeout
+        into a RequestTimedOut exception.
+
+        Connection failures and 502, 503 and 504 responses to GET and
+        other idempotent requests are retried a few times. Pass in
+        retry_on_status=False to have those responses handled as they
+        come in.
         """
         return cls._request_with_timeout(
-            url, requests.request, http_method, *args, **kwargs
+            url, HTTPConnectionPools.request, http_method, *args, **kwargs
         )
 
     @classmethod
@@ -369,7 +500,7 @@ class HTTP(object):
         """
         logging.info("Making debuggable %s request to %s: kwargs %r",
                      http_method, url, kwargs)
-        make_request_with = make_request_with or requests.request
+        make_request_with = make_request_with or HTTPConnectionPools.request
         return cls._request_with_timeout(
             url, make_request_with, http_method,
             process_response_with=cls.process_debuggable_response,
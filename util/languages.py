@@ -5,6 +5,8 @@
 from collections import defaultdict
 import re
 
+from .lazy import LazyClassAttribute
+
 class LookupTable(dict):
     """Return None on x[key] when 'key' isn't in the dictionary,
     rather than raising a ValueError.
@@ -618,6 +620,8 @@ class LanguageNames(object):
 
     LanguageNames.name_to_codes is a dictionary mapping lowercase
     human-readable names to ISO-639-2 language codes.
+
+    Both are built the first time they're used.
     """
 
     irrelevant_suffixes = [" languages"]
@@ -654,8 +658,8 @@ class LanguageNames(object):
                 human_readable_name = human_readable_name[:-len(suffix)]
         return human_readable_name.strip().lower(), alpha
 
-    @classmethod
-    def _build_name_to_codes(cls):
+    @LazyClassAttribute
+    def name_to_codes(cls):
         name_to_codes = defaultdict(set)
 
         def add(name, alpha):
@@ -693,14 +697,10 @@ class LanguageNames(object):
             add(name, alpha)
         return name_to_codes
 
-    @classmethod
-    def _build_name_re(cls):
+    @LazyClassAttribute
+    def name_re(cls):
         return re.compile(
             r"(\b%s\b)" %
             r"\b|\b".join(list(cls.name_to_codes.keys())),
             re.I
         )
-
-# Instantiate the class variables.
-LanguageNames.name_to_codes = LanguageNames._build_name_to_codes()
-LanguageNames.name_re = LanguageNames._build_name_re()
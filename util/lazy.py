@@ -0,0 +1,25 @@
+class LazyClassAttribute(object):
+    """A class attribute whose value is expensive to build and not
+    always needed.
+
+    Decorate a function that takes the class and returns the value.
+    The function is called the first time the attribute is looked up,
+    and the value replaces the function on the class where it was
+    defined, so later lookups are ordinary attribute lookups.
+    """
+
+    def __init__(self, function):
+        self.function = function
+        self.name = function.__name__
+        self.__doc__ = function.__doc__
+        self.owner = None
+
+    def __set_name__(self, owner, name):
+        self.owner = owner
+        self.name = name
+
+    def __get__(self, instance, owner):
+        defined_on = self.owner or owner
+        value = self.function(defined_on)
+        setattr(defined_on, self.name, value)
+        return value
@@ -1,4 +1,6 @@
+import copy
 import datetime
+import itertools
 import logging
 from flask import Response
 from lxml import builder, etree
@@ -183,6 +185,55 @@ class AtomFeed(object):
             return None
         return etree.tostring(self.feed, encoding="unicode", pretty_print=True)
 
+    def serialize_incrementally(self, entries=()):
+        """Serialize this feed a piece at a time, so that it can be sent
+        to the client without ever holding the whole document in memory.
+
+        Everything in the feed except its entries and messages is
+        yielded first, then each entry already in the feed, then each
+        item in `entries`, then the closing tag.
+
+        :param entries: An iterable of additional <entry> tags or
+            OPDSMessages. These may be created lazily -- they'll be
+            rendered only as they're needed. None values are ignored.
+
+        :yield: A sequence of strings.
+        """
+        body_tags = (self.E.entry().tag, self.SIMPLIFIED.message().tag)
+        header = etree.Element(
+            self.feed.tag, attrib=self.feed.attrib, nsmap=self.feed.nsmap
+        )
+        body = []
+        for child in self.feed:
+            if child.tag in body_tags:
+                body.append(child)
+            else:
+                header.append(copy.deepcopy(child))
+
+        # Split the serialized header into an opening tag and a
+        # closing tag, with room for the entries in between.
+        header = etree.tostring(header, encoding="unicode", pretty_print=True)
+        closing = "</%s>" % etree.QName(self.feed).localname
+        if header.rstrip().endswith(closing):
+            header = header.rstrip()[:-len(closing)]
+        else:
+            # The header is a self-closing tag.
+            header = header.rstrip()[:-2] + ">\n"
+        yield header
+
+        for entry in itertools.chain(body, entries):
+            if entry is None:
+                continue
+            if isinstance(entry, OPDSMessage):
+                entry = entry.tag
+            if isinstance(entry, OPDSEntryFragments):
+                yield str(entry)
+            else:
+                yield etree.tostring(
+                    entry, encoding="unicode", pretty_print=True
+                )
+        yield closing + "\n"
+
 
 class OPDSFeed(AtomFeed):
 
@@ -211,6 +262,82 @@ class OPDSFeed(AtomFeed):
         super(OPDSFeed, self).__init__(title, url)
 
 
+class OPDSEntryFragments(object):
+    """An OPDS <entry> made of a previously serialized static part and
+    some tags that were added for this particular request.
+
+    The body of the static part is never parsed; the new tags are
+    spliced in before its closing tag when the entry is serialized.
+    Any attributes or namespace declarations that were added to the
+    annotated <entry> are merged into the static part's start tag.
+    """
+
+    OPENING_TAG = "<entry"
+    CLOSING_TAG = "</entry>"
+
+    def __init__(self, static, annotations):
+        """Constructor.
+
+        :param static: A serialized <entry> tag, as a string.
+        :param annotations: An lxml <entry> Element whose children
+            are to be added to the static part, and whose attributes
+            are to be set on it.
+        """
+        self.static = static.strip()
+        self.annotations = annotations
+
+    @classmethod
+    def can_splice(cls, static):
+        """Can new tags be spliced into this serialized <entry> tag?"""
+        if not static:
+            return False
+        static = static.strip()
+        return (static.startswith(cls.OPENING_TAG)
+                and static.endswith(cls.CLOSING_TAG))
+
+    def __str__(self):
+        # A '>' can't show up inside an attribute value, so this is
+        # the end of the start tag.
+        start_tag_end = self.static.index(">")
+        pieces = [
+            self.start_tag(self.static[:start_tag_end]),
+            self.static[start_tag_end:-len(self.CLOSING_TAG)]
+        ]
+        for tag in self.annotations:
+            pieces.append(etree.tostring(tag, encoding="unicode"))
+        pieces.append(self.CLOSING_TAG + "\n")
+        return "".join(pieces)
+
+    def start_tag(self, static_start_tag):
+        """Merge the annotated <entry>'s attributes and namespace
+        declarations into the static part's start tag.
+
+        :param static_start_tag: The start tag of the static part,
+            without the closing '>'.
+        """
+        annotations = self.annotations
+        missing_namespaces = False
+        for prefix, uri in annotations.nsmap.items():
+            if prefix:
+                declaration = 'xmlns:%s="%s"' % (prefix, uri)
+            else:
+                declaration = 'xmlns="%s"' % uri
+            if declaration not in static_start_tag:
+                missing_namespaces = True
+                break
+        if not annotations.attrib and not missing_namespaces:
+            # This is the usual case.
+            return static_start_tag
+
+        static = etree.fromstring(static_start_tag + "/>")
+        nsmap = dict(annotations.nsmap)
+        nsmap.update(static.nsmap)
+        merged = etree.Element(static.tag, nsmap=nsmap)
+        merged.attrib.update(static.attrib)
+        merged.attrib.update(annotations.attrib)
+        return etree.tostring(merged, encoding="unicode")[:-len("/>")]
+
+
 class OPDSMessage(object):
     """An indication that an <entry> could not be created for an
     identifier.
@@ -20,6 +20,36 @@ class WorkIDCalculator(object):
             permanent_id[16:20], permanent_id[20:]])
         return permanent_id
 
+    @classmethod
+    def permanent_ids(cls, titles_authors_and_media):
+        """Calculate permanent work IDs for a number of books at once.
+
+        Duplicate inputs are only processed once, and each distinct
+        title and author is only normalized once, no matter how many
+        books share it.
+
+        :param titles_authors_and_media: An iterable of (title, author,
+            grouping category) 3-tuples.
+        :return: A dictionary mapping each distinct 3-tuple to its
+            permanent work ID.
+        """
+        normalized_titles = {}
+        normalized_authors = {}
+        permanent_ids = {}
+        for key in titles_authors_and_media:
+            if key in permanent_ids:
+                continue
+            title, author, grouping_category = key
+            if title not in normalized_titles:
+                normalized_titles[title] = cls.normalize_title(title)
+            if author not in normalized_authors:
+                normalized_authors[author] = cls.normalize_author(author)
+            permanent_ids[key] = cls.permanent_id(
+                normalized_titles[title], normalized_authors[author],
+                grouping_category
+            )
+        return permanent_ids
+
     # Strings to be removed from author names.
     authorExtract1 = re.compile("^(.+?)\\spresents.*$")
     authorExtract2 = re.compile("^(?:(?:a|an)\\s)?(.+?)\\spresentation.*$")
@@ -221,10 +251,6 @@ class WorkIDCalculator(object):
         if full_title is None:
             full_title = ''
         full_title = unicodedata.normalize("NFKD", full_title)
-        # Remove any bracketed parts of the title
-        tmp_title = cls.bracketedCharacterStrip.sub("", full_title)
-        tmp_title = cls.specialCharacterStrip.sub(
-            "", full_title)
 
         if (num_non_filing_characters > 0
             and num_non_filing_characters < len(full_title)):
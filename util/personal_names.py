@@ -1,6 +1,6 @@
 from fuzzywuzzy import fuzz
-from nameparser import HumanName
 
+from functools import lru_cache
 import re
 import unicodedata
 from builtins import str
@@ -16,6 +16,47 @@ mdFix = re.compile("((. +)|(, ?))M\.? *D(\.| |$){1}")
 # only match punctuation that's not part of name initials or title.
 # so "Bitshifter, B." is OK, "Bitshifter, Bob Jr.", but "Bitshifter, Robert." is not.
 trailingPunctuation = re.compile("(.*)(\w{4,})([?:.,;]*?)\Z")
+# HumanName has a bug where two joiner words together cause an error.
+joinerFix = re.compile('of the', re.IGNORECASE)
+
+# The same names come up over and over again during import, so the
+# results of the more expensive functions in this module are kept
+# in a cache of this size.
+NAME_CACHE_SIZE = 100000
+
+# Strings that show up in corporate names, and their lowercased versions.
+corporations = [
+    # magazines and scientific institutions by name
+    'National Geographic', 'Smithsonian Institution',
+
+    # educational institutions by name
+    'Princeton',
+
+    # educational institutions, general
+    'Verlag', 'College', 'University', 'Scholastic', 'Faculty of', 'Library', "School of",
+    'Professors',
+
+    # publishing houses by name
+    'Harper & Brothers', 'Harper Collins', 'HarperCollins', 'Williams & Wilkins',
+    'Estampie', 'Paul Taylor Dance', 'Gallery', 'EMI Televisa', 'Mysterious Traveler',
+
+    # group names, general
+    'Association', 'International', 'National', 'Society', 'Team',
+
+    # religious institutions
+    "Church of", "Temple of",
+
+    # subject names
+    'History', 'Science',
+
+    # copyrights and trademarks
+    '\xa9', 'Copyright', '(C)', '&#169;',
+
+    # performing arts collaborations
+    'Multiple', 'Various',
+    'Full Cast', 'BBC', 'LTD', 'Limited', 'Productions', 'Visual Media', 'Radio Classics'
+]
+corporations = [(x, x.lower()) for x in corporations]
 
 
 def _replace_md(match):
@@ -65,45 +106,14 @@ def contributor_name_match_ratio(name1, name2, normalize_names=True):
     return match_ratio
 
 
+@lru_cache(maxsize=NAME_CACHE_SIZE)
 def is_corporate_name(display_name):
     """Does this display name look like a corporate name?"""
 
-    corporations = [
-        # magazines and scientific institutions by name
-        'National Geographic', 'Smithsonian Institution',
-
-        # educational institutions by name
-        'Princeton',
-
-        # educational institutions, general
-        'Verlag', 'College', 'University', 'Scholastic', 'Faculty of', 'Library', "School of",
-        'Professors',
-
-        # publishing houses by name
-        'Harper & Brothers', 'Harper Collins', 'HarperCollins', 'Williams & Wilkins',
-        'Estampie', 'Paul Taylor Dance', 'Gallery', 'EMI Televisa', 'Mysterious Traveler',
-
-        # group names, general
-        'Association', 'International', 'National', 'Society', 'Team',
-
-        # religious institutions
-        "Church of", "Temple of",
-
-        # subject names
-        'History', 'Science',
-
-        # copyrights and trademarks
-        '\xa9', 'Copyright', '(C)', '&#169;',
-
-        # performing arts collaborations
-        'Multiple', 'Various',
-        'Full Cast', 'BBC', 'LTD', 'Limited', 'Productions', 'Visual Media', 'Radio Classics'
-        ]
-
     display_name = display_name.lower().replace(".", "").replace(",", "").replace("&amp;", "&")
 
-    for corporation in corporations:
-        if corporation.lower() in display_name:
+    for corporation, lowercase_corporation in corporations:
+        if lowercase_corporation in display_name:
             return True
 
         if fuzz.ratio(corporation, display_name) > 90:
@@ -124,6 +134,7 @@ def is_one_name(human_name):
     return False
 
 
+@lru_cache(maxsize=NAME_CACHE_SIZE)
 def display_name_to_sort_name(display_name):
     """
     Take the "First Name Last Name"-formatted display_name, and convert it
@@ -148,6 +159,7 @@ def display_name_to_sort_name(display_name):
     display_name = name_tidy(display_name)
 
     # name has title, first, middle, last, suffix, nickname
+    from nameparser import HumanName
     name = HumanName(display_name)
 
 
@@ -181,6 +193,7 @@ def display_name_to_sort_name(display_name):
     return sort_name
 
 
+@lru_cache(maxsize=NAME_CACHE_SIZE)
 def name_tidy(name):
     """
     * Converts to NFKD unicode.
@@ -209,6 +222,7 @@ def name_tidy(name):
     return name.strip()
 
 
+@lru_cache(maxsize=NAME_CACHE_SIZE)
 def normalize_contributor_name_for_matching(name):
     """
     Used to standardize author names before matching them to each other to identify best results
@@ -227,9 +241,9 @@ def normalize_contributor_name_for_matching(name):
 
     # HumanName has a bug where two joiner words together cause an error.
     # This is a quickie hack to fix that.
-    joiner_fix = re.compile('of the', re.IGNORECASE)
-    name = joiner_fix.sub('of', name)
+    name = joinerFix.sub('of', name)
 
+    from nameparser import HumanName
     name = HumanName(name)
     # name has title, first, middle, last, suffix, nickname
     name = ' '.join([name.title, name.first, name.middle, name.last, name.suffix, name.nickname])
@@ -254,6 +268,7 @@ def sort_name_to_display_name(sort_name):
     if not sort_name:
         return None
 
+    from nameparser import HumanName
     name = HumanName(sort_name)
     # name has title, first, middle, last, suffix, nickname
     if name.nickname:
@@ -265,7 +280,33 @@ def sort_name_to_display_name(sort_name):
     return display_name
 
 
+def display_names_to_sort_names(display_names):
+    """Convert a number of display names to sort names at once.
 
+    :param display_names: A list of display names, which may contain
+        duplicates.
+    :return: A dictionary mapping each distinct display name to its
+        sort name.
+    """
+    return dict(
+        (display_name, display_name_to_sort_name(display_name))
+        for display_name in set(display_names)
+    )
 
 
+def name_cache_statistics():
+    """Find out how well the caches in this module are working.
 
+    :return: A dictionary mapping the name of each cached function to
+        a dictionary of statistics about its cache.
+    """
+    statistics = {}
+    for function in (display_name_to_sort_name, is_corporate_name,
+                     name_tidy, normalize_contributor_name_for_matching):
+        info = function.cache_info()
+        lookups = info.hits + info.misses
+        statistics[function.__name__] = dict(
+            hits=info.hits, misses=info.misses, size=info.currsize,
+            hit_rate=(float(info.hits) / lookups) if lookups else 0
+        )
+    return statistics
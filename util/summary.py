@@ -1,7 +1,10 @@
+import hashlib
 import logging
-from textblob import TextBlob
-from textblob.exceptions import MissingCorpusError
-from collections import Counter
+from collections import (
+    Counter,
+    namedtuple,
+)
+from expiringdict import ExpiringDict
 
 from . import (
     Bigrams,
@@ -9,6 +12,11 @@ from . import (
 )
 import re
 
+SummaryFeatures = namedtuple(
+    "SummaryFeatures", ["noun_phrases", "sentences", "language_difference"]
+)
+
+
 class SummaryEvaluator(object):
 
     """Evaluate summaries of a book to find a usable summary.
@@ -58,12 +66,19 @@ class SummaryEvaluator(object):
     _nltk_installed = True
     log = logging.getLogger("Summary Evaluator")
 
+    # The expensive parts of scoring a summary (noun phrase
+    # extraction, sentence splitting and the bigram language check)
+    # depend only on the text of the summary, so they're cached across
+    # evaluators, keyed by a hash of the text. The same descriptions
+    # are evaluated over and over as works are recalculated.
+    features_cache = ExpiringDict(max_len=10000, max_age_seconds=24*3600)
+
     def __init__(self, optimal_number_of_sentences=4,
                  noun_phrases_to_consider=10, bad_phrases=None):
         self.optimal_number_of_sentences=optimal_number_of_sentences
         self.summaries = []
         self.noun_phrases = Counter()
-        self.blobs = dict()
+        self.summary_features = dict()
         self.scores = dict()
         self.noun_phrases_to_consider = float(noun_phrases_to_consider)
         self.top_noun_phrases = None
@@ -73,23 +88,65 @@ class SummaryEvaluator(object):
             self.bad_phrases = bad_phrases
 
     def add(self, summary, parser=None):
+        # TextBlob brings in NLTK, which takes a long time to import
+        # and is only needed here.
+        from textblob import TextBlob
+        from textblob.exceptions import MissingCorpusError
         parser_class = parser or TextBlob
         if isinstance(summary, bytes):
             summary = summary.decode("utf8")
-        if summary in self.blobs:
+        if summary in self.summary_features:
             # We already evaluated this summary. Don't count it more than once
             return
-        blob = parser_class(summary)
-        self.blobs[summary] = blob
         self.summaries.append(summary)
+        self.summary_features[summary] = None
 
         if self._nltk_installed:
             try:
-                for phrase in blob.noun_phrases:
-                    self.noun_phrases[phrase] = self.noun_phrases[phrase] + 1
+                features = self.features(summary, parser_class)
             except MissingCorpusError as e:
                 self._nltk_installed = False
                 self.log.error("Summary cannot be evaluated: NLTK not installed %r" % e)
+                return
+            self.summary_features[summary] = features
+            for phrase in features.noun_phrases:
+                self.noun_phrases[phrase] = self.noun_phrases[phrase] + 1
+
+    @classmethod
+    def features(cls, summary, parser_class=None):
+        """Find the parts of a summary's score that don't depend on the
+        other summaries being evaluated.
+
+        :param parser_class: Defaults to TextBlob.
+        :return: A SummaryFeatures.
+        """
+        if parser_class is None:
+            from textblob import TextBlob
+            parser_class = TextBlob
+        key = (
+            parser_class,
+            hashlib.sha1(summary.encode("utf8")).digest()
+        )
+        features = cls.features_cache.get(key)
+        if features is not None:
+            return features
+
+        blob = parser_class(summary)
+        noun_phrases = tuple(blob.noun_phrases)
+        try:
+            sentences = len(blob.sentences)
+        except Exception as e:
+            # Can't parse into sentences for whatever reason.
+            # Make a really bad guess.
+            sentences = summary.count(". ") + 1
+        language_difference = english_bigrams.difference_from(
+            Bigrams.from_string(summary)
+        )
+        features = SummaryFeatures(
+            noun_phrases, sentences, language_difference
+        )
+        cls.features_cache[key] = features
+        return features
 
     def ready(self):
         """We are done adding to the corpus and ready to start evaluating."""
@@ -122,18 +179,13 @@ class SummaryEvaluator(object):
         if summary in self.scores:
             return self.scores[summary]
         score = 1
-        blob = self.blobs[summary]
+        features = self.summary_features[summary]
 
         top_noun_phrases_used = len(
-            [p for p in self.top_noun_phrases if p in blob.noun_phrases])
+            [p for p in self.top_noun_phrases if p in features.noun_phrases])
         score = 1 * (top_noun_phrases_used/self.noun_phrases_to_consider)
 
-        try:
-            sentences = len(blob.sentences)
-        except Exception as e:
-            # Can't parse into sentences for whatever reason.
-            # Make a really bad guess.
-            sentences = summary.count(". ") + 1
+        sentences = features.sentences
         off_from_optimal = abs(sentences-self.optimal_number_of_sentences)
         if off_from_optimal == 1:
             off_from_optimal = 1.5
@@ -157,8 +209,7 @@ class SummaryEvaluator(object):
         score *= (0.5 ** bad_phrases)
 
         if apply_language_penalty:
-            language_difference = english_bigrams.difference_from(
-                Bigrams.from_string(summary))
+            language_difference = features.language_difference
             if language_difference > 1:
                 score *= (0.5 ** (language_difference-1))
 